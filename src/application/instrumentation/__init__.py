@@ -0,0 +1,12 @@
+from .tracer import Tracer, StageHistogram, StageBreakdown, tracer, bind_context
+from .memory import PeakRssSampler, current_rss_bytes
+
+__all__ = [
+    'Tracer',
+    'StageHistogram',
+    'StageBreakdown',
+    'tracer',
+    'bind_context',
+    'PeakRssSampler',
+    'current_rss_bytes'
+]
@@ -0,0 +1,238 @@
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+# Pipeline stages with first-class histograms; any other span name works too
+STAGES = (
+    "decode", "grayscale", "sift_detect", "knn_match", "ratio_test",
+    "ransac", "warp", "blend", "encode", "trailer_fetch"
+)
+
+_current_breakdown: contextvars.ContextVar[Optional["StageBreakdown"]] = contextvars.ContextVar(
+    "stage_breakdown", default=None
+)
+
+
+class StageHistogram:
+    """Latency histogram for one stage over fixed log-spaced buckets (milliseconds)"""
+
+    BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+
+    def record(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket bound below which q percent of samples fall"""
+        if not self.count:
+            return 0.0
+        target = self.count * q / 100
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return self.BOUNDS_MS[i] if i < len(self.BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {
+                (f"<={b}" if i < len(self.BOUNDS_MS) else f">{self.BOUNDS_MS[-1]}"): n
+                for i, (b, n) in enumerate(zip(self.BOUNDS_MS + (None,), self.buckets)) if n
+            }
+        }
+
+
+class StageBreakdown:
+    """Per-stage totals for a single operation, e.g. one execute() call"""
+
+    def __init__(self, parent: Optional["StageBreakdown"] = None):
+        # Nested captures also report into the enclosing one
+        self.parent = parent
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0.0) + ms
+            self._counts[name] = self._counts.get(name, 0) + 1
+        if self.parent is not None:
+            self.parent.record(name, ms)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: {"total_ms": total, "count": self._counts[name]} for name, total in self._totals.items()}
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._tracer.record(self._name, time.perf_counter() - self._start, self._start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Lightweight span tracer with per-stage histograms.
+    Disabled by default: span() then returns a shared no-op context manager.
+    """
+
+    def __init__(self, enabled: bool = False, keep_events: bool = False, max_events: int = 200000):
+        self.enabled = enabled
+        self.keep_events = keep_events
+        self.max_events = max_events
+        self._histograms: Dict[str, StageHistogram] = {}
+        self._events: List[tuple] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self, keep_events: bool = False):
+        """Start recording; keep_events also keeps individual spans for Chrome trace export"""
+        self.enabled = True
+        self.keep_events = keep_events
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._events.clear()
+            self._origin = time.perf_counter()
+
+    def span(self, name: str):
+        """Context manager timing one stage: `with tracer.span("warp"): ...`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float, start: Optional[float] = None):
+        """Record a stage duration measured elsewhere"""
+        if not self.enabled:
+            return
+        ms = seconds * 1000
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = StageHistogram()
+            histogram.record(ms)
+            if self.keep_events and len(self._events) < self.max_events:
+                begin = start if start is not None else time.perf_counter() - seconds
+                self._events.append((name, begin, seconds, threading.get_ident()))
+
+        breakdown = _current_breakdown.get()
+        if breakdown is not None:
+            breakdown.record(name, ms)
+
+    @contextmanager
+    def capture(self):
+        """Collect a per-stage breakdown of everything traced inside the block"""
+        breakdown = StageBreakdown(_current_breakdown.get())
+        token = _current_breakdown.set(breakdown)
+        try:
+            yield breakdown
+        finally:
+            _current_breakdown.reset(token)
+
+    def histograms(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: h.to_dict() for name, h in self._histograms.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"stages": self.histograms()}
+
+    def export_json(self, path: str):
+        """Write per-stage histograms as JSON"""
+        self._write(path, self.to_dict())
+
+    def export_chrome_trace(self, path: str):
+        """Write recorded spans in Chrome trace format (chrome://tracing, Perfetto)"""
+        with self._lock:
+            events = list(self._events)
+            origin = self._origin
+        pid = os.getpid()
+        self._write(path, {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": "pipeline",
+                    "ph": "X",
+                    "ts": (begin - origin) * 1e6,
+                    "dur": seconds * 1e6,
+                    "pid": pid,
+                    "tid": tid
+                }
+                for name, begin, seconds, tid in events
+            ],
+            "displayTimeUnit": "ms"
+        })
+
+    @staticmethod
+    def _write(path: str, payload: dict):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+
+
+# Process-wide tracer used by the pipeline
+tracer = Tracer()
+
+
+def bind_context(fn: Callable) -> Callable:
+    """
+    Wrap fn to run in a copy of the caller's context, so spans recorded on
+    worker threads land in the caller's breakdown. Every call runs in its own
+    copy of that snapshot, so one wrapper may run on several threads at once
+    (executor.map). No-op while tracing is off.
+    """
+    if not tracer.enabled:
+        return fn
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
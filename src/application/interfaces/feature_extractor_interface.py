@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
 import numpy as np
 import cv2
 
+from src.domain.entities.frame import Frame
+
 
 @dataclass
 class ExtractFeatureData:
@@ -13,5 +15,15 @@ class ExtractFeatureData:
 
 class IFeatureExtractor(ABC):
     @abstractmethod
-    def extract_features(self, image: np.ndarray) -> ExtractFeatureData:
+    def extract_features(self, image: Union[Frame, np.ndarray]) -> ExtractFeatureData:
+        """Features of a BGR image; pass a Frame to share its grayscale views with other consumers"""
+        pass
+
+
+class IBatchFeatureExtractor(ABC):
+    """Decodes and extracts many image files at once, e.g. across worker processes"""
+
+    @abstractmethod
+    def extract_files(self, image_paths: List[str]) -> Iterator[Tuple[str, Optional[ExtractFeatureData]]]:
+        """Yield (path, features) as each file finishes, in any order; None for unreadable files"""
         pass
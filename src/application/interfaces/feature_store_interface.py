@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from src.application.interfaces.feature_extractor_interface import ExtractFeatureData
+
+
+class IFeatureStore(ABC):
+    """Persistent cache of catalog cover features keyed by image path"""
+
+    @abstractmethod
+    def load_features(self, image_path: str) -> Optional[ExtractFeatureData]:
+        """Return stored features, or None if missing or the image changed since"""
+        pass
+
+    @abstractmethod
+    def save_features(self, features: Dict[str, ExtractFeatureData]) -> None:
+        """Replace the stored features with the given path -> features mapping"""
+        pass
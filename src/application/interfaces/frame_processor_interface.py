@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Callable
 import numpy as np
 
+from src.application.jobs import CancellationToken
+
 
 class IFrameProcessor(ABC):
     """Abstract interface for frame processing strategies"""
@@ -19,7 +21,17 @@ class IFrameProcessor(ABC):
             w: int,
             h: int,
             alpha: float,
-            progress_callback: Optional[Callable] = None
+            progress_callback: Optional[Callable] = None,
+            start_frame: int = 0,
+            end_frame: Optional[int] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            homography_out: Optional[np.ndarray] = None
     ):
-        """Process video frames and return count of replaced frames"""
+        """
+        Process video frames and return count of replaced frames.
+        Only frames in [start_frame, end_frame) are written when a range is given.
+        A set cancel_token stops the run between batches with JobCancelled.
+        A 3x3 homography_out receives the last written frame's homography, so the
+        next range can start tracking from it.
+        """
         pass
@@ -3,7 +3,25 @@ from typing import List, Optional
 import numpy as np
 import cv2
 
+
+class IDescriptorIndex(ABC):
+    """Search index trained once over several descriptor sets (e.g. a whole catalog)"""
+
+    @abstractmethod
+    def match(self, descriptors: np.ndarray) -> List[cv2.DMatch]:
+        """
+        Return good matches for the query descriptors.
+        DMatch.imgIdx is the descriptor set index, trainIdx is local to that set.
+        """
+        pass
+
+
 class IMatcher(ABC):
     @abstractmethod
     def match_features(self, desc1: np.ndarray, desc2: np.ndarray) -> List[cv2.DMatch]:
         pass
+
+    @abstractmethod
+    def build_index(self, descriptor_sets: List[Optional[np.ndarray]]) -> IDescriptorIndex:
+        """Build a reusable index over several descriptor sets"""
+        pass
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+
+@dataclass
+class OverlayCacheEntry:
+    image_path: Optional[str]  # None when the comparison produced no overlay
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class IOverlayCache(ABC):
+    """Overlay results addressed by the content of their inputs and the overlay parameters"""
+
+    @abstractmethod
+    def key(self, file_paths: List[str], params: Dict[str, Any]) -> str:
+        """Digest of the files' bytes and the parameters"""
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[OverlayCacheEntry]:
+        pass
+
+    @abstractmethod
+    def put(self, key: str, image: Optional[np.ndarray], metadata: Dict[str, Any]) -> OverlayCacheEntry:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
@@ -0,0 +1,6 @@
+from .cancellation import CancellationToken, JobCancelled
+
+__all__ = [
+    'CancellationToken',
+    'JobCancelled'
+]
@@ -0,0 +1,30 @@
+import threading
+from typing import Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once its cancellation token is set"""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared between whoever starts a job and the code
+    running it. Long loops call raise_if_cancelled() between batches, so a job stops
+    at the next safe point instead of being killed mid-write.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "Cancelled"):
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled(self.reason)
@@ -1,6 +1,8 @@
 from .image_processing import *
 from .video_processing import *
 from .frame_processing import *
+from .catalog import *
+from .evaluation import *
 
 # backward compatibility
 from .image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
@@ -16,8 +18,28 @@ __all__ = [
     'ProcessInputVideoUseCase',
     'BookDetectorInVideo',
     'TrailerFrameLoader',
+    'TrailerFrames',
+    'SegmentedVideoRenderer',
+    'VideoPreviewUseCase',
 
     # Frame Processing
     'ParallelFrameProcessor',
-    'AsyncFrameProcessor'
+    'AsyncFrameProcessor',
+    'HomographySmoother',
+    'HomographyTracker',
+    'HomographyTrackAnalyzer',
+    'FrameBufferPool',
+    'FrameMemoryBudget',
+    'ScratchBuffers',
+
+    # Catalog
+    'CatalogIndex',
+    'CatalogManager',
+    'MatchBatcher',
+
+    # Evaluation
+    'SyntheticFixtureGenerator',
+    'BenchmarkSuite',
+    'AccuracyEvaluation',
+    'MatcherAutoTuner'
 ]
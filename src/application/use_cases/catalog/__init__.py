@@ -0,0 +1,10 @@
+from .catalog_index import CatalogIndex
+from .catalog_manager import CatalogManager, CatalogChanges
+from .match_batcher import MatchBatcher
+
+__all__ = [
+    'CatalogIndex',
+    'CatalogManager',
+    'CatalogChanges',
+    'MatchBatcher'
+]
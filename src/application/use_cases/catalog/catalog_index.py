@@ -0,0 +1,242 @@
+import threading
+import time
+from collections import Counter
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+from src.application.interfaces.feature_extractor_interface import (
+    IFeatureExtractor,
+    IBatchFeatureExtractor,
+    ExtractFeatureData
+)
+from src.application.interfaces.feature_store_interface import IFeatureStore
+from src.application.interfaces.image_repository_interface import IImageRepository
+from src.application.interfaces.matcher_interface import IMatcher, IDescriptorIndex
+from src.domain.entities.book_cover import BookCover
+from src.domain.entities.match_result import MatchResult
+
+
+class CatalogIndex:
+    """
+    Catalog covers with precomputed features and one shared kNN index over all of them.
+    Built once, then reused for every query: a query is shortlisted with a single
+    search against the whole catalog and only the top candidates are verified pairwise.
+
+    Covers can be added and removed without a full rebuild. New covers go to a small
+    delta index searched next to the main one, removed covers are tombstoned (their
+    positions stay, so in-flight queries keep valid cover indices) and compact()
+    folds both back into a single main index.
+    """
+
+    def __init__(
+            self,
+            feature_extractor: IFeatureExtractor,
+            matcher: IMatcher,
+            image_repository: IImageRepository,
+            feature_store: Optional[IFeatureStore] = None,
+            shortlist_size: int = 5,
+            compaction_ratio: float = 0.2,
+            batch_extractor: Optional[IBatchFeatureExtractor] = None
+    ):
+        self.feature_extractor = feature_extractor
+        self.matcher = matcher
+        self.image_repository = image_repository
+        self.feature_store = feature_store
+        # Votes from the shared index only approximate pairwise scores, so verify
+        # a few more candidates than requested before cutting to top_k
+        self.shortlist_size = shortlist_size
+        self.compaction_ratio = compaction_ratio
+        # Extracts covers missing from the store in bulk (e.g. a process pool) instead of one by one
+        self.batch_extractor = batch_extractor
+        self.last_build: Dict[str, float] = {}
+        self.covers: List[BookCover] = []
+        self.removed: set = set()
+        # (first cover index, index) pairs, replaced as a whole so searches see a consistent set
+        self._segments: List[Tuple[int, IDescriptorIndex]] = []
+        self._indexed_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return bool(self._segments)
+
+    @property
+    def live_covers(self) -> List[BookCover]:
+        return [cover for i, cover in enumerate(self.covers) if i not in self.removed]
+
+    @property
+    def delta_size(self) -> int:
+        return len(self.covers) - self._indexed_count
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Tombstones and delta covers together exceed compaction_ratio of the live catalog"""
+        pending = len(self.removed) + self.delta_size
+        return pending > 0 and pending > self.compaction_ratio * max(len(self.covers) - len(self.removed), 1)
+
+    def build(self, refresh: bool = False,
+              progress_callback: Optional[Callable[[int, int, float], None]] = None) -> "CatalogIndex":
+        """
+        Load covers, reuse stored features where still valid and train the shared index.
+        Cover images load lazily, so only covers without stored features are decoded,
+        through batch_extractor when one is set. With refresh=True every cover is re-extracted.
+        progress_callback receives (covers extracted, covers to extract, covers/sec).
+        """
+        covers = self.image_repository.load_book_movie_images()
+        features: Dict[str, ExtractFeatureData] = {}
+        if self.feature_store and not refresh:
+            for cover in covers:
+                feature = self.feature_store.load_features(cover.image_path)
+                if feature is not None:
+                    features[cover.image_path] = feature
+        cached = len(features)
+
+        missing = [cover for cover in covers if cover.image_path not in features]
+        started = last_report = time.perf_counter()
+        for done, (image_path, feature) in enumerate(self.extract_covers(missing), start=1):
+            if feature is not None:
+                features[image_path] = feature
+            now = time.perf_counter()
+            rate = done / (now - started) if now > started else 0.0
+            if progress_callback:
+                progress_callback(done, len(missing), rate)
+            if now - last_report >= 2.0 or done == len(missing):
+                print(f"⚙️ Extracted {done}/{len(missing)} covers ({rate:.1f} covers/s)")
+                last_report = now
+        extraction_seconds = time.perf_counter() - started
+
+        covers = [cover for cover in covers if cover.image_path in features]
+        for cover in covers:
+            cover.keypoints = features[cover.image_path].keypoints
+            cover.descriptors = features[cover.image_path].descriptors
+        extracted = len(covers) - cached
+
+        # One bulk write for the whole catalog
+        if self.feature_store and extracted:
+            self.feature_store.save_features({
+                cover.image_path: ExtractFeatureData(cover.keypoints, cover.descriptors) for cover in covers
+            })
+
+        with self._lock:
+            self.covers = covers
+            self.removed = set()
+            self._indexed_count = len(covers)
+            self._segments = [(0, self.matcher.build_index([cover.descriptors for cover in covers]))]
+        self.last_build = {
+            "covers": len(covers),
+            "extracted": extracted,
+            "from_cache": cached,
+            "extraction_seconds": extraction_seconds,
+            "extraction_covers_per_second": extracted / extraction_seconds if extracted and extraction_seconds > 0 else None
+        }
+        print(f"📚 Catalog index ready: {len(covers)} covers ({extracted} extracted, "
+              f"{cached} from cache)")
+        return self
+
+    def extract_covers(self, covers: List[BookCover]):
+        """Yield (image path, features or None) for each cover, through batch_extractor when set"""
+        if self.batch_extractor is not None:
+            yield from self.batch_extractor.extract_files([cover.image_path for cover in covers])
+            return
+        for cover in covers:
+            image = cover.image
+            feature = self.feature_extractor.extract_features(image) if image is not None else None
+            # Keep only features; pixels are decoded again if someone asks for them
+            cover.release_image()
+            yield cover.image_path, feature
+
+    def match_image(self, image: np.ndarray, source_name: str, top_k: int = 5) -> List[MatchResult]:
+        """Extract features from an image and return ranked matches against the catalog"""
+        feature = self.feature_extractor.extract_features(image)
+        return self.match_features(feature, source_name, top_k)
+
+    def match_features(self, feature: ExtractFeatureData, source_name: str, top_k: int = 5) -> List[MatchResult]:
+        """Return ranked matches for already extracted query features"""
+        candidates = self.rank_candidates(self.search(feature.descriptors), top_k)
+        return self.verify_candidates(feature, candidates, source_name)[:top_k]
+
+    def add_covers(self, covers: List[BookCover]) -> List[int]:
+        """Append covers with extracted features and rebuild only the delta index; returns their indices"""
+        with self._lock:
+            start = len(self.covers)
+            self.covers = self.covers + covers
+            delta = self.covers[self._indexed_count:]
+            delta_index = self.matcher.build_index(
+                [None if self._indexed_count + i in self.removed else cover.descriptors
+                 for i, cover in enumerate(delta)]
+            )
+            self._segments = self._segments[:1] + [(self._indexed_count, delta_index)]
+            return list(range(start, len(self.covers)))
+
+    def remove_covers(self, image_paths: List[str]) -> List[int]:
+        """Tombstone the live covers with these paths; returns their indices"""
+        paths = set(image_paths)
+        with self._lock:
+            indices = [i for i, cover in enumerate(self.covers) if i not in self.removed and cover.image_path in paths]
+            covers = list(self.covers)
+            for i in indices:
+                # The index keeps its own copy of the descriptors, so the cover's can go now
+                covers[i] = replace(covers[i], keypoints=None, descriptors=None, image_loader=None, _image=None)
+            self.covers = covers
+            self.removed = self.removed | set(indices)
+            return indices
+
+    def compact(self):
+        """Rebuild one main index over the live covers; cover indices do not change"""
+        with self._lock:
+            main_index = self.matcher.build_index(
+                [None if i in self.removed else cover.descriptors for i, cover in enumerate(self.covers)]
+            )
+            self._indexed_count = len(self.covers)
+            self._segments = [(0, main_index)]
+        print(f"🧹 Catalog compacted: {len(self.covers) - len(self.removed)} live covers, "
+              f"{len(self.removed)} tombstones")
+
+    def features_by_path(self) -> Dict[str, ExtractFeatureData]:
+        """Features of the live covers, in the shape feature stores save"""
+        return {cover.image_path: ExtractFeatureData(cover.keypoints, cover.descriptors) for cover in self.live_covers}
+
+    def search(self, descriptors) -> list:
+        """Run one kNN search against the shared index (DMatch.imgIdx is the cover index)"""
+        if not self.is_built:
+            self.build()
+        segments, removed = self._segments, self.removed
+        matches = []
+        for offset, index in segments:
+            for m in index.match(descriptors):
+                m.imgIdx += offset
+                if m.imgIdx not in removed:
+                    matches.append(m)
+        return matches
+
+    def rank_candidates(self, index_matches, top_k: int) -> List[Tuple[int, int]]:
+        """Turn index matches into (cover index, votes) pairs to verify, best first"""
+        votes = Counter(m.imgIdx for m in index_matches)
+        return votes.most_common(max(top_k, self.shortlist_size))
+
+    def verify_candidates(
+            self,
+            feature: ExtractFeatureData,
+            candidates: List[Tuple[int, int]],
+            source_name: str
+    ) -> List[MatchResult]:
+        """Pairwise match against each shortlisted cover so scores equal single comparisons"""
+        results = []
+        for cover_idx, _ in candidates:
+            cover = self.covers[cover_idx]
+            matches = self.matcher.match_features(feature.descriptors, cover.descriptors)
+            score = len(matches)
+            results.append(MatchResult(
+                source_name=source_name,
+                target_name=cover.name,
+                matches=matches,
+                confidence_score=score,
+                good_matches_count=score,
+                target_image_path=cover.image_path,
+                source_keypoints=feature.keypoints,
+                target_keypoints=cover.keypoints
+            ))
+
+        results.sort(key=lambda r: r.confidence_score, reverse=True)
+        return results
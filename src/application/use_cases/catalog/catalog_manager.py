@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.application.interfaces.feature_store_interface import IFeatureStore
+from src.application.use_cases.catalog.catalog_index import CatalogIndex
+from src.domain.entities.book_cover import BookCover
+
+
+@dataclass
+class CatalogChanges:
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {"added": self.added, "changed": self.changed, "removed": self.removed}
+
+
+class CatalogManager:
+    """
+    Keeps a built CatalogIndex in step with the cover folder. A scan compares file
+    size and mtime against the last one; only added or changed covers are extracted,
+    removed and replaced ones are tombstoned, and the index is compacted once enough
+    changes pile up or compact_interval passes. The polling loop is the source of
+    truth; when the optional watchdog package is installed, filesystem events only
+    wake it early.
+    """
+
+    def __init__(
+            self,
+            catalog: CatalogIndex,
+            feature_store: Optional[IFeatureStore] = None,
+            poll_interval: float = 2.0,
+            compact_interval: float = 300.0,
+            use_watcher: bool = True
+    ):
+        self.catalog = catalog
+        self.feature_store = feature_store if feature_store is not None else catalog.feature_store
+        self.poll_interval = poll_interval
+        self.compact_interval = compact_interval
+        self.use_watcher = use_watcher
+        self.refreshes = 0
+        self.last_changes = CatalogChanges()
+        self._snapshot: Optional[Dict[str, Tuple[int, int]]] = None
+        self._last_compaction = time.monotonic()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    def scan(self) -> CatalogChanges:
+        """Differences between the cover folder and the catalog, without touching the catalog"""
+        if not self.catalog.is_built:
+            self.catalog.build()
+        if self._snapshot is None:
+            self._snapshot = {cover.image_path: self._fingerprint(cover.image_path) for cover in self.catalog.live_covers}
+
+        current = {
+            cover.image_path: self._fingerprint(cover.image_path)
+            for cover in self.catalog.image_repository.load_book_movie_images()
+        }
+        return CatalogChanges(
+            added=sorted(path for path in current if path not in self._snapshot),
+            changed=sorted(path for path, fp in current.items() if path in self._snapshot and fp != self._snapshot[path]),
+            removed=sorted(path for path in self._snapshot if path not in current)
+        )
+
+    def refresh(self) -> CatalogChanges:
+        """Scan, apply the differences and compact when due"""
+        changes = self.scan()
+        if changes:
+            self.apply(changes)
+        pending = self.catalog.removed or self.catalog.delta_size
+        due = pending and time.monotonic() - self._last_compaction >= self.compact_interval
+        if self.catalog.needs_compaction or due:
+            self.catalog.compact()
+            self._last_compaction = time.monotonic()
+        self.refreshes += 1
+        return changes
+
+    def apply(self, changes: CatalogChanges):
+        self.catalog.remove_covers(changes.changed + changes.removed)
+
+        wanted = set(changes.added + changes.changed)
+        pending = {cover.image_path: cover for cover in self.catalog.image_repository.load_book_movie_images()
+                   if cover.image_path in wanted}
+        covers: List[BookCover] = []
+        for image_path, feature in self.catalog.extract_covers(list(pending.values())):
+            if feature is None:
+                continue
+            cover = pending[image_path]
+            cover.keypoints = feature.keypoints
+            cover.descriptors = feature.descriptors
+            covers.append(cover)
+        if covers:
+            self.catalog.add_covers(covers)
+
+        for path in changes.removed:
+            self._snapshot.pop(path, None)
+        # Unreadable covers are remembered too, so they are retried only once they change again
+        for path in wanted:
+            self._snapshot[path] = self._fingerprint(path)
+
+        if self.feature_store:
+            self.feature_store.save_features(self.catalog.features_by_path())
+        self.last_changes = changes
+        print(f"🔄 Catalog updated: {len(changes.added)} added, {len(changes.changed)} changed, "
+              f"{len(changes.removed)} removed")
+
+    def start(self) -> "CatalogManager":
+        """Refresh in a background thread until stop()"""
+        if self._thread is not None:
+            return self
+        self.scan()  # Take the baseline snapshot before anything can change
+        self._stop.clear()
+        self._observer = self._start_watcher() if self.use_watcher else None
+        self._thread = threading.Thread(target=self._run, name="catalog-manager", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "live_covers": len(self.catalog.covers) - len(self.catalog.removed),
+            "tombstones": len(self.catalog.removed),
+            "delta_covers": self.catalog.delta_size,
+            "refreshes": self.refreshes,
+            "watching": self._observer is not None,
+            "last_changes": self.last_changes.to_dict()
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Catalog refresh failed: {e}")
+
+    def _start_watcher(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        wake = self._wake
+
+        class _WakeOnChange(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+
+        folder = getattr(self.catalog.image_repository, "book_movie_path", None)
+        if not folder or not os.path.isdir(folder):
+            return None
+        observer = Observer()
+        observer.schedule(_WakeOnChange(), folder, recursive=False)
+        observer.daemon = True
+        observer.start()
+        return observer
+
+    @staticmethod
+    def _fingerprint(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,157 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import List, Optional, Dict, Any
+import numpy as np
+
+from src.application.interfaces.feature_extractor_interface import ExtractFeatureData
+from src.application.use_cases.catalog.catalog_index import CatalogIndex
+from src.domain.entities.match_result import MatchResult
+
+
+class MatchBatcher:
+    """
+    Collects concurrent catalog queries and runs them as one kNN search.
+    Queries wait at most max_wait_ms for company, and at most max_batch_size
+    queries share a search. Pairwise verification runs back in the caller's thread.
+
+    Larger batches amortize the search over more queries at the cost of queueing
+    delay; use `python -m src.cli bench --batch-sizes ... --batch-waits-ms ...`
+    to pick settings from measured throughput and p99 latency.
+    """
+
+    def __init__(self, catalog: CatalogIndex, max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        self.catalog = catalog
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+
+        self.batches_run = 0
+        self.queries_run = 0
+        self._batch_sizes = Counter()
+        self._queue_wait_seconds = 0.0
+        self._search_seconds = 0.0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        # Guards the counters and orders submit() against close()
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="match-batcher", daemon=True)
+        self._worker.start()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.queries_run / self.batches_run if self.batches_run else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters describing how well queries are being batched"""
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches_run,
+            "queries": self.queries_run,
+            "mean_batch_size": self.mean_batch_size,
+            "batch_size_histogram": {str(k): v for k, v in sorted(self._batch_sizes.items())},
+            "mean_queue_wait_ms": self._queue_wait_seconds / self.queries_run * 1000 if self.queries_run else 0.0,
+            "mean_search_ms": self._search_seconds / self.batches_run * 1000 if self.batches_run else 0.0
+        }
+
+    def __enter__(self) -> "MatchBatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def match(self, feature: ExtractFeatureData, source_name: str, top_k: int = 5) -> List[MatchResult]:
+        """Blocking: shortlist through a shared batch, then verify in this thread"""
+        index_matches = self.submit(feature.descriptors).result()
+        candidates = self.catalog.rank_candidates(index_matches, top_k)
+        return self.catalog.verify_candidates(feature, candidates, source_name)[:top_k]
+
+    def submit(self, descriptors: Optional[np.ndarray]) -> Future:
+        """Queue descriptors for the next batch; the future resolves to their index matches"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MatchBatcher is closed")
+            if descriptors is None or len(descriptors) == 0:
+                future.set_result([])
+            else:
+                self._queue.put((descriptors, future, time.perf_counter()))
+        return future
+
+    def close(self, timeout: float = 5.0):
+        """Stop accepting queries, wait up to timeout for the worker and fail whatever is still queued"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout=timeout)
+
+        # Queries the worker did not take (it stopped, or is still stuck in a search) never resolve otherwise
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("MatchBatcher closed before the query ran"))
+        if self._worker.is_alive():
+            # The drain took the stop sentinel; a worker still in its search stops once it returns
+            self._queue.put(None)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # Finish this batch, stop on the next loop
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        try:
+            started = time.perf_counter()
+            stacked = np.vstack([descriptors for descriptors, _, _ in batch])
+            # Row offsets of each query inside the stacked matrix
+            offsets = np.cumsum([0] + [len(descriptors) for descriptors, _, _ in batch])
+
+            matches = self.catalog.search(stacked)
+            query_ids = np.searchsorted(offsets, [m.queryIdx for m in matches], side="right") - 1
+
+            per_query = [[] for _ in batch]
+            for m, query_idx in zip(matches, query_ids):
+                m.queryIdx -= int(offsets[query_idx])
+                per_query[query_idx].append(m)
+
+            with self._lock:
+                self.batches_run += 1
+                self.queries_run += len(batch)
+                self._batch_sizes[len(batch)] += 1
+                self._search_seconds += time.perf_counter() - started
+                self._queue_wait_seconds += sum(started - submitted for _, _, submitted in batch)
+            for (_, future, _), matches in zip(batch, per_query):
+                future.set_result(matches)
+
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
@@ -0,0 +1,24 @@
+from .synthetic_fixtures import SyntheticFixtureGenerator, SyntheticImage, SyntheticVideo
+from .benchmark_suite import BenchmarkSuite
+from .accuracy_evaluation import (
+    AccuracyEvaluation,
+    LabeledQuery,
+    default_sweep,
+    load_labeled_queries,
+    synthetic_queries
+)
+from .matcher_tuner import MatcherAutoTuner, default_search_space
+
+__all__ = [
+    'SyntheticFixtureGenerator',
+    'SyntheticImage',
+    'SyntheticVideo',
+    'BenchmarkSuite',
+    'AccuracyEvaluation',
+    'LabeledQuery',
+    'default_sweep',
+    'load_labeled_queries',
+    'synthetic_queries',
+    'MatcherAutoTuner',
+    'default_search_space'
+]
@@ -0,0 +1,173 @@
+import json
+import time
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from src.application.interfaces.feature_extractor_interface import IFeatureExtractor
+from src.application.interfaces.image_repository_interface import IImageRepository
+from src.application.interfaces.matcher_interface import IMatcher
+from src.application.use_cases.catalog.catalog_index import CatalogIndex
+from src.application.use_cases.evaluation.synthetic_fixtures import SyntheticImage, project_corners
+from src.domain.entities.matcher_config import MatcherConfig
+
+
+@dataclass
+class LabeledQuery:
+    image_path: str
+    expected_cover: str
+    true_corners: Optional[np.ndarray] = None  # (4, 2) cover corners in the query, when known
+    source: str = "input"
+
+
+def default_sweep() -> List[MatcherConfig]:
+    """Current production setting plus the usual speed knobs, one at a time"""
+    return [
+        MatcherConfig("sift_baseline"),
+        MatcherConfig("sift_checks16", checks=16),
+        MatcherConfig("sift_checks32", checks=32),
+        MatcherConfig("sift_checks100", checks=100),
+        MatcherConfig("sift_trees2", trees=2),
+        MatcherConfig("sift_trees8", trees=8),
+        MatcherConfig("sift_kp1000", max_keypoints=1000),
+        MatcherConfig("sift_kp500", max_keypoints=500),
+        MatcherConfig("sift_scale0.75", downscale=0.75),
+        MatcherConfig("sift_scale0.5", downscale=0.5),
+        MatcherConfig("sift_ratio0.8", ratio=0.8),
+        MatcherConfig("orb_lsh", extractor="orb", max_keypoints=2000, algorithm="lsh"),
+        MatcherConfig("orb_lsh_scale0.5", extractor="orb", max_keypoints=2000, algorithm="lsh", downscale=0.5)
+    ]
+
+
+def load_labeled_queries(labels_path: str, input_dir: str = "data/input_images") -> List[LabeledQuery]:
+    """Labels file maps input image file names to expected cover names"""
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+    return [
+        LabeledQuery(str(Path(input_dir) / file_name), cover_name)
+        for file_name, cover_name in sorted(labels.items())
+        if (Path(input_dir) / file_name).exists()
+    ]
+
+
+def synthetic_queries(photos: List[SyntheticImage]) -> List[LabeledQuery]:
+    return [LabeledQuery(p.image_path, p.cover_name, p.corners, source="synthetic") for p in photos]
+
+
+class AccuracyEvaluation:
+    """
+    Runs a labeled query set through several extractor/matcher configurations and
+    reports top-1/top-k accuracy, homography corner error and per-query latency,
+    marking the configurations on the accuracy/latency Pareto front.
+    """
+
+    def __init__(
+            self,
+            image_repository: IImageRepository,
+            queries: List[LabeledQuery],
+            component_factory: Callable[[MatcherConfig], Tuple[IFeatureExtractor, IMatcher]],
+            top_k: int = 5
+    ):
+        self.image_repository = image_repository
+        self.queries = queries
+        self.component_factory = component_factory
+        self.top_k = top_k
+        self._images = [cv2.imread(q.image_path) for q in queries]
+
+    def run(self, configs: List[MatcherConfig], progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        rows = []
+        for i, config in enumerate(configs):
+            print(f"🧪 Evaluating {config.name} ({i + 1}/{len(configs)})")
+            rows.append(self.evaluate(config))
+            if progress_callback:
+                progress_callback(rows[-1])
+        return self.mark_pareto(rows)
+
+    def evaluate(self, config: MatcherConfig) -> Dict[str, Any]:
+        extractor, matcher = self.component_factory(config)
+
+        start = time.perf_counter()
+        catalog = CatalogIndex(extractor, matcher, self.image_repository).build()
+        build_seconds = time.perf_counter() - start
+        covers = {cover.name: cover for cover in catalog.covers}
+
+        latencies, corner_errors = [], []
+        top1 = top_k = corner_failures = 0
+        for query, image in zip(self.queries, self._images):
+            if image is None:
+                continue
+            start = time.perf_counter()
+            feature = extractor.extract_features(image)
+            results = catalog.match_features(feature, Path(query.image_path).stem, self.top_k)
+            latencies.append(time.perf_counter() - start)
+
+            ranked = [r.target_name for r in results if r.confidence_score > 0]
+            top1 += bool(ranked) and ranked[0] == query.expected_cover
+            top_k += query.expected_cover in ranked
+
+            if query.true_corners is not None and ranked and ranked[0] == query.expected_cover:
+                error = self._corner_error(feature.keypoints, covers[query.expected_cover], results[0].matches,
+                                           query.true_corners)
+                if error is None:
+                    corner_failures += 1
+                else:
+                    corner_errors.append(error)
+
+        evaluated = len(latencies)
+        latencies_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+        return {
+            "name": config.name,
+            "config": config.to_dict(),
+            "queries": evaluated,
+            "top1_accuracy": top1 / evaluated if evaluated else 0.0,
+            f"top{self.top_k}_accuracy": top_k / evaluated if evaluated else 0.0,
+            "mean_corner_error_px": float(np.mean(corner_errors)) if corner_errors else None,
+            "median_corner_error_px": float(np.median(corner_errors)) if corner_errors else None,
+            "homography_failures": corner_failures,
+            "mean_latency_ms": float(latencies_ms.mean()),
+            "p50_latency_ms": float(np.percentile(latencies_ms, 50)),
+            "p95_latency_ms": float(np.percentile(latencies_ms, 95)),
+            "index_build_seconds": build_seconds
+        }
+
+    @staticmethod
+    def _corner_error(query_keypoints, cover, matches, true_corners: np.ndarray) -> Optional[float]:
+        """Mean distance between the estimated and true cover corners, in query pixels"""
+        if len(matches) < 4:
+            return None
+        src = np.float32([cover.keypoints[m.trainIdx].pt for m in matches]).reshape(-1, 1, 2)
+        dst = np.float32([query_keypoints[m.queryIdx].pt for m in matches]).reshape(-1, 1, 2)
+        homography, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+        if homography is None:
+            return None
+        w, h = cover.size or cover.image.shape[1::-1]
+        estimated = project_corners(homography, w, h)
+        return float(np.linalg.norm(estimated - true_corners, axis=1).mean())
+
+    @staticmethod
+    def mark_pareto(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """A row is on the front if no other row is at least as accurate and at least as fast, and better in one"""
+        for row in rows:
+            row["pareto"] = not any(
+                other is not row
+                and other["top1_accuracy"] >= row["top1_accuracy"]
+                and other["mean_latency_ms"] <= row["mean_latency_ms"]
+                and (other["top1_accuracy"] > row["top1_accuracy"] or other["mean_latency_ms"] < row["mean_latency_ms"])
+                for other in rows
+            )
+        return sorted(rows, key=lambda r: r["mean_latency_ms"])
+
+    @staticmethod
+    def format_table(rows: List[Dict[str, Any]], top_k: int = 5) -> str:
+        header = f"{'config':<20} {'top1':>6} {f'top{top_k}':>6} {'corner px':>10} {'mean ms':>9} {'p95 ms':>9}  pareto"
+        lines = [header, "-" * len(header)]
+        for row in rows:
+            corner = row["mean_corner_error_px"]
+            lines.append(
+                f"{row['name']:<20} {row['top1_accuracy']:>6.2f} {row[f'top{top_k}_accuracy']:>6.2f} "
+                f"{(f'{corner:.1f}' if corner is not None else '-'):>10} "
+                f"{row['mean_latency_ms']:>9.1f} {row['p95_latency_ms']:>9.1f}  {'*' if row['pareto'] else ''}"
+            )
+        return "\n".join(lines)
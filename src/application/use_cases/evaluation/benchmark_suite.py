@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from src.application.interfaces.feature_extractor_interface import IFeatureExtractor
+from src.application.interfaces.frame_processor_interface import IFrameProcessor
+from src.application.interfaces.image_repository_interface import IImageRepository
+from src.application.interfaces.matcher_interface import IMatcher
+from src.application.instrumentation import PeakRssSampler
+from src.application.use_cases.catalog.catalog_index import CatalogIndex
+from src.application.use_cases.evaluation.synthetic_fixtures import SyntheticFixtureGenerator, SyntheticVideo
+from src.application.use_cases.frame_processing.async_frame_processor import AsyncFrameProcessor
+from src.application.use_cases.frame_processing.parallel_frame_processor import ParallelFrameProcessor
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.application.use_cases.video_processing.book_detector_in_video import BookDetectorInVideo
+from src.application.use_cases.video_processing.trailer_frame_loader import TrailerFrameLoader
+
+CASE_GROUPS = ("catalog", "detection", "processor")
+
+# Metrics compared against a baseline, by direction
+LOWER_IS_BETTER = ("seconds",)
+HIGHER_IS_BETTER = ("top1_accuracy", "detection_accuracy")
+
+DEFAULT_PROCESSORS: Dict[str, Callable[[FindMatchingBookMovieUseCase, int], IFrameProcessor]] = {
+    "parallel": lambda matcher, workers: ParallelFrameProcessor(matcher, max_workers=workers),
+    "async": lambda matcher, workers: AsyncFrameProcessor(matcher, max_workers=workers)
+}
+
+
+class BenchmarkSuite:
+    """
+    Times catalog matching, book detection and every frame processor on
+    deterministic synthetic fixtures, across resolutions and worker counts.
+    Results are plain JSON so a saved run can serve as the regression baseline.
+    """
+
+    def __init__(
+            self,
+            feature_extractor: IFeatureExtractor,
+            matcher: IMatcher,
+            image_repository: IImageRepository,
+            fixtures: SyntheticFixtureGenerator,
+            resolutions: List[Tuple[int, int]] = ((640, 360), (1280, 720)),
+            worker_counts: List[int] = (1, 2, 4),
+            video_frames: int = 48,
+            images_per_cover: int = 2,
+            repeat: int = 1,
+            processors: Optional[Dict[str, Callable]] = None,
+            case_groups: List[str] = CASE_GROUPS
+    ):
+        self.feature_extractor = feature_extractor
+        self.matcher = matcher
+        self.image_repository = image_repository
+        self.fixtures = fixtures
+        self.resolutions = list(resolutions)
+        self.worker_counts = list(worker_counts)
+        self.video_frames = video_frames
+        self.images_per_cover = images_per_cover
+        self.repeat = max(1, repeat)
+        self.processors = processors or DEFAULT_PROCESSORS
+        self.case_groups = list(case_groups)
+        self.book_matcher = FindMatchingBookMovieUseCase(feature_extractor, matcher, image_repository)
+
+    def run(self, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """Run every case and return {environment, config, cases}"""
+        def progress(message: str):
+            print(f"⏱️ {message}")
+            if progress_callback:
+                progress_callback(message)
+
+        cases = {}
+
+        if "catalog" in self.case_groups:
+            progress("Catalog matching")
+            cases["catalog_match"] = self._bench_catalog()
+
+        if "detection" not in self.case_groups and "processor" not in self.case_groups:
+            return self._report(cases)
+
+        trailer_path = self.fixtures.trailer(total_frames=self.video_frames)
+        trailer_frames = TrailerFrameLoader().load_trailer_frames(trailer_path)
+
+        for w, h in self.resolutions:
+            video = self.fixtures.moving_cover_video((w, h), self.video_frames)
+
+            if "detection" in self.case_groups:
+                progress(f"Detection {w}x{h}")
+                cases[f"detection/{w}x{h}"] = self._bench_detection(video)
+
+            if "processor" not in self.case_groups:
+                continue
+            for name, factory in self.processors.items():
+                for workers in self.worker_counts:
+                    progress(f"Processor {name} {w}x{h} workers={workers}")
+                    cases[f"processor/{name}/{w}x{h}/w{workers}"] = self._bench_processor(
+                        factory(self.book_matcher, workers), video, trailer_frames
+                    )
+
+        return self._report(cases)
+
+    def _report(self, cases: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": self.environment(),
+            "config": {
+                "seed": self.fixtures.seed,
+                "covers": len(self.fixtures.covers),
+                "resolutions": [f"{w}x{h}" for w, h in self.resolutions],
+                "worker_counts": self.worker_counts,
+                "video_frames": self.video_frames,
+                "images_per_cover": self.images_per_cover,
+                "repeat": self.repeat,
+                "case_groups": self.case_groups
+            },
+            "cases": cases
+        }
+
+    @staticmethod
+    def environment() -> Dict[str, Any]:
+        return {
+            "python": sys.version.split()[0],
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        }
+
+    def _bench_catalog(self) -> Dict[str, Any]:
+        photos = self.fixtures.cover_photos(self.images_per_cover)
+
+        start = time.perf_counter()
+        catalog = CatalogIndex(self.feature_extractor, self.matcher, self.image_repository).build()
+        build_seconds = time.perf_counter() - start
+
+        images = [(photo, cv2.imread(photo.image_path)) for photo in photos]
+        runs, correct = [], 0
+        for _ in range(self.repeat):
+            correct = 0
+            start = time.perf_counter()
+            for photo, image in images:
+                results = catalog.match_image(image, Path(photo.image_path).stem, top_k=1)
+                correct += bool(results) and results[0].target_name == photo.cover_name
+            runs.append(time.perf_counter() - start)
+
+        return {
+            **self._timing(runs),
+            "index_build_seconds": build_seconds,
+            "queries": len(images),
+            "mean_query_ms": min(runs) / max(len(images), 1) * 1000,
+            "top1_accuracy": correct / max(len(images), 1)
+        }
+
+    def _bench_detection(self, video: SyntheticVideo) -> Dict[str, Any]:
+        detector = BookDetectorInVideo(self.book_matcher, self.image_repository)
+        runs, detected = [], None
+        for _ in range(self.repeat):
+            cap = cv2.VideoCapture(video.video_path)
+            start = time.perf_counter()
+            try:
+                detected = detector.detect_best_book(cap, video.total_frames, min_conf=5.0)
+            finally:
+                cap.release()
+            runs.append(time.perf_counter() - start)
+
+        return {
+            **self._timing(runs),
+            "detected_book": detected[0] if detected else None,
+            "detection_accuracy": float(bool(detected) and detected[0] == video.cover_name)
+        }
+
+    def _bench_processor(self, processor: IFrameProcessor, video: SyntheticVideo, trailer_frames: List) -> Dict[str, Any]:
+        book_image = cv2.imread(video.cover_path)
+        # Ground truth from the generator keeps this case independent of detection
+        base_homography = video.homographies[len(video.homographies) // 2]
+        output_path = str(self.fixtures.output_dir / "renders" / f"{Path(video.video_path).stem}.mp4")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        runs, replaced, rss_growth = [], 0, []
+        try:
+            for _ in range(self.repeat):
+                args = (video.video_path, trailer_frames, book_image, base_homography, output_path,
+                        video.total_frames, video.fps, video.w, video.h, 0.7)
+                start = time.perf_counter()
+                with PeakRssSampler() as rss:
+                    if asyncio.iscoroutinefunction(processor.process_frames):
+                        replaced = asyncio.run(processor.process_frames(*args))
+                    else:
+                        replaced = processor.process_frames(*args)
+                runs.append(time.perf_counter() - start)
+                if rss.growth_bytes is not None:
+                    rss_growth.append(rss.growth_bytes)
+        finally:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+        return {
+            **self._timing(runs),
+            "frames": video.total_frames,
+            "replaced_frames": replaced,
+            "fps": video.total_frames / min(runs) if min(runs) > 0 else None,
+            # Resident memory the render added on top of what the process already held
+            "peak_rss_growth_mb": max(rss_growth) / 2 ** 20 if rss_growth else None
+        }
+
+    @staticmethod
+    def _timing(runs: List[float]) -> Dict[str, float]:
+        # The fastest run is the least noisy estimate of the cost itself
+        return {"seconds": min(runs), "mean_seconds": float(np.mean(runs)), "runs": len(runs)}
+
+    @staticmethod
+    def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[Dict[str, Any]]:
+        """
+        Per-case comparison against a baseline run. Timings regress when slower than
+        (1 + tolerance) x baseline; accuracies regress on any drop.
+        """
+        rows = []
+        baseline_cases = baseline.get("cases", {})
+        for case, metrics in current.get("cases", {}).items():
+            previous = baseline_cases.get(case)
+            if previous is None:
+                rows.append({"case": case, "status": "new"})
+                continue
+
+            regressions = []
+            changes = {}
+            for key in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+                if metrics.get(key) is None or previous.get(key) is None:
+                    continue
+                changes[key] = {"baseline": previous[key], "current": metrics[key]}
+                if key in LOWER_IS_BETTER and previous[key] > 0:
+                    ratio = metrics[key] / previous[key]
+                    changes[key]["ratio"] = ratio
+                    if ratio > 1 + tolerance:
+                        regressions.append(key)
+                elif key in HIGHER_IS_BETTER and metrics[key] < previous[key]:
+                    regressions.append(key)
+
+            rows.append({
+                "case": case,
+                "status": "regressed" if regressions else "ok",
+                "regressed_metrics": regressions,
+                "changes": changes
+            })
+        return rows
+
+    @staticmethod
+    def save(results: Dict[str, Any], path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    @staticmethod
+    def load(path: str) -> Optional[Dict[str, Any]]:
+        if not Path(path).exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
@@ -0,0 +1,142 @@
+import time
+import cv2
+import numpy as np
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from src.application.interfaces.feature_extractor_interface import IFeatureExtractor, ExtractFeatureData
+from src.application.interfaces.feature_store_interface import IFeatureStore
+from src.application.interfaces.image_repository_interface import IImageRepository
+from src.application.interfaces.matcher_interface import IMatcher
+from src.application.use_cases.catalog.catalog_index import CatalogIndex
+from src.application.use_cases.evaluation.accuracy_evaluation import LabeledQuery
+from src.domain.entities.matcher_config import MatcherConfig
+
+
+class _MemoryFeatureStore(IFeatureStore):
+    """Keeps cover features extracted once per extractor setting across candidate indexes"""
+
+    def __init__(self):
+        self._features: Dict[str, ExtractFeatureData] = {}
+
+    def load_features(self, image_path: str) -> Optional[ExtractFeatureData]:
+        return self._features.get(image_path)
+
+    def save_features(self, features: Dict[str, ExtractFeatureData]) -> None:
+        self._features = dict(features)
+
+
+def default_search_space(base: Optional[MatcherConfig] = None) -> List[MatcherConfig]:
+    """KD-tree and k-means over SIFT with several tree/branching and checks values, plus LSH over ORB"""
+    base = base or MatcherConfig()
+    candidates = []
+    if base.extractor == "sift":
+        # KD-tree and k-means indexes only search float descriptors
+        candidates += [
+            replace(base, name=f"kdtree_t{trees}_c{checks}", algorithm="kdtree", trees=trees, checks=checks)
+            for trees in (1, 2, 4, 8) for checks in (16, 32, 64, 128)
+        ]
+        candidates += [
+            replace(base, name=f"kmeans_b{branching}_c{checks}", algorithm="kmeans", branching=branching, checks=checks)
+            for branching in (16, 32) for checks in (32, 64, 128)
+        ]
+    candidates.append(MatcherConfig(name="lsh_orb", extractor="orb", max_keypoints=2000, algorithm="lsh",
+                                    ratio=base.ratio))
+    return candidates
+
+
+class MatcherAutoTuner:
+    """
+    Chooses FLANN settings for the current catalog: every candidate index is built
+    over the catalog and timed on a sample of labeled queries. The most accurate
+    candidate whose latency percentile fits the budget wins, the faster one on ties.
+    Features are extracted once per extractor setting, and that extraction time is
+    charged to every candidate using it.
+    """
+
+    def __init__(
+            self,
+            image_repository: IImageRepository,
+            queries: List[LabeledQuery],
+            component_factory: Callable[[MatcherConfig], Tuple[IFeatureExtractor, IMatcher]],
+            latency_budget_ms: float = 250.0,
+            percentile: float = 95.0
+    ):
+        self.image_repository = image_repository
+        self.queries = queries
+        self.component_factory = component_factory
+        self.latency_budget_ms = latency_budget_ms
+        self.percentile = percentile
+        self._images = [cv2.imread(q.image_path) for q in queries]
+
+    def tune(self, candidates: Optional[List[MatcherConfig]] = None,
+             progress_callback: Optional[Callable] = None) -> Tuple[MatcherConfig, List[Dict[str, Any]]]:
+        """Return (chosen config, one report row per candidate)"""
+        candidates = candidates or default_search_space()
+        extracted: Dict[str, tuple] = {}
+        rows = []
+
+        for i, config in enumerate(candidates):
+            print(f"🎛️ Trying {config.name} ({i + 1}/{len(candidates)})")
+            extractor, matcher = self.component_factory(config)
+
+            signature = config.extractor_signature
+            if signature not in extracted:
+                extracted[signature] = self._extract_queries(extractor) + (_MemoryFeatureStore(),)
+            features, extract_seconds, store = extracted[signature]
+
+            rows.append(self._measure(config, extractor, matcher, store, features, extract_seconds))
+            if progress_callback:
+                progress_callback(rows[-1])
+
+        return self._choose(candidates, rows), rows
+
+    def _extract_queries(self, extractor: IFeatureExtractor) -> tuple:
+        features, seconds = [], []
+        for image in self._images:
+            start = time.perf_counter()
+            features.append(extractor.extract_features(image) if image is not None else None)
+            seconds.append(time.perf_counter() - start)
+        return features, seconds
+
+    def _measure(self, config: MatcherConfig, extractor, matcher, store, features, extract_seconds) -> Dict[str, Any]:
+        start = time.perf_counter()
+        # The shared store makes every candidate after the first skip cover extraction
+        catalog = CatalogIndex(extractor, matcher, self.image_repository, feature_store=store).build()
+        build_seconds = time.perf_counter() - start
+
+        latencies, correct = [], 0
+        for query, feature, extract in zip(self.queries, features, extract_seconds):
+            if feature is None:
+                continue
+            start = time.perf_counter()
+            results = catalog.match_features(feature, Path(query.image_path).stem, top_k=1)
+            latencies.append(extract + time.perf_counter() - start)
+            correct += bool(results) and results[0].confidence_score > 0 and \
+                results[0].target_name == query.expected_cover
+
+        latencies_ms = np.array(latencies or [0.0]) * 1000
+        latency = float(np.percentile(latencies_ms, self.percentile))
+        return {
+            "name": config.name,
+            "config": config.to_dict(),
+            "queries": len(latencies),
+            "top1_accuracy": correct / len(latencies) if latencies else 0.0,
+            "mean_latency_ms": float(latencies_ms.mean()),
+            f"p{self.percentile:g}_latency_ms": latency,
+            "within_budget": latency <= self.latency_budget_ms,
+            "index_build_seconds": build_seconds
+        }
+
+    @staticmethod
+    def _choose(candidates: List[MatcherConfig], rows: List[Dict[str, Any]]) -> MatcherConfig:
+        by_name = {c.name: c for c in candidates}
+        within = [r for r in rows if r["within_budget"]]
+        if within:
+            best = max(within, key=lambda r: (r["top1_accuracy"], -r["mean_latency_ms"]))
+        else:
+            print("⚠️ No candidate fits the latency budget, choosing the fastest")
+            best = min(rows, key=lambda r: r["mean_latency_ms"])
+        best["chosen"] = True
+        return by_name[best["name"]]
@@ -0,0 +1,208 @@
+import zlib
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.application.interfaces.image_repository_interface import IImageRepository
+from src.domain.entities.book_cover import BookCover
+
+
+@dataclass
+class SyntheticImage:
+    """A cover photographed under a known homography"""
+    image_path: str
+    cover_name: str
+    cover_path: str
+    homography: np.ndarray  # Cover image coordinates -> synthetic image coordinates
+    cover_size: Tuple[int, int]  # (w, h) of the cover image
+
+    @property
+    def corners(self) -> np.ndarray:
+        """Ground-truth cover corners in the synthetic image, shape (4, 2)"""
+        return project_corners(self.homography, *self.cover_size)
+
+
+@dataclass
+class SyntheticVideo:
+    """A cover moving across a textured background"""
+    video_path: str
+    cover_name: str
+    cover_path: str
+    total_frames: int
+    fps: float
+    w: int
+    h: int
+    homographies: List[np.ndarray] = field(default_factory=list)  # One per frame
+
+
+def project_corners(homography: np.ndarray, w: int, h: int) -> np.ndarray:
+    corners = np.float32([[0, 0], [w, 0], [w, h], [0, h]]).reshape(-1, 1, 2)
+    return cv2.perspectiveTransform(corners, homography).reshape(4, 2)
+
+
+class SyntheticFixtureGenerator:
+    """
+    Deterministic benchmark fixtures built from the catalog covers: cover photos
+    under random homographies, lighting and blur, short videos with a moving
+    cover, and a synthetic trailer. The same seed always yields the same pixels.
+    """
+
+    def __init__(
+            self,
+            image_repository: IImageRepository,
+            output_dir: str = "data/benchmarks/fixtures",
+            seed: int = 0,
+            max_covers: Optional[int] = None
+    ):
+        self.image_repository = image_repository
+        self.seed = seed
+        self.output_dir = Path(output_dir) / f"seed_{seed}"
+        self.max_covers = max_covers
+        self._covers: Optional[List[BookCover]] = None
+
+    @property
+    def covers(self) -> List[BookCover]:
+        if self._covers is None:
+            covers = sorted(self.image_repository.load_book_movie_images(), key=lambda c: c.name)
+            self._covers = covers[:self.max_covers] if self.max_covers else covers
+        return self._covers
+
+    def cover_photos(self, per_cover: int = 2, size: Tuple[int, int] = (640, 480)) -> List[SyntheticImage]:
+        """Warp every cover per_cover times onto a cluttered background"""
+        out_dir = self.output_dir / "images"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        w, h = size
+
+        photos = []
+        for cover in self.covers:
+            rng = self._rng("photo", cover.name)
+            for i in range(per_cover):
+                background = self._background(rng, w, h)
+                homography = self._random_homography(rng, cover.image.shape[1], cover.image.shape[0], w, h)
+                image = self._composite(background, cover.image, homography)
+                image = self._degrade(rng, image)
+
+                path = out_dir / f"{cover.name}_{i}.jpg"
+                cv2.imwrite(str(path), image, [cv2.IMWRITE_JPEG_QUALITY, 92])
+                photos.append(SyntheticImage(
+                    str(path), cover.name, cover.image_path, homography,
+                    (cover.image.shape[1], cover.image.shape[0])
+                ))
+
+        return photos
+
+    def moving_cover_video(
+            self,
+            resolution: Tuple[int, int],
+            total_frames: int = 48,
+            fps: float = 24.0,
+            cover_index: int = 0
+    ) -> SyntheticVideo:
+        """Write a video of one cover drifting and rotating over a static background"""
+        cover = self.covers[cover_index % len(self.covers)]
+        w, h = resolution
+        out_dir = self.output_dir / "videos"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{cover.name}_{w}x{h}_{total_frames}.mp4"
+
+        rng = self._rng("video", cover.name, w, h)
+        background = self._background(rng, w, h)
+        ch, cw = cover.image.shape[:2]
+        scale = 0.6 * h / ch
+
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (w, h))
+        homographies = []
+        try:
+            for i in range(total_frames):
+                t = i / max(total_frames - 1, 1)
+                center = (w * (0.35 + 0.3 * t), h * (0.5 + 0.05 * np.sin(2 * np.pi * t)))
+                angle = -8 + 16 * t
+                homography = self._placement(cw, ch, center, scale, angle)
+                writer.write(self._composite(background, cover.image, homography))
+                homographies.append(homography)
+        finally:
+            writer.release()
+
+        return SyntheticVideo(str(path), cover.name, cover.image_path, total_frames, fps, w, h, homographies)
+
+    def trailer(self, resolution: Tuple[int, int] = (320, 240), total_frames: int = 48, fps: float = 24.0) -> str:
+        """Write a synthetic trailer: a shifting color gradient with a moving disc"""
+        w, h = resolution
+        out_dir = self.output_dir / "trailers"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"trailer_{w}x{h}_{total_frames}.mp4"
+
+        xs = np.linspace(0, 179, w, dtype=np.float32)
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (w, h))
+        try:
+            for i in range(total_frames):
+                hue = ((xs + i * 4) % 180).astype(np.uint8)
+                hsv = np.dstack([
+                    np.tile(hue, (h, 1)),
+                    np.full((h, w), 200, np.uint8),
+                    np.full((h, w), 220, np.uint8)
+                ])
+                frame = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+                cx = int(w * (0.2 + 0.6 * i / max(total_frames - 1, 1)))
+                cv2.circle(frame, (cx, h // 2), h // 6, (255, 255, 255), -1)
+                writer.write(frame)
+        finally:
+            writer.release()
+
+        return str(path)
+
+    def _rng(self, *key) -> np.random.Generator:
+        # Per-fixture streams: adding covers does not change existing fixtures
+        return np.random.default_rng([self.seed, zlib.crc32(repr(key).encode())])
+
+    @staticmethod
+    def _background(rng: np.random.Generator, w: int, h: int) -> np.ndarray:
+        """Low-frequency noise with a few random shapes, so matching has distractors"""
+        noise = rng.integers(0, 256, size=(max(h // 16, 2), max(w // 16, 2), 3), dtype=np.uint8)
+        background = cv2.resize(noise, (w, h), interpolation=cv2.INTER_CUBIC)
+        for _ in range(8):
+            color = tuple(int(c) for c in rng.integers(0, 256, size=3))
+            x, y = int(rng.integers(0, w)), int(rng.integers(0, h))
+            cv2.rectangle(background, (x, y), (x + int(rng.integers(10, w // 4 + 11)),
+                                              y + int(rng.integers(10, h // 4 + 11))), color, -1)
+        return background
+
+    @staticmethod
+    def _placement(cw: int, ch: int, center, scale: float, angle: float) -> np.ndarray:
+        """Similarity transform putting the cover's center at `center`"""
+        m = cv2.getRotationMatrix2D((cw / 2, ch / 2), angle, scale)
+        m[0, 2] += center[0] - cw / 2
+        m[1, 2] += center[1] - ch / 2
+        return np.vstack([m, [0, 0, 1]])
+
+    def _random_homography(self, rng: np.random.Generator, cw: int, ch: int, w: int, h: int) -> np.ndarray:
+        """Random placement plus independent corner jitter for perspective"""
+        scale = rng.uniform(0.45, 0.75) * min(h / ch, w / cw)
+        center = (w * rng.uniform(0.35, 0.65), h * rng.uniform(0.4, 0.6))
+        base = self._placement(cw, ch, center, scale, rng.uniform(-15, 15))
+
+        src = np.float32([[0, 0], [cw, 0], [cw, ch], [0, ch]])
+        dst = cv2.perspectiveTransform(src.reshape(-1, 1, 2), base).reshape(4, 2)
+        dst += rng.uniform(-0.08, 0.08, size=(4, 2)).astype(np.float32) * np.float32([cw, ch]) * scale
+        return cv2.getPerspectiveTransform(src, dst.astype(np.float32)).astype(np.float64)
+
+    @staticmethod
+    def _composite(background: np.ndarray, cover: np.ndarray, homography: np.ndarray) -> np.ndarray:
+        h, w = background.shape[:2]
+        result = background.copy()
+        cv2.warpPerspective(cover, homography, (w, h), dst=result,
+                            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_TRANSPARENT)
+        return result
+
+    @staticmethod
+    def _degrade(rng: np.random.Generator, image: np.ndarray) -> np.ndarray:
+        """Lighting change, blur and sensor noise"""
+        gain, bias = rng.uniform(0.6, 1.3), rng.uniform(-30, 30)
+        image = cv2.convertScaleAbs(image, alpha=gain, beta=bias)
+        sigma = rng.uniform(0, 1.5)
+        if sigma > 0.3:
+            image = cv2.GaussianBlur(image, (0, 0), sigma)
+        noise = rng.normal(0, 4, size=image.shape)
+        return np.clip(image.astype(np.float32) + noise, 0, 255).astype(np.uint8)
@@ -1,7 +1,16 @@
 from .parallel_frame_processor import ParallelFrameProcessor
 from .async_frame_processor import AsyncFrameProcessor
+from .homography_smoother import HomographySmoother, HomographyTracker
+from .homography_track_analyzer import HomographyTrackAnalyzer
+from .frame_buffer_pool import FrameBufferPool, FrameMemoryBudget, ScratchBuffers
 
 __all__ = [
     'ParallelFrameProcessor',
-    'AsyncFrameProcessor'
+    'AsyncFrameProcessor',
+    'HomographySmoother',
+    'HomographyTracker',
+    'HomographyTrackAnalyzer',
+    'FrameBufferPool',
+    'FrameMemoryBudget',
+    'ScratchBuffers'
 ]
@@ -1,20 +1,45 @@
 import asyncio
 import cv2
 import numpy as np
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
 from src.application.interfaces.frame_processor_interface import IFrameProcessor
+from src.application.jobs import CancellationToken
+from src.application.instrumentation import tracer, bind_context
+from src.application.use_cases.frame_processing.frame_buffer_pool import (
+    FrameBufferPool, FrameMemoryBudget, ScratchBuffers
+)
+from src.application.use_cases.frame_processing.homography_smoother import HomographyTracker
+from src.application.use_cases.frame_processing.homography_track_analyzer import HomographyTrackAnalyzer
 from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.domain.entities.homography_track import HomographyTrack
 
 
 class AsyncFrameProcessor(IFrameProcessor):
     """Async frame processor using asyncio with thread pool"""
 
-    def __init__(self, book_matcher: FindMatchingBookMovieUseCase, max_workers: int = 4):
+    def __init__(
+            self,
+            book_matcher: FindMatchingBookMovieUseCase,
+            max_workers: int = 4,
+            smoothing: Optional[float] = None,
+            detect_every: int = 1,
+            track_analyzer: Optional[HomographyTrackAnalyzer] = None,
+            memory_budget: int = 512 * 2 ** 20
+    ):
         self.book_matcher = book_matcher
         self.max_workers = max_workers
+        # Weight of each new homography estimate; None (the default) passes raw estimates through
+        self.smoothing = smoothing
+        # Full matching runs on every detect_every-th frame, the rest are interpolated
+        self.detect_every = max(detect_every, 1)
+        # Two-pass mode: analyze the whole video into a stored track, then only composite
+        self.track_analyzer = track_analyzer
+        # Bytes of frame memory (trailer, in-flight frames, warp canvases) a render may hold
+        self.memory_budget = memory_budget
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._scratch = ScratchBuffers()
 
     async def process_frames(
             self,
@@ -28,126 +53,270 @@ class AsyncFrameProcessor(IFrameProcessor):
             w: int,
             h: int,
             alpha: float,
-            progress_callback: Optional[Callable] = None
+            progress_callback: Optional[Callable] = None,
+            start_frame: int = 0,
+            end_frame: Optional[int] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            homography_out: Optional[np.ndarray] = None
     ) -> int:
         """Process frames asynchronously"""
 
+        if end_frame is None:
+            end_frame = total_frames
+        range_frames = max(end_frame - start_frame, 0)
+
+        # Decode, composite and encode overlap through bounded queues; a slot per frame
+        # in flight keeps resident frames within the memory budget. A budget that cannot
+        # hold the pipeline fails here, before any analysis.
+        budget = FrameMemoryBudget(self.memory_budget, (h, w, 3), self.max_workers, trailer_frames)
+        print(f"🧮 Frame memory: {budget.describe()}")
+
         # Pre-compute book features
-        feature_book = self.book_matcher.feature_extractor.extract_features(book_image)
+        feature_book, tracker, track = None, None, None
+        if self.track_analyzer:
+            track = self.track_analyzer.load_or_analyze(
+                video_path, book_image, base_homography, total_frames, fps, w, h,
+                progress_callback, cancel_token
+            )
+        else:
+            feature_book = self.book_matcher.feature_extractor.extract_features(book_image)
+            tracker = HomographyTracker.for_book(book_image, base_homography, self.smoothing, self.detect_every)
 
         # Create output writer
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
         writer = cv2.VideoWriter(output_path, fourcc, fps, (w, h))
 
-        # Process in chunks
-        chunk_size = 50
-        replaced_count = 0
+        pool = budget.pool(limit=False)
+        slots = asyncio.Semaphore(budget.max_frames)
+        decoded = asyncio.Queue(maxsize=budget.queue_size)
+        encoded = asyncio.Queue(maxsize=budget.queue_size)
+        chunk_size = min(50, budget.batch_size)
 
-        for chunk_start in range(0, total_frames, chunk_size):
-            chunk_end = min(chunk_start + chunk_size, total_frames)
+        decode_task = asyncio.ensure_future(
+            self._decode_stage(video_path, start_frame, end_frame, pool, slots, decoded)
+        )
+        encode_task = asyncio.ensure_future(self._encode_stage(writer, pool, slots, encoded))
 
-            # Process chunk asynchronously
-            chunk_results = await self._process_chunk_async(
-                video_path, chunk_start, chunk_end, trailer_frames,
-                book_image, feature_book, base_homography, w, h, alpha
-            )
+        last_homography = None
+        try:
+            chunk = []
+            while True:
+                item = await decoded.get()
+                if item is not None:
+                    chunk.append(item)
+                if chunk and (item is None or len(chunk) == chunk_size):
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    last_homography = await self._process_chunk_async(
+                        video_path, chunk, trailer_frames, book_image, feature_book,
+                        tracker, track, end_frame, w, h, alpha, encoded
+                    )
 
-            # Write results in order
-            for frame in chunk_results:
-                if frame is not None:
-                    writer.write(frame)
-                    replaced_count += 1
+                    if progress_callback:
+                        done = chunk[-1][0] + 1 - start_frame
+                        progress = 20 + (done / range_frames) * 60
+                        progress_callback(f"Processed {done}/{range_frames} frames", progress)
+                    chunk = []
+                if item is None:
+                    break
 
-            if progress_callback:
-                progress = 20 + (chunk_end / total_frames) * 60
-                progress_callback(f"Processed {chunk_end}/{total_frames} frames", progress)
+            await encoded.put(None)
+            replaced_count = await encode_task
 
-        writer.release()
+        finally:
+            for task in (decode_task, encode_task):
+                task.cancel()
+            await asyncio.gather(decode_task, encode_task, return_exceptions=True)
+            writer.release()
+        if homography_out is not None and last_homography is not None:
+            homography_out[...] = last_homography
         return replaced_count
 
-    async def _process_chunk_async(
+    async def _decode_stage(
             self,
             video_path: str,
             start: int,
             end: int,
+            pool: FrameBufferPool,
+            slots: asyncio.Semaphore,
+            decoded: asyncio.Queue
+    ):
+        """Decode frames sequentially on one thread: (index, frame or None), then a None sentinel"""
+        loop = asyncio.get_event_loop()
+        cap = cv2.VideoCapture(video_path)
+        try:
+            # Shutting the reader down waits for an in-flight read, so the capture is
+            # never released under it when the render is cancelled
+            with ThreadPoolExecutor(max_workers=1) as reader:
+                opened = cap.isOpened()
+                if opened:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+                for idx in range(start, end):
+                    frame = None
+                    if opened:
+                        await slots.acquire()
+                        buffer = pool.acquire()
+                        frame = await loop.run_in_executor(reader, bind_context(self._decode_next), cap, buffer)
+                        if frame is None:
+                            pool.release(buffer)
+                            slots.release()
+                    await decoded.put((idx, frame))
+        except Exception as e:
+            print(f"Error decoding {video_path}: {e}")
+        finally:
+            cap.release()
+        await decoded.put(None)
+
+    @staticmethod
+    def _decode_next(cap: cv2.VideoCapture, buffer: np.ndarray) -> Optional[np.ndarray]:
+        with tracer.span("decode"):
+            ret, frame = cap.read(image=buffer)
+        return frame if ret else None
+
+    @staticmethod
+    async def _encode_stage(writer, pool: FrameBufferPool, slots: asyncio.Semaphore, encoded: asyncio.Queue) -> int:
+        """Write composited frames in order, then hand their buffers and slots back"""
+        replaced_count = 0
+        while True:
+            item = await encoded.get()
+            if item is None:
+                return replaced_count
+            frame, task = item
+            if frame is None:
+                continue
+            try:
+                result = await task
+                with tracer.span("encode"):
+                    writer.write(result)
+                replaced_count += 1
+            except Exception as e:
+                print(f"Frame processing error: {e}")
+            finally:
+                pool.release(frame)
+                slots.release()
+
+    async def _process_chunk_async(
+            self,
+            video_path: str,
+            chunk: List[Tuple[int, Optional[np.ndarray]]],
             trailer_frames: List,
             book_image,
             feature_book,
-            base_homography,
+            tracker: Optional[HomographyTracker],
+            track: Optional[HomographyTrack],
+            end_frame: int,
             w: int,
             h: int,
-            alpha: float
-    ) -> List[np.ndarray]:
-        """Process a chunk of frames asynchronously"""
+            alpha: float,
+            encoded: asyncio.Queue
+    ) -> np.ndarray:
+        """Track a chunk of decoded frames, queue their composites and return the last homography"""
 
         loop = asyncio.get_event_loop()
+        indices = [idx for idx, _ in chunk]
+        frames = [frame for _, frame in chunk]
 
-        # Create tasks for each frame in chunk
-        tasks = []
-        for idx in range(start, end):
-            task = loop.run_in_executor(
-                self.executor,
-                self._process_frame_by_index,
-                video_path, idx, trailer_frames, book_image,
-                feature_book, base_homography, w, h, alpha
-            )
-            tasks.append(task)
+        if track is not None:
+            homographies = [track.homography(idx) for idx in indices]
+        else:
+            homographies = await self._track_chunk(video_path, indices, frames, feature_book, tracker, end_frame)
 
-        # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for idx, frame, homography in zip(indices, frames, homographies):
+            task = None
+            if frame is not None:
+                task = loop.run_in_executor(
+                    self.executor, bind_context(self.composite_frame), frame, idx, trailer_frames,
+                    book_image, feature_book, homography, alpha, (w, h), homography, frame
+                )
+            await encoded.put((frame, task))
+        return homographies[-1]
 
-        # Handle exceptions and return frames
-        processed_frames = []
-        for result in results:
-            if isinstance(result, Exception):
-                print(f"Frame processing error: {result}")
-                processed_frames.append(None)
-            else:
-                processed_frames.append(result)
+    async def _track_chunk(
+            self,
+            video_path: str,
+            indices: List[int],
+            frames: List[Optional[np.ndarray]],
+            feature_book,
+            tracker: HomographyTracker,
+            end_frame: int
+    ) -> List[np.ndarray]:
+        """Match keyframes only, then filter them in frame order"""
+        loop = asyncio.get_event_loop()
 
-        return processed_frames
+        def run(fn, *args):
+            return loop.run_in_executor(self.executor, bind_context(fn), *args)
+
+        keyframes = [(idx, frame) for idx, frame in zip(indices, frames)
+                     if frame is not None and tracker.is_keyframe(idx) and not tracker.has(idx)]
+        if tracker.detect_every > 1 and indices:
+            # Frames after the last keyframe interpolate towards the next one
+            lookahead = tracker.next_keyframe(indices[-1])
+            if lookahead < end_frame and not tracker.has(lookahead):
+                frame = await run(self._read_frame, video_path, lookahead)
+                if frame is not None:
+                    keyframes.append((lookahead, frame))
+        estimates = await asyncio.gather(*[
+            run(self._compute_homography_for_frame, frame, feature_book, None) for _, frame in keyframes
+        ])
+        return tracker.track(indices, {idx: H for (idx, _), H in zip(keyframes, estimates)})
 
-    def _process_frame_by_index(
+    @staticmethod
+    def _read_frame(video_path: str, frame_idx: int, buffer: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Decode a single frame by index, into buffer when given (runs in thread pool)"""
+        with tracer.span("decode"):
+            cap = cv2.VideoCapture(video_path)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            ret, frame = cap.read(image=buffer)
+            cap.release()
+        return frame if ret else None
+
+    def composite_frame(
             self,
-            video_path: str,
+            frame: np.ndarray,
             frame_idx: int,
             trailer_frames: List,
             book_image,
             feature_book,
             base_homography,
-            w: int,
-            h: int,
-            alpha: float
+            alpha: float,
+            size: Optional[tuple] = None,
+            homography: Optional[np.ndarray] = None,
+            out: Optional[np.ndarray] = None
     ) -> np.ndarray:
-        """Process single frame by index (runs in thread pool)"""
-
-        # Extract frame
-        cap = cv2.VideoCapture(video_path)
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        cap.release()
-
-        if not ret:
-            return None
+        """
+        Blend the trailer frame for frame_idx over the tracked book in one decoded frame.
+        Without a tracked homography, it is estimated from this frame alone. The result
+        goes to out when given (the frame itself for in-place blending).
+        """
+        w, h = size or (frame.shape[1], frame.shape[0])
 
         # Get trailer frame
-        tr_frame = trailer_frames[min(frame_idx, len(trailer_frames) - 1)]
-        tr_frame = cv2.rotate(tr_frame, cv2.ROTATE_90_CLOCKWISE)
-        # Resize the trailer
-        h_book, w_book = book_image.shape[:2]
-        tr_resized = cv2.resize(tr_frame, (w_book, h_book), interpolation=cv2.INTER_CUBIC)
+        with tracer.span("trailer_fetch"):
+            tr_frame = trailer_frames[min(frame_idx, len(trailer_frames) - 1)]
+            rotated = self._scratch.get("rotated", (tr_frame.shape[1], tr_frame.shape[0], 3))
+            tr_frame = cv2.rotate(tr_frame, cv2.ROTATE_90_CLOCKWISE, dst=rotated)
+            # Resize the trailer
+            h_book, w_book = book_image.shape[:2]
+            tr_resized = cv2.resize(tr_frame, (w_book, h_book), dst=self._scratch.get("resized", (h_book, w_book, 3)),
+                                    interpolation=cv2.INTER_CUBIC)
 
         # Compute homography
-        current_H = self._compute_homography_for_frame(frame, feature_book, base_homography)
+        current_H = homography
+        if current_H is None:
+            current_H = self._compute_homography_for_frame(frame, feature_book, base_homography)
 
-        # Warp and blend
-        warped = cv2.warpPerspective(
-            tr_resized, current_H, (w, h),
-            flags=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_TRANSPARENT
-        )
+        # Warp into this thread's canvas; outside the cover it stays black
+        with tracer.span("warp"):
+            warped = self._scratch.get("warped", (h, w, 3))
+            warped.fill(0)
+            cv2.warpPerspective(
+                tr_resized, current_H, (w, h), dst=warped,
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_TRANSPARENT
+            )
 
-        return (frame * (1 - alpha) + warped * alpha).astype(np.uint8)
+        with tracer.span("blend"):
+            return cv2.addWeighted(frame, 1 - alpha, warped, alpha, 0, dst=out)
 
     def _compute_homography_for_frame(self, frame, feature_book, base_homography):
         """Compute homography for frame"""
@@ -162,7 +331,8 @@ class AsyncFrameProcessor(IFrameProcessor):
                 if len(matches) >= 4:
                     src = np.float32([feature_book.keypoints[m.trainIdx].pt for m in matches]).reshape(-1, 1, 2)
                     dst = np.float32([feature_frame.keypoints[m.queryIdx].pt for m in matches]).reshape(-1, 1, 2)
-                    H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+                    with tracer.span("ransac"):
+                        H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
 
                     if H is not None:
                         return H
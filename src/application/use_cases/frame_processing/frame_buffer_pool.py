@@ -0,0 +1,131 @@
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+class FrameBufferPool:
+    """
+    Preallocated uint8 frames of one shape, recycled through a render. Frames are
+    decoded into acquired buffers (cap.read(image=buf)), blended in place and
+    released once written, so a render allocates about as many frames as are in
+    flight instead of several per frame. One read-only black frame stands in for
+    frames that fail to decode or composite.
+
+    With a limit, at most that many buffers are handed out at once and acquire
+    blocks until one is released, which is how decoding is held back when later
+    stages fall behind.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], capacity: int = 32, limit: Optional[int] = None):
+        self.shape = tuple(shape)
+        self.capacity = capacity  # Idle buffers kept for reuse; extras are left to the GC
+        self.limit = limit
+        self.allocated = 0
+        self.reused = 0
+        self._free: List[np.ndarray] = []
+        self._in_use: Dict[int, np.ndarray] = {}
+        self._available = threading.Condition()
+        self._black = np.zeros(self.shape, dtype=np.uint8)
+        self._black.flags.writeable = False
+
+    @property
+    def black(self) -> np.ndarray:
+        return self._black
+
+    @property
+    def frame_bytes(self) -> int:
+        return int(np.prod(self.shape))
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """A free buffer; with a limit, waits up to timeout for one and returns None if none came back"""
+        with self._available:
+            if self.limit is not None:
+                if not self._available.wait_for(lambda: len(self._in_use) < self.limit, timeout):
+                    return None
+            if self._free:
+                self.reused += 1
+                buffer = self._free.pop()
+            else:
+                self.allocated += 1
+                buffer = np.empty(self.shape, dtype=np.uint8)
+            self._in_use[id(buffer)] = buffer
+            return buffer
+
+    def release(self, buffer) -> None:
+        """Return an acquired buffer; anything else (the black frame, None, repeats) is ignored"""
+        if buffer is None:
+            return
+        with self._available:
+            if self._in_use.pop(id(buffer), None) is None:
+                return
+            if len(self._free) < self.capacity:
+                self._free.append(buffer)
+            self._available.notify()
+
+    def stats(self) -> Dict[str, int]:
+        with self._available:
+            return {"allocated": self.allocated, "reused": self.reused,
+                    "idle": len(self._free), "in_use": len(self._in_use)}
+
+
+class FrameMemoryBudget:
+    """
+    Splits a byte budget for resident video frames into pipeline capacities. The
+    trailer (its cache when it is decoded on demand) and one warp canvas per worker
+    are charged first; the rest is the number of decoded frames that may exist at
+    once, shared by the decode queue, the batch being processed and the encode queue.
+    A budget without room for one frame per stage is rejected.
+    """
+
+    MAX_BATCH = 100
+    MIN_FRAMES = 3  # One frame per stage keeps the pipeline moving
+
+    def __init__(
+            self,
+            budget_bytes: int,
+            frame_shape: Tuple[int, ...],
+            max_workers: int,
+            trailer_frames: Sequence[np.ndarray] = ()
+    ):
+        self.budget_bytes = budget_bytes
+        self.frame_shape = tuple(frame_shape)
+        self.frame_bytes = int(np.prod(self.frame_shape))
+        self.trailer_bytes = getattr(trailer_frames, "nbytes", None)
+        if self.trailer_bytes is None:
+            self.trailer_bytes = sum(frame.nbytes for frame in trailer_frames if frame is not None)
+        self.scratch_bytes = max_workers * self.frame_bytes
+
+        available = budget_bytes - self.trailer_bytes - self.scratch_bytes
+        if available < self.MIN_FRAMES * self.frame_bytes:
+            needed = budget_bytes - available + self.MIN_FRAMES * self.frame_bytes
+            raise ValueError(
+                f"Memory budget of {budget_bytes / 2 ** 20:.1f} MB is too small: the trailer takes "
+                f"{self.trailer_bytes / 2 ** 20:.1f} MB and {self.frame_shape[1]}x{self.frame_shape[0]} "
+                f"frames need at least {needed / 2 ** 20:.1f} MB"
+            )
+        self.max_frames = available // max(self.frame_bytes, 1)
+        self.batch_size = max(1, min(self.MAX_BATCH, self.max_frames // 3))
+        self.queue_size = self.batch_size
+
+    @property
+    def resident_bytes(self) -> int:
+        """Upper bound of frame memory the pipeline holds"""
+        return self.trailer_bytes + self.scratch_bytes + self.max_frames * self.frame_bytes
+
+    def pool(self, limit: bool = True) -> FrameBufferPool:
+        return FrameBufferPool(self.frame_shape, capacity=self.max_frames, limit=self.max_frames if limit else None)
+
+    def describe(self) -> str:
+        return (f"{self.budget_bytes / 2 ** 20:.0f} MB budget: trailer {self.trailer_bytes / 2 ** 20:.0f} MB, "
+                f"up to {self.max_frames} frames in flight, batches of {self.batch_size}")
+
+
+class ScratchBuffers(threading.local):
+    """Per-thread reusable work arrays (warp canvases, rotated trailer frames), keyed by name"""
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        buffers = self.__dict__.setdefault("buffers", {})
+        buffer = buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
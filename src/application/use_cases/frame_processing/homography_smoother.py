@@ -0,0 +1,181 @@
+import bisect
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+class HomographySmoother:
+    """
+    Temporal filter over the per-frame book->frame homographies. Each estimate is
+    reduced to where it puts the cover's four corners; corners are exponentially
+    smoothed, and estimates that are degenerate or jump further than max_jump
+    (a fraction of the tracked quad's diagonal) are rejected and the last good
+    placement is held instead. After max_misses rejections in a row the next
+    estimate is accepted as is, so a real cut re-acquires the cover.
+    """
+
+    def __init__(
+            self,
+            book_size: Tuple[int, int],
+            smoothing: float = 0.6,
+            max_jump: float = 0.25,
+            max_misses: int = 5,
+            initial: Optional[np.ndarray] = None
+    ):
+        w, h = book_size
+        self.book_corners = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+        self.smoothing = smoothing  # Weight of the new estimate, 1.0 disables smoothing
+        self.max_jump = max_jump
+        self.max_misses = max_misses
+        self.rejected = 0
+        self.accepted = False  # Whether the latest estimate was taken rather than held over
+        self._misses = 0
+        self._corners = self.corners(initial) if initial is not None else None
+        self._acquired = False  # Whether _corners came from a frame rather than the initial guess
+
+    def update(self, homography: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Feed the raw estimate for the next frame (None when matching failed) and get the filtered one"""
+        corners = self.corners(homography) if homography is not None else None
+        if corners is not None and self._accept(corners):
+            # A re-acquired cover (after a cut) starts fresh instead of sliding over
+            if self._acquired and self._misses < self.max_misses:
+                corners = self.smoothing * corners + (1 - self.smoothing) * self._corners
+            self._corners = corners.astype(np.float32)
+            self._acquired = True
+            self._misses = 0
+            self.accepted = True
+        else:
+            self._misses += 1
+            self.rejected += homography is not None
+            self.accepted = False
+        return self.current
+
+    def reset(self):
+        """Forget the tracked placement, e.g. at a shot cut; the next estimate is taken as is"""
+        self._acquired = False
+        self._misses = 0
+
+    @property
+    def current(self) -> Optional[np.ndarray]:
+        if self._corners is None:
+            return None
+        return self.from_corners(self._corners)
+
+    def corners(self, homography: np.ndarray) -> Optional[np.ndarray]:
+        """Frame positions of the cover corners, or None for a degenerate homography"""
+        if homography is None or not np.all(np.isfinite(homography)):
+            return None
+        projected = cv2.perspectiveTransform(self.book_corners.reshape(-1, 1, 2), np.float64(homography))
+        projected = projected.reshape(4, 2)
+        # A cover seen from the front stays a convex quad with the same orientation
+        if not cv2.isContourConvex(projected.astype(np.float32)):
+            return None
+        if cv2.contourArea(projected.astype(np.float32), oriented=True) <= 0:
+            return None
+        return projected
+
+    def from_corners(self, corners: np.ndarray) -> np.ndarray:
+        return cv2.getPerspectiveTransform(self.book_corners, np.float32(corners))
+
+    def interpolate(self, start: np.ndarray, end: np.ndarray, t: float) -> np.ndarray:
+        """Homography a fraction t of the way from start to end, blended in corner space"""
+        start_corners, end_corners = self.corners(start), self.corners(end)
+        if start_corners is None or end_corners is None:
+            return start if t < 0.5 else end
+        return self.from_corners((1 - t) * start_corners + t * end_corners)
+
+    def _accept(self, corners: np.ndarray) -> bool:
+        if not self._acquired or self._misses >= self.max_misses:
+            return True
+        diagonal = np.linalg.norm(self._corners[2] - self._corners[0])
+        jump = np.linalg.norm(corners - self._corners, axis=1).mean()
+        return jump <= self.max_jump * max(diagonal, 1.0)
+
+
+class HomographyTracker:
+    """
+    Per-frame homographies from estimates on keyframes (every detect_every-th frame).
+    Keyframe estimates go through the optional smoother in frame order; frames in
+    between are interpolated in corner space from the surrounding keyframes. Batches
+    may hand in the estimate for the keyframe after their last frame, so trailing
+    frames interpolate too; it is filtered once and reused by the next batch.
+    """
+
+    def __init__(
+            self,
+            book_size: Tuple[int, int],
+            fallback: np.ndarray,
+            smoother: Optional[HomographySmoother] = None,
+            detect_every: int = 1
+    ):
+        self.fallback = fallback
+        self.smoother = smoother
+        self._corner_space = smoother or HomographySmoother(book_size)
+        self.detect_every = max(detect_every, 1)
+        self._keys = {}  # keyframe index -> filtered homography
+        self.visible = {}  # keyframe index -> whether its estimate was accepted
+
+    @classmethod
+    def for_book(
+            cls,
+            book_image: np.ndarray,
+            base_homography: np.ndarray,
+            smoothing: Optional[float] = None,
+            detect_every: int = 1
+    ) -> "HomographyTracker":
+        """Tracker for one render of book_image; smoothing=None passes raw estimates through"""
+        book_size = (book_image.shape[1], book_image.shape[0])
+        smoother = None
+        if smoothing is not None:
+            smoother = HomographySmoother(book_size, smoothing=smoothing, initial=base_homography)
+        return cls(book_size, base_homography, smoother, detect_every)
+
+    def is_keyframe(self, frame_idx: int) -> bool:
+        return frame_idx % self.detect_every == 0
+
+    def has(self, frame_idx: int) -> bool:
+        return frame_idx in self._keys
+
+    def next_keyframe(self, frame_idx: int) -> int:
+        """First keyframe strictly after frame_idx"""
+        return (frame_idx // self.detect_every + 1) * self.detect_every
+
+    def track(self, frame_indices, estimates, cuts=()) -> list:
+        """
+        Homographies for frame_indices; estimates maps keyframe index -> raw estimate or None.
+        Keyframes in cuts start a new shot, so the smoother does not carry the old placement over.
+        """
+        for key in sorted(k for k in estimates if k not in self._keys):
+            estimate = estimates[key]
+            if self.smoother is not None:
+                if key in cuts:
+                    self.smoother.reset()
+                estimate = self.smoother.update(estimate)
+                self.visible[key] = self.smoother.accepted
+            else:
+                self.visible[key] = estimate is not None
+            self._keys[key] = estimate if estimate is not None else self.fallback
+
+        keys = sorted(self._keys)
+        homographies = []
+        for frame_idx in frame_indices:
+            if frame_idx in self._keys:
+                homographies.append(self._keys[frame_idx])
+                continue
+            position = bisect.bisect_left(keys, frame_idx)
+            before = keys[position - 1] if position > 0 else None
+            after = keys[position] if position < len(keys) else None
+            if before is not None and after is not None:
+                homographies.append(self._corner_space.interpolate(
+                    self._keys[before], self._keys[after], (frame_idx - before) / (after - before)))
+            elif before is not None or after is not None:
+                homographies.append(self._keys[before if before is not None else after])
+            else:
+                homographies.append(self.fallback)
+
+        # Only the latest keyframe can still be needed by later frames
+        if frame_indices and keys:
+            last = max(frame_indices)
+            for key in [k for k in keys if k < last][:-1]:
+                del self._keys[key]
+        return homographies
@@ -0,0 +1,383 @@
+import bisect
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import cv2
+import numpy as np
+
+from src.application.instrumentation import tracer, bind_context
+from src.application.jobs import CancellationToken
+from src.application.use_cases.frame_processing.homography_smoother import HomographyTracker
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.domain.entities.frame import Frame
+from src.domain.entities.homography_track import HomographyTrack
+
+
+class HomographyTrackAnalyzer:
+    """
+    Analysis pass of a two-pass render. The video is decoded once in order and full
+    matching runs only on keyframes: every detect_every-th frame, or the encoder's
+    I-frames when keyframe_mode is "iframes" and ffprobe is available. Shot cuts
+    are found from small colour histograms; both sides of a cut are matched and
+    the smoother restarts there. The estimates become a per-frame track through
+    HomographyTracker, with visibility flags and shot boundaries.
+
+    The track and the book detection it was made for are stored in a sidecar next
+    to the video (or in sidecar_dir when given), keyed by the video's content hash
+    and the extractor config, so re-renders with another trailer or alpha skip
+    detection and analysis entirely.
+    """
+
+    SIDECAR_SUFFIX = ".track.npz"
+
+    def __init__(
+            self,
+            book_matcher: FindMatchingBookMovieUseCase,
+            detect_every: int = 10,
+            smoothing: Optional[float] = None,
+            keyframe_mode: str = "interval",
+            max_workers: int = 4,
+            extractor_signature: str = "",
+            shot_threshold: Optional[float] = 0.5,
+            sidecar_dir: Optional[str] = None
+    ):
+        if keyframe_mode not in ("interval", "iframes"):
+            raise ValueError(f"Unknown keyframe mode: {keyframe_mode}")
+        self.book_matcher = book_matcher
+        self.detect_every = max(detect_every, 1)
+        self.smoothing = smoothing
+        self.keyframe_mode = keyframe_mode
+        self.max_workers = max_workers
+        self.extractor_signature = extractor_signature or type(book_matcher.feature_extractor).__name__
+        self.shot_threshold = shot_threshold  # Bhattacharyya distance between frames; None skips cut detection
+        self.sidecar_dir = sidecar_dir  # None keeps sidecars next to their videos
+        self.analyses = 0  # Analysis passes actually run, the rest came from sidecars
+        self._lock = threading.Lock()
+        self._tracks: Dict[str, HomographyTrack] = {}
+        self._hashes: Dict[tuple, str] = {}
+
+    def sidecar_path(self, video_path: str) -> Path:
+        path = Path(video_path)
+        if self.sidecar_dir is None:
+            return path.with_name(path.name + self.SIDECAR_SUFFIX)
+        # Videos with one name in different folders get separate sidecars
+        key = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:8]
+        return Path(self.sidecar_dir) / f"{path.name}.{key}{self.SIDECAR_SUFFIX}"
+
+    def stored_detection(
+            self,
+            video_path: str,
+            total_frames: int,
+            fps: float,
+            w: int,
+            h: int
+    ) -> Optional[HomographyTrack]:
+        """Stored track with a book detection for this video content and these settings, if any"""
+        fingerprint = self._video_fingerprint(video_path, total_frames, fps, w, h)
+        settings = self._settings()
+        with self._lock:
+            track = self._stored_track(str(self.sidecar_path(video_path)))
+        if track is None or not track.has_detection or track.video_fingerprint != fingerprint:
+            return None
+        if any(track.analysis_params.get(key) != value for key, value in settings.items()):
+            return None
+        return track
+
+    def load_or_analyze(
+            self,
+            video_path: str,
+            book_image: np.ndarray,
+            base_homography: np.ndarray,
+            total_frames: int,
+            fps: float,
+            w: int,
+            h: int,
+            progress_callback: Optional[Callable] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            book_name: Optional[str] = None,
+            book_path: Optional[str] = None,
+            confidence: float = 0.0
+    ) -> HomographyTrack:
+        """
+        Stored track for this video and book when still valid, a fresh analysis otherwise.
+        A book_name records the detection in the sidecar for stored_detection.
+        """
+        fingerprint = self._video_fingerprint(video_path, total_frames, fps, w, h)
+        params = self._analysis_params(book_image, base_homography)
+
+        # Segments rendered in parallel share one analysis
+        with self._lock:
+            sidecar = str(self.sidecar_path(video_path))
+            track = self._stored_track(sidecar)
+            changed = False
+            if track is None or not track.matches(fingerprint, params):
+                track = self.analyze(video_path, book_image, base_homography, total_frames,
+                                     progress_callback, cancel_token)
+                track.video_fingerprint, track.analysis_params = fingerprint, params
+                track.base_homography = np.asarray(base_homography, dtype=np.float64).reshape(3, 3)
+                changed = True
+            else:
+                print(f"♻️ Reusing homography track: {sidecar}")
+
+            if book_name is not None and (track.book_name, track.book_path) != (book_name, book_path):
+                track.book_name, track.book_path, track.confidence = book_name, book_path, float(confidence)
+                changed = True
+            if changed:
+                self._write_sidecar(sidecar, track)
+            self._tracks[sidecar] = track
+            return track
+
+    def analyze(
+            self,
+            video_path: str,
+            book_image: np.ndarray,
+            base_homography: np.ndarray,
+            total_frames: int,
+            progress_callback: Optional[Callable] = None,
+            cancel_token: Optional[CancellationToken] = None
+    ) -> HomographyTrack:
+        """Match keyframes while streaming through the video and track every frame"""
+        keyframes = set(self.keyframe_indices(video_path, total_frames))
+        tracker = HomographyTracker.for_book(book_image, base_homography, self.smoothing, self.detect_every)
+        feature_book = self.book_matcher.feature_extractor.extract_features(book_image)
+
+        cap = cv2.VideoCapture(video_path)
+        estimates = {}
+        submitted = set()
+        pending = deque()
+        cuts = []
+        previous, previous_hist = None, None
+        frames_read = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                def submit(idx, image):
+                    submitted.add(idx)
+                    pending.append((idx, executor.submit(
+                        bind_context(self._estimate_homography), image, feature_book)))
+
+                for frame_idx in range(total_frames):
+                    if frame_idx % 50 == 0:
+                        if cancel_token:
+                            cancel_token.raise_if_cancelled()
+                        if progress_callback:
+                            progress_callback(f"Analyzed {frame_idx}/{total_frames} frames", 20)
+
+                    is_keyframe = frame_idx in keyframes
+                    with tracer.span("decode"):
+                        if not is_keyframe and self.shot_threshold is None:
+                            # Non-keyframes are never converted
+                            if not cap.grab():
+                                break
+                            frames_read += 1
+                            continue
+                        ret, frame = cap.read()
+                    if not ret:
+                        break
+                    frames_read += 1
+                    # Shot detection and keyframe matching share the frame's derived views
+                    frame = Frame(frame, frame_idx)
+
+                    if self.shot_threshold is not None:
+                        hist = self._shot_histogram(frame)
+                        if previous_hist is not None and cv2.compareHist(
+                                previous_hist, hist, cv2.HISTCMP_BHATTACHARYYA) > self.shot_threshold:
+                            # Match both sides of the cut so no frame interpolates across it
+                            cuts.append(frame_idx)
+                            if frame_idx - 1 not in submitted:
+                                submit(frame_idx - 1, previous)
+                            is_keyframe = True
+                        previous, previous_hist = frame, hist
+
+                    if is_keyframe:
+                        submit(frame_idx, frame)
+                    # Bound the decoded keyframes waiting for a worker
+                    while len(pending) > self.max_workers * 2:
+                        idx, future = pending.popleft()
+                        estimates[idx] = future.result()
+                while pending:
+                    idx, future = pending.popleft()
+                    estimates[idx] = future.result()
+        finally:
+            cap.release()
+
+        self.analyses += 1
+        homographies = tracker.track(list(range(total_frames)), estimates, cuts=set(cuts))
+        visible = self._visibility(tracker.visible, total_frames)
+        matched = sum(estimate is not None for estimate in estimates.values())
+        print(f"🧭 Analyzed {frames_read} frames: {len(estimates)} keyframes matched, {matched} with a homography, "
+              f"book visible in {int(visible.sum())} frames, {len(cuts) + 1} shots")
+        return HomographyTrack(
+            homographies=np.array(homographies, dtype=np.float32).reshape(-1, 3, 3),
+            keyframes=sorted(estimates),
+            visible=visible,
+            shot_boundaries=cuts
+        )
+
+    def keyframe_indices(self, video_path: str, total_frames: int) -> List[int]:
+        if self.keyframe_mode == "iframes":
+            iframes = self._iframe_indices(video_path)
+            if iframes:
+                return [i for i in iframes if i < total_frames]
+            print("⚠️ I-frame positions unavailable, matching every "
+                  f"{self.detect_every}th frame instead")
+        return list(range(0, total_frames, self.detect_every))
+
+    @staticmethod
+    def _visibility(keyframe_visible: Dict[int, bool], total_frames: int) -> np.ndarray:
+        """Per-frame flags: a frame is visible when the keyframes it is interpolated between are"""
+        visible = np.zeros(total_frames, dtype=bool)
+        keys = sorted(keyframe_visible)
+        for frame_idx in range(total_frames):
+            position = bisect.bisect_left(keys, frame_idx)
+            after = keys[position] if position < len(keys) else None
+            before = keys[position - 1] if position > 0 else None
+            if after == frame_idx or before is None:
+                visible[frame_idx] = after is not None and keyframe_visible[after]
+            elif after is None:
+                visible[frame_idx] = keyframe_visible[before]
+            else:
+                visible[frame_idx] = keyframe_visible[before] and keyframe_visible[after]
+        return visible
+
+    @staticmethod
+    def _shot_histogram(frame: Frame) -> np.ndarray:
+        small = frame.resized((64, 36))
+        hist = cv2.calcHist([small], [0, 1, 2], None, [8, 8, 8], [0, 256] * 3)
+        return cv2.normalize(hist, hist)
+
+    def _estimate_homography(self, frame: Frame, feature_book) -> Optional[np.ndarray]:
+        """Homography from the book to this frame, or None when matching fails"""
+        try:
+            feature_frame = self.book_matcher.feature_extractor.extract_features(frame)
+            if feature_frame.descriptors is None or feature_book.descriptors is None:
+                return None
+
+            matches = self.book_matcher.matcher.match_features(feature_frame.descriptors, feature_book.descriptors)
+            if len(matches) < 4:
+                return None
+
+            src = np.float32([feature_book.keypoints[m.trainIdx].pt for m in matches]).reshape(-1, 1, 2)
+            dst = np.float32([feature_frame.keypoints[m.queryIdx].pt for m in matches]).reshape(-1, 1, 2)
+            with tracer.span("ransac"):
+                H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+            return H
+        except Exception as e:
+            print(f"Error in homography computation: {e}")
+            return None
+
+    @staticmethod
+    def _iframe_indices(video_path: str) -> Optional[List[int]]:
+        """Frame numbers of I-frames as reported by ffprobe, None when it is not installed"""
+        if not shutil.which("ffprobe"):
+            return None
+        command = ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "frame=pict_type",
+                   "-of", "csv=p=0", video_path]
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        types = [line.strip().strip(",") for line in output.splitlines() if line.strip()]
+        return [i for i, pict_type in enumerate(types) if pict_type == "I"]
+
+    def _settings(self) -> Dict[str, Any]:
+        """Analysis settings that do not depend on the detected book"""
+        return {
+            "detect_every": self.detect_every,
+            "keyframe_mode": self.keyframe_mode,
+            "smoothing": self.smoothing,
+            "shot_threshold": self.shot_threshold,
+            "extractor": self.extractor_signature,
+        }
+
+    def _analysis_params(self, book_image: np.ndarray, base_homography: np.ndarray) -> Dict[str, Any]:
+        params = self._settings()
+        params["book"] = hashlib.sha1(np.ascontiguousarray(book_image).tobytes()).hexdigest()
+        params["base_homography"] = [round(float(v), 6) for v in np.asarray(base_homography).flatten()]
+        return params
+
+    def _video_fingerprint(self, video_path: str, total_frames: int, fps: float, w: int, h: int) -> Dict[str, Any]:
+        return {
+            "sha1": self._content_hash(video_path),
+            "total_frames": total_frames,
+            "fps": float(fps),
+            "width": w,
+            "height": h,
+        }
+
+    def _content_hash(self, video_path: str) -> str:
+        """SHA-1 of the video file, hashed once per file version"""
+        stat = os.stat(video_path)
+        key = (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._hashes:
+            digest = hashlib.sha1()
+            with open(video_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._hashes[key] = digest.hexdigest()
+        return self._hashes[key]
+
+    def _stored_track(self, sidecar: str) -> Optional[HomographyTrack]:
+        """Track from memory or from the sidecar file; callers hold the lock"""
+        track = self._tracks.get(sidecar)
+        if track is None:
+            track = self._read_sidecar(sidecar)
+            if track is not None:
+                self._tracks[sidecar] = track
+        return track
+
+    @staticmethod
+    def _read_sidecar(path: str) -> Optional[HomographyTrack]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                return HomographyTrack(
+                    homographies=data["homographies"],
+                    keyframes=data["keyframes"].tolist(),
+                    visible=data["visible"],
+                    shot_boundaries=data["shot_boundaries"].tolist(),
+                    book_name=meta["book_name"],
+                    book_path=meta["book_path"],
+                    base_homography=data["base_homography"] if "base_homography" in data.files else None,
+                    confidence=meta["confidence"],
+                    video_fingerprint=meta["video_fingerprint"],
+                    analysis_params=meta["analysis_params"]
+                )
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable homography track {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write_sidecar(path: str, track: HomographyTrack):
+        meta = json.dumps({
+            "book_name": track.book_name,
+            "book_path": track.book_path,
+            "confidence": track.confidence,
+            "video_fingerprint": track.video_fingerprint,
+            "analysis_params": track.analysis_params
+        })
+        arrays = dict(
+            homographies=track.homographies,
+            keyframes=np.asarray(track.keyframes, dtype=np.int64),
+            visible=np.asarray(track.visible, dtype=bool),
+            shot_boundaries=np.asarray(track.shot_boundaries, dtype=np.int64),
+            meta=np.asarray(meta)
+        )
+        if track.base_homography is not None:
+            arrays["base_homography"] = np.asarray(track.base_homography, dtype=np.float64)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Cannot save homography track: {e}")
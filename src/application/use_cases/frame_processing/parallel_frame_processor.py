@@ -1,20 +1,45 @@
 import cv2
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Callable, Tuple
+import queue
 import threading
 
 from src.application.interfaces.frame_processor_interface import IFrameProcessor
+from src.application.jobs import CancellationToken
+from src.application.instrumentation import tracer, bind_context
+from src.application.use_cases.frame_processing.frame_buffer_pool import (
+    FrameBufferPool, FrameMemoryBudget, ScratchBuffers
+)
+from src.application.use_cases.frame_processing.homography_smoother import HomographyTracker
+from src.application.use_cases.frame_processing.homography_track_analyzer import HomographyTrackAnalyzer
 from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
 
 
 class ParallelFrameProcessor(IFrameProcessor):
     """Process frames in parallel using thread pool"""
 
-    def __init__(self, book_matcher: FindMatchingBookMovieUseCase, max_workers: int = 4):
+    def __init__(
+            self,
+            book_matcher: FindMatchingBookMovieUseCase,
+            max_workers: int = 4,
+            smoothing: Optional[float] = None,
+            detect_every: int = 1,
+            track_analyzer: Optional[HomographyTrackAnalyzer] = None,
+            memory_budget: int = 512 * 2 ** 20
+    ):
         self.book_matcher = book_matcher
         self.max_workers = max_workers
+        # Weight of each new homography estimate; None (the default) passes raw estimates through
+        self.smoothing = smoothing
+        # Full matching runs on every detect_every-th frame, the rest are interpolated
+        self.detect_every = max(detect_every, 1)
+        # Two-pass mode: analyze the whole video into a stored track, then only composite
+        self.track_analyzer = track_analyzer
+        # Bytes of frame memory (trailer, in-flight frames, warp canvases) a render may hold
+        self.memory_budget = memory_budget
         self._lock = threading.Lock()
+        self._scratch = ScratchBuffers()
 
     def process_frames(
             self,
@@ -28,60 +53,218 @@ class ParallelFrameProcessor(IFrameProcessor):
             w: int,
             h: int,
             alpha: float,
-            progress_callback: Optional[Callable] = None
+            progress_callback: Optional[Callable] = None,
+            start_frame: int = 0,
+            end_frame: Optional[int] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            homography_out: Optional[np.ndarray] = None
     ) -> int:
         """Process frames in parallel and write sequentially"""
 
+        if end_frame is None:
+            end_frame = total_frames
+        range_frames = max(end_frame - start_frame, 0)
+
+        # Decode, process and encode overlap through bounded queues. Buffers come from a
+        # pool capped by the memory budget, so a slow stage stalls decoding instead of
+        # letting frames pile up. A budget that cannot hold the pipeline fails here.
+        budget = FrameMemoryBudget(self.memory_budget, (h, w, 3), self.max_workers, trailer_frames)
+        print(f"🧮 Frame memory: {budget.describe()}")
+
         # Pre-compute book features once
-        feature_book = self.book_matcher.feature_extractor.extract_features(book_image)
+        feature_book, tracker, track = None, None, None
+        if self.track_analyzer:
+            track = self.track_analyzer.load_or_analyze(
+                video_path, book_image, base_homography, total_frames, fps, w, h,
+                progress_callback, cancel_token
+            )
+        else:
+            feature_book = self.book_matcher.feature_extractor.extract_features(book_image)
+            tracker = HomographyTracker.for_book(book_image, base_homography, self.smoothing, self.detect_every)
 
         # Create output writer
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
         writer = cv2.VideoWriter(output_path, fourcc, fps, (w, h))
 
-        # Process in batches to manage memory
-        batch_size = min(100, total_frames)  # Smaller batches
-        replaced_count = 0
-
+        pool = budget.pool()
+        decoded = queue.Queue(maxsize=budget.queue_size)
+        encoded = queue.Queue(maxsize=budget.queue_size)
+        stop = threading.Event()
+        written = {"replaced": 0, "error": None}
+        decoder = threading.Thread(
+            target=bind_context(self._decode_stage),
+            args=(video_path, start_frame, end_frame, pool, decoded, stop), daemon=True
+        )
+        encoder = threading.Thread(
+            target=bind_context(self._encode_stage), args=(writer, pool, encoded, written), daemon=True
+        )
+
+        last_homography = None
         try:
-            for batch_start in range(0, total_frames, batch_size):
-                batch_end = min(batch_start + batch_size, total_frames)
-
-                # Extract batch of frames with their indices
-                batch_data = self._extract_frame_batch(video_path, batch_start, batch_end)
-
-                if not batch_data:
-                    # Write empty frames if extraction failed
-                    for _ in range(batch_end - batch_start):
-                        writer.write(np.zeros((h, w, 3), dtype=np.uint8))
-                    continue
-
-                # Process batch in parallel
-                processed_frames = self._process_batch_parallel(
-                    batch_data, trailer_frames, feature_book, base_homography,
-                    w, h, alpha
-                )
-
-                # Write frames in order
-                for frame in processed_frames:
-                    if frame is not None:
-                        writer.write(frame)
-                        replaced_count += 1
+            decoder.start()
+            encoder.start()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for batch_data in self._batches(decoded, budget.batch_size):
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+
+                    if track is not None:
+                        homographies = [track.homography(idx) for idx, _ in batch_data]
                     else:
-                        # Write black frame if processing failed
-                        writer.write(np.zeros((h, w, 3), dtype=np.uint8))
-
-                if progress_callback:
-                    progress = 20 + (batch_end / total_frames) * 60
-                    progress_callback(f"Processed {batch_end}/{total_frames} frames", progress)
+                        # Estimate keyframes in parallel, then filter them in frame order
+                        homographies = self._track_batch(
+                            batch_data, video_path, feature_book, tracker, end_frame
+                        )
+                    last_homography = homographies[-1]
+
+                    # Composite in parallel; the encoder writes the results in order
+                    for (frame_idx, frame), homography in zip(batch_data, homographies):
+                        future = None
+                        if frame is not None:
+                            future = executor.submit(
+                                bind_context(self._process_single_frame_safe),
+                                frame, trailer_frames, frame_idx, homography, w, h, alpha
+                            )
+                        encoded.put((frame, future))
+
+                    if progress_callback:
+                        done = batch_data[-1][0] + 1 - start_frame
+                        progress = 20 + (done / range_frames) * 60
+                        progress_callback(f"Processed {done}/{range_frames} frames", progress)
 
         finally:
+            stop.set()
+            decoder.join()
+            self._drain(decoded, pool)
+            encoded.put(None)
+            encoder.join()
             writer.release()
 
-        return replaced_count
+        if written["error"] is not None:
+            raise written["error"]
+        if homography_out is not None and last_homography is not None:
+            homography_out[...] = last_homography
+        return written["replaced"]
 
-    def _extract_frame_batch(self, video_path: str, start: int, end: int) -> List[Tuple[int, np.ndarray]]:
-        """Extract a batch of frames from video with proper error handling"""
+    def _decode_stage(
+            self,
+            video_path: str,
+            start: int,
+            end: int,
+            pool: FrameBufferPool,
+            decoded: queue.Queue,
+            stop: threading.Event
+    ):
+        """Decoder thread: (index, frame or None) in order, then a None sentinel"""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            opened = cap.isOpened()
+            if opened:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            else:
+                print(f"Error: Cannot open video {video_path}")
+
+            for idx in range(start, end):
+                frame = None
+                if opened:
+                    # Blocks while the budget's frames are all in flight
+                    buffer = self._wait(lambda: pool.acquire(timeout=0.1), stop)
+                    if buffer is None:
+                        return
+                    with tracer.span("decode"):
+                        ret, frame = cap.read(image=buffer)
+                    if not ret or frame is None:
+                        pool.release(buffer)
+                        frame = None
+                        print(f"Warning: Could not read frame {idx}")
+                if not self._wait(lambda: self._offer(decoded, (idx, frame)), stop):
+                    pool.release(frame)
+                    return
+        except Exception as e:
+            print(f"Error decoding {video_path}: {e}")
+        finally:
+            cap.release()
+        self._wait(lambda: self._offer(decoded, None), stop)
+
+    @staticmethod
+    def _encode_stage(writer, pool: FrameBufferPool, encoded: queue.Queue, written: dict):
+        """Encoder thread: writes composited frames in order and recycles their buffers"""
+        while True:
+            item = encoded.get()
+            if item is None:
+                return
+            frame, future = item
+            try:
+                result = None
+                if future is not None:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error processing frame: {e}")
+                with tracer.span("encode"):
+                    if result is not None:
+                        writer.write(result)
+                        written["replaced"] += 1
+                    else:
+                        # Write black frame if decoding or processing failed
+                        writer.write(pool.black)
+            except Exception as e:
+                # Keep draining so the producer never blocks; the error is raised afterwards
+                written["error"] = written["error"] or e
+            finally:
+                pool.release(frame)
+
+    @staticmethod
+    def _batches(decoded: queue.Queue, batch_size: int):
+        """Group decoded frames into batches until the decoder's sentinel"""
+        batch = []
+        while True:
+            item = decoded.get()
+            if item is None:
+                break
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _wait(attempt: Callable, stop: threading.Event):
+        """Retry a short blocking attempt until it succeeds or the render stops"""
+        while not stop.is_set():
+            result = attempt()
+            if result is not None and result is not False:
+                return result
+        return None
+
+    @staticmethod
+    def _offer(target: queue.Queue, item) -> bool:
+        try:
+            target.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            return False
+
+    @staticmethod
+    def _drain(decoded: queue.Queue, pool: FrameBufferPool):
+        """Return frames the decoder queued but nobody consumed"""
+        while True:
+            try:
+                item = decoded.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                pool.release(item[1])
+
+    def _extract_frame_batch(
+            self,
+            video_path: str,
+            start: int,
+            end: int,
+            pool: Optional[FrameBufferPool] = None
+    ) -> List[Tuple[int, np.ndarray]]:
+        """Extract a batch of frames from video, decoding into pooled buffers when a pool is given"""
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             print(f"Error: Cannot open video {video_path}")
@@ -90,12 +273,17 @@ class ParallelFrameProcessor(IFrameProcessor):
         frames = []
 
         try:
+            # One seek per batch, then sequential decoding
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
             for idx in range(start, end):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ret, frame = cap.read()
+                buffer = pool.acquire() if pool else None
+                with tracer.span("decode"):
+                    ret, frame = cap.read(image=buffer)
                 if ret and frame is not None:
-                    frames.append((idx, frame.copy()))  # Make sure to copy the frame
+                    frames.append((idx, frame))
                 else:
+                    if pool:
+                        pool.release(buffer)
                     print(f"Warning: Could not read frame {idx}")
                     # Add placeholder for missing frame
                     frames.append((idx, None))
@@ -105,60 +293,12 @@ class ParallelFrameProcessor(IFrameProcessor):
 
         return frames
 
-    def _process_batch_parallel(
-            self,
-            batch_data: List[Tuple[int, np.ndarray]],
-            trailer_frames: List,
-            feature_book,
-            base_homography,
-            w: int,
-            h: int,
-            alpha: float
-    ) -> List[np.ndarray]:
-        """Process a batch of frames in parallel"""
-
-        results = [None] * len(batch_data)
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all frame processing tasks
-            future_to_idx = {}
-
-            for i, (frame_idx, frame) in enumerate(batch_data):
-                if frame is not None:  # Only process valid frames
-                    future = executor.submit(
-                        self._process_single_frame_safe,
-                        frame,
-                        trailer_frames,
-                        frame_idx,  # Make sure this is an int
-                        feature_book,
-                        base_homography,
-                        w, h, alpha
-                    )
-                    future_to_idx[future] = i
-                else:
-                    # Handle missing frame
-                    results[i] = np.zeros((h, w, 3), dtype=np.uint8)
-
-            # Collect results maintaining order
-            for future in as_completed(future_to_idx):
-                batch_idx = future_to_idx[future]
-                try:
-                    processed_frame = future.result()
-                    results[batch_idx] = processed_frame
-                except Exception as e:
-                    print(f"Error processing frame: {e}")
-                    # Use black frame on error
-                    results[batch_idx] = np.zeros((h, w, 3), dtype=np.uint8)
-
-        return results
-
     def _process_single_frame_safe(
             self,
             frame: np.ndarray,
             trailer_frames: List,
             frame_idx: int,  # Ensure this is int
-            feature_book,
-            base_homography,
+            homography: np.ndarray,
             w: int,
             h: int,
             alpha: float
@@ -177,35 +317,64 @@ class ParallelFrameProcessor(IFrameProcessor):
 
             # Get trailer frame with rotation - safe indexing
             trailer_idx = min(frame_idx, len(trailer_frames) - 1)
-            tr_frame = trailer_frames[trailer_idx]
+            with tracer.span("trailer_fetch"):
+                tr_frame = trailer_frames[trailer_idx]
 
             if tr_frame is None:
                 print(f"Error: Trailer frame {trailer_idx} is None")
                 return frame
 
             # Rotate trailer frame
-            tr_frame = cv2.rotate(tr_frame, cv2.ROTATE_90_CLOCKWISE)
-
-            # Compute homography for current frame
-            current_H = self._compute_homography_safe(frame, feature_book, base_homography)
-
-            # Warp and blend
-            warped = cv2.warpPerspective(
-                tr_frame, current_H, (w, h),
-                flags=cv2.INTER_LINEAR,
-                borderMode=cv2.BORDER_TRANSPARENT
-            )
-
-            # Safe blending
-            result = (frame.astype(np.float32) * (1 - alpha) +
-                      warped.astype(np.float32) * alpha).astype(np.uint8)
+            with tracer.span("trailer_fetch"):
+                rotated = self._scratch.get("rotated", (tr_frame.shape[1], tr_frame.shape[0], 3))
+                tr_frame = cv2.rotate(tr_frame, cv2.ROTATE_90_CLOCKWISE, dst=rotated)
+
+            # Warp into this thread's canvas; outside the cover it stays black
+            with tracer.span("warp"):
+                warped = self._scratch.get("warped", (h, w, 3))
+                warped.fill(0)
+                cv2.warpPerspective(
+                    tr_frame, homography, (w, h), dst=warped,
+                    flags=cv2.INTER_LINEAR,
+                    borderMode=cv2.BORDER_TRANSPARENT
+                )
 
-            return result
+            # Blend in place, the frame buffer is the output
+            with tracer.span("blend"):
+                return cv2.addWeighted(frame, 1 - alpha, warped, alpha, 0, dst=frame)
 
         except Exception as e:
             print(f"Error in frame processing: {e}")
             return frame  # Return original frame on any error
 
+    def _track_batch(
+            self,
+            batch_data: List[Tuple[int, np.ndarray]],
+            video_path: str,
+            feature_book,
+            tracker: HomographyTracker,
+            end_frame: int
+    ) -> List[np.ndarray]:
+        """Homography for every frame of the batch, matching only keyframes not seen before"""
+        keyframes = [(idx, frame) for idx, frame in batch_data
+                     if frame is not None and tracker.is_keyframe(idx) and not tracker.has(idx)]
+
+        # Frames after the last keyframe interpolate towards the next one
+        if tracker.detect_every > 1 and batch_data:
+            lookahead = tracker.next_keyframe(batch_data[-1][0])
+            if lookahead < end_frame and not tracker.has(lookahead):
+                keyframes += [(idx, frame) for idx, frame in
+                              self._extract_frame_batch(video_path, lookahead, lookahead + 1) if frame is not None]
+
+        estimates = {}
+        if keyframes:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [(idx, executor.submit(bind_context(self._compute_homography_safe), frame, feature_book, None))
+                           for idx, frame in keyframes]
+                estimates = {idx: future.result() for idx, future in futures}
+
+        return tracker.track([idx for idx, _ in batch_data], estimates)
+
     def _compute_homography_safe(self, frame, feature_book, base_homography):
         """Thread-safe homography computation"""
         try:
@@ -224,7 +393,8 @@ class ParallelFrameProcessor(IFrameProcessor):
                 if len(matches) >= 4:
                     src = np.float32([feature_book.keypoints[m.trainIdx].pt for m in matches]).reshape(-1, 1, 2)
                     dst = np.float32([feature_frame.keypoints[m.queryIdx].pt for m in matches]).reshape(-1, 1, 2)
-                    H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+                    with tracer.span("ransac"):
+                        H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
 
                     if H is not None:
                         return H
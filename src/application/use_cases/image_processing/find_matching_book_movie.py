@@ -3,28 +3,37 @@ import cv2
 import numpy as np
 
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from src.application.use_cases.image_processing.overlay_book_cover import OverlayBookCoverUseCase
 from src.domain.entities.book_cover import BookCover
 from src.domain.entities.match_result import MatchResult
 from src.application.interfaces.feature_extractor_interface import IFeatureExtractor
 from src.application.interfaces.matcher_interface import IMatcher
 from src.application.interfaces.image_repository_interface import IImageRepository
+from src.application.interfaces.overlay_cache_interface import IOverlayCache, OverlayCacheEntry
+from src.application.instrumentation import tracer
 
 
 class FindMatchingBookMovieUseCase:
     """
     Use case for comparing an input image against a single book/movie cover.
+    With an overlay cache, overlay comparisons are looked up by the content of the
+    input, cover and movie cover first, and a hit skips matching and warping.
     """
 
+    MIN_OVERLAY_MATCHES = 10
+
     def __init__(
             self,
             feature_extractor: IFeatureExtractor,
             matcher: IMatcher,
-            image_repository: IImageRepository
+            image_repository: IImageRepository,
+            overlay_cache: Optional[IOverlayCache] = None
     ):
         self.feature_extractor = feature_extractor
         self.matcher = matcher
         self.image_repository = image_repository
+        self.overlay_cache = overlay_cache
         self.overlay_use_case = OverlayBookCoverUseCase(feature_extractor, matcher)
 
     def execute_single_comparison(
@@ -36,6 +45,21 @@ class FindMatchingBookMovieUseCase:
         Compare one input image and one book cover.
         Always returns a MatchResult, even on error.
         """
+        with tracer.capture() as breakdown:
+            result = self._compare(input_image_path, book_image_path)
+        if tracer.enabled:
+            result.stage_timings = breakdown.to_dict()
+        return result
+
+    def _compare(self, input_image_path: str, book_image_path: str) -> MatchResult:
+        return self._compare_covers(input_image_path, book_image_path)[0]
+
+    def _compare_covers(
+            self,
+            input_image_path: str,
+            book_image_path: str
+    ) -> Tuple[MatchResult, Optional[BookCover], Optional[BookCover]]:
+        """Comparison plus the decoded and described input and book, or None for both on error"""
         try:
             src = self._load_cover(input_image_path, is_input=True)
             dst = self._load_cover(book_image_path, is_input=False)
@@ -53,8 +77,10 @@ class FindMatchingBookMovieUseCase:
                 confidence_score=score,
                 good_matches_count=score,
                 target_image_path=dst.image_path,
-                error_message=None
-            )
+                error_message=None,
+                source_keypoints=src.keypoints,
+                target_keypoints=dst.keypoints
+            ), src, dst
 
         except Exception as ex:
             return MatchResult(
@@ -65,18 +91,19 @@ class FindMatchingBookMovieUseCase:
                 good_matches_count=0,
                 target_image_path=book_image_path,
                 error_message=str(ex)
-            )
+            ), None, None
 
     def _load_cover(self, path: str, is_input: bool) -> BookCover:
         """
         Load image from disk and wrap in BookCover.
         Raises FileNotFoundError if load fails.
         """
-        image = cv2.imread(path)
+        with tracer.span("decode"):
+            image = cv2.imread(path)
         if image is None:
             raise FileNotFoundError(f"Cannot load {'input' if is_input else 'book'} image: {path}")
         name = os.path.splitext(os.path.basename(path))[0]
-        return BookCover(image_path=path, image=image, name=name)
+        return BookCover.from_image(path, image, name=name)
 
     def _describe_cover(self, cover: BookCover) -> None:
         """
@@ -96,33 +123,129 @@ class FindMatchingBookMovieUseCase:
         Compare one input image and one book cover,
         then optionally compute and save an overlay image.
         """
-        # perform the core comparison
-        result = self.execute_single_comparison(input_image_path, book_image_path)
+        with tracer.capture() as breakdown:
+            result = self._compare_with_overlay(input_image_path, book_image_path, enable_overlay)
+        if tracer.enabled:
+            result.stage_timings = breakdown.to_dict()
+        return result
+
+    def _compare_with_overlay(self, input_image_path: str, book_image_path: str, enable_overlay: bool) -> MatchResult:
+        movie_image_path, cache_key = None, None
+        if enable_overlay and self.overlay_cache:
+            movie_image_path = self._movie_image_path(os.path.splitext(os.path.basename(book_image_path))[0])
+            if movie_image_path:
+                cache_key = self._overlay_cache_key([input_image_path, book_image_path, movie_image_path])
+                cached = self.overlay_cache.get(cache_key) if cache_key else None
+                if cached:
+                    return self._cached_result(cached, input_image_path, book_image_path)
+
+        # perform the core comparison, keeping the decoded images and keypoints
+        result, src, dst = self._compare_covers(input_image_path, book_image_path)
 
         # if overlay is enabled and comparison succeeded
-        if enable_overlay and result.error_message is None and result.good_matches_count >= 10:
-            # load images for overlay
-            input_img = cv2.imread(input_image_path)
-            cover = self._load_cover(book_image_path, is_input=False)
+        if enable_overlay and result.error_message is None and result.good_matches_count >= self.MIN_OVERLAY_MATCHES:
+            self._render_overlay(src.image, input_image_path, dst, result, movie_image_path, cache_key)
 
-            # Find movie cover from book cover
-            movie_image_path = self.image_repository.get_movie_image_for_book(cover.name)
+        # Comparisons without an overlay are cached too, so repeating them skips matching
+        if cache_key and result.error_message is None and result.overlay_image_path is None:
+            self.overlay_cache.put(cache_key, None, self._cache_metadata(result))
 
-            movie_cover = self._load_cover(movie_image_path, is_input=False)
+        return result
 
-            # generate overlay using homography
-            overlayed = self.overlay_use_case.overlay_book_on_image(
-                input_img, cover, movie_cover, result
-            )
+    def render_overlay(
+            self,
+            input_image: np.ndarray,
+            input_image_path: str,
+            cover: BookCover,
+            result: MatchResult
+    ) -> MatchResult:
+        """
+        Overlay the movie cover for an existing match (e.g. from the catalog index)
+        and record the saved path on the result. Reuses the match's keypoints.
+        """
+        cache_key = None
+        if self.overlay_cache:
+            movie_image_path = self._movie_image_path(cover.name)
+            if movie_image_path:
+                cache_key = self._overlay_cache_key([input_image_path, cover.image_path, movie_image_path])
+                cached = self.overlay_cache.get(cache_key) if cache_key else None
+                if cached and cached.image_path:
+                    result.overlay_image_path = cached.image_path
+                    return result
+        return self._render_overlay(input_image, input_image_path, cover, result, None, cache_key)
 
-            # save overlay result and record its path
-            if overlayed is not None:
+    def _render_overlay(
+            self,
+            input_image: np.ndarray,
+            input_image_path: str,
+            cover: BookCover,
+            result: MatchResult,
+            movie_image_path: Optional[str],
+            cache_key: Optional[str]
+    ) -> MatchResult:
+        # Find movie cover from book cover
+        movie_image_path = movie_image_path or self.image_repository.get_movie_image_for_book(cover.name)
+        movie_cover = self._load_cover(movie_image_path, is_input=False)
+
+        # generate overlay using homography
+        overlayed = self.overlay_use_case.overlay_book_on_image(
+            input_image, cover, movie_cover, result, self.MIN_OVERLAY_MATCHES
+        )
+
+        # save overlay result and record its path
+        if overlayed is not None:
+            if cache_key:
+                with tracer.span("encode"):
+                    entry = self.overlay_cache.put(cache_key, overlayed, self._cache_metadata(result))
+                result.overlay_image_path = entry.image_path
+            else:
                 result.overlay_image_path = self._save_overlay_result(
-                    overlayed, input_image_path, book_image_path
+                    overlayed, input_image_path, cover.image_path
                 )
-
         return result
 
+    def _overlay_cache_key(self, file_paths: List[str]) -> Optional[str]:
+        """Cache key for these files; None (no caching) when one cannot be read"""
+        try:
+            return self.overlay_cache.key(file_paths, self._overlay_params())
+        except OSError as e:
+            print(f"⚠️ Skipping overlay cache: {e}")
+            return None
+
+    def _movie_image_path(self, book_name: str) -> Optional[str]:
+        try:
+            return self.image_repository.get_movie_image_for_book(book_name)
+        except FileNotFoundError:
+            return None
+
+    def _overlay_params(self) -> Dict[str, Any]:
+        """Everything besides the three images that changes a cached comparison"""
+        config = getattr(self.matcher, "config", None)
+        return {
+            "min_matches": self.MIN_OVERLAY_MATCHES,
+            "extractor": type(self.feature_extractor).__name__,
+            "matcher": config.to_dict() if hasattr(config, "to_dict") else type(self.matcher).__name__
+        }
+
+    @staticmethod
+    def _cache_metadata(result: MatchResult) -> Dict[str, Any]:
+        return {
+            "confidence_score": float(result.confidence_score),
+            "good_matches_count": result.good_matches_count
+        }
+
+    @staticmethod
+    def _cached_result(entry: OverlayCacheEntry, input_image_path: str, book_image_path: str) -> MatchResult:
+        return MatchResult(
+            source_name=os.path.splitext(os.path.basename(input_image_path))[0],
+            target_name=os.path.splitext(os.path.basename(book_image_path))[0],
+            matches=[],
+            confidence_score=entry.metadata.get("confidence_score", 0.0),
+            good_matches_count=entry.metadata.get("good_matches_count", 0),
+            target_image_path=book_image_path,
+            overlay_image_path=entry.image_path
+        )
+
     def _save_overlay_result(
             self,
             overlay_image: np.ndarray,
@@ -138,5 +261,6 @@ class FindMatchingBookMovieUseCase:
         overlay_filename = f"{input_name}_overlay_{book_name}.jpg"
         overlay_path = cache_dir / overlay_filename
 
-        cv2.imwrite(str(overlay_path), overlay_image)
+        with tracer.span("encode"):
+            cv2.imwrite(str(overlay_path), overlay_image)
         return str(overlay_path)
@@ -5,6 +5,7 @@ from src.application.interfaces.feature_extractor_interface import IFeatureExtra
 from src.application.interfaces.matcher_interface import IMatcher
 from src.domain.entities.match_result import MatchResult
 from src.domain.entities.book_cover import BookCover
+from src.application.instrumentation import tracer
 
 
 class OverlayBookCoverUseCase:
@@ -30,39 +31,46 @@ class OverlayBookCoverUseCase:
     ) -> Optional[np.ndarray]:
         """
         Compute homography and warp book_cover.image onto original.
+        Keypoints already carried by the match or the cover are reused, so after
+        matching this costs one RANSAC and one warp.
         Return blended image or None if insufficient matches.
         """
         if match_result.good_matches_count < min_matches:
             return None
 
-        # Extract matched keypoints
-        feature = self.feature_extractor.extract_features(original)
-        kp_orig = feature.keypoints
-        feature = self.feature_extractor.extract_features(book_cover.image)
-        kp_book = feature.keypoints
+        kp_orig = match_result.source_keypoints
+        if kp_orig is None:
+            kp_orig = self.feature_extractor.extract_features(original).keypoints
+        kp_book = book_cover.keypoints if book_cover.keypoints is not None else match_result.target_keypoints
+        if kp_book is None:
+            kp_book = self.feature_extractor.extract_features(book_cover.image).keypoints
         src_pts = np.float32([kp_book[m.trainIdx].pt for m in match_result.matches]).reshape(-1, 1, 2)
         dst_pts = np.float32([kp_orig[m.queryIdx].pt for m in match_result.matches]).reshape(-1, 1, 2)
 
-        homography, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
+        with tracer.span("ransac"):
+            homography, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
         if homography is None:
             return None
 
-        h_book, w_book = book_cover.image.shape[:2]
+        # The header size avoids decoding the book cover just for its dimensions
+        w_book, h_book = book_cover.size or book_cover.image.shape[1::-1]
         movie_image_resized = cv2.resize(movie_cover.image, (w_book, h_book), interpolation=cv2.INTER_CUBIC)
 
         h, w = original.shape[:2]
-        warped = cv2.warpPerspective(
-            movie_image_resized, homography, (w, h),
-            flags=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_TRANSPARENT
-        )
+        with tracer.span("warp"):
+            warped = cv2.warpPerspective(
+                movie_image_resized, homography, (w, h),
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_TRANSPARENT
+            )
 
-        # Create mask of warped area
-        mask = (warped.sum(axis=2) > 0).astype(np.uint8) * 255
-        mask_3c = cv2.merge([mask, mask, mask])
-        alpha = 1
+        with tracer.span("blend"):
+            # Create mask of warped area
+            mask = (warped.sum(axis=2) > 0).astype(np.uint8) * 255
+            mask_3c = cv2.merge([mask, mask, mask])
+            alpha = 1
 
-        # Blend overlay with original
-        blended = (original.astype(np.float32) * (1 - alpha * (mask_3c / 255.0)) +
-                   warped.astype(np.float32) * (alpha * (mask_3c / 255.0)))
-        return blended.astype(np.uint8)
+            # Blend overlay with original
+            blended = (original.astype(np.float32) * (1 - alpha * (mask_3c / 255.0)) +
+                       warped.astype(np.float32) * (alpha * (mask_3c / 255.0)))
+            return blended.astype(np.uint8)
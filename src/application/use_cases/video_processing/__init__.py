@@ -1,9 +1,14 @@
 from .process_input_video import ProcessInputVideoUseCase
 from .book_detector_in_video import BookDetectorInVideo
-from .trailer_frame_loader import TrailerFrameLoader
+from .trailer_frame_loader import TrailerFrameLoader, TrailerFrames
+from .segmented_video_renderer import SegmentedVideoRenderer
+from .video_preview import VideoPreviewUseCase
 
 __all__ = [
     'ProcessInputVideoUseCase',
     'BookDetectorInVideo',
-    'TrailerFrameLoader'
+    'TrailerFrameLoader',
+    'TrailerFrames',
+    'SegmentedVideoRenderer',
+    'VideoPreviewUseCase'
 ]
@@ -1,170 +1,247 @@
 import cv2
+import heapq
 import os
-from typing import Optional, Tuple, List
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple, List
 import numpy as np
 
 from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
 from src.application.interfaces.image_repository_interface import IImageRepository
+from src.application.instrumentation import tracer, bind_context
+from src.domain.entities.frame import Frame
 
 
 class BookDetectorInVideo:
-    """Responsible for detecting the best matching book in video frames"""
-
-    def __init__(self, book_matcher: FindMatchingBookMovieUseCase, image_repo: IImageRepository):
+    """
+    Responsible for detecting the best matching book in video frames.
+
+    sample_count frames spread uniformly over the video are decoded in one
+    sequential pass (seeking only across gaps longer than seek_stride) and scored at
+    work_width against every cover with a colour-histogram intersection. The most
+    promising frames are then verified with full features, min_probes at a time and
+    best first, until one cover clearly leads (dominance times the runner-up's
+    score) or max_probes frames were verified. Frame and cover features are
+    extracted once and every (frame, cover) pair is matched on a worker pool; the
+    winner's homography comes from its best probe's matches. Each sampled frame and
+    cover is one Frame, so the histogram thumbnail and the feature grayscale are
+    derived from it once.
+    """
+
+    def __init__(
+            self,
+            book_matcher: FindMatchingBookMovieUseCase,
+            image_repo: IImageRepository,
+            max_workers: int = 4,
+            min_probes: int = 3,
+            max_probes: int = 9,
+            dominance: float = 2.0,
+            sample_count: int = 48,
+            work_width: int = 160,
+            seek_stride: int = 250
+    ):
         self.book_matcher = book_matcher
         self.image_repo = image_repo
+        self.max_workers = max_workers
+        self.min_probes = min_probes
+        self.max_probes = max(max_probes, min_probes)
+        self.dominance = dominance
+        self.sample_count = sample_count
+        self.work_width = work_width
+        self.seek_stride = seek_stride
+        # Statistics of the latest detect_best_book call; threads sharing a detector use detect()
+        self.last_confidence = 0.0  # Average confidence of the latest detection
+        self.last_probe_count = 0  # Frames verified with full features by the latest detection
+        self._covers: Dict[tuple, tuple] = {}  # (path, mtime) -> (features, histogram), reused across videos
+        self._covers_lock = threading.Lock()
 
     def detect_best_book(self, cap: cv2.VideoCapture, total_frames: int, min_conf: float) -> Optional[Tuple]:
         """
         Returns (book_name, book_path, book_image, homography) or None
-        Tests multiple frames (1/4, 2/4, 3/4) and uses weighted average confidence
+        Verifies at least min_probes frames and scores covers by average confidence
         """
+        book_data, self.last_confidence, self.last_probe_count = self.detect(cap, total_frames, min_conf)
+        return book_data
 
-        # Define test frame positions
-        test_frames = [
-            total_frames // 4,  # 25%
-            total_frames // 2,  # 50%
-            total_frames * 3 // 4  # 75%
-        ]
-
-        # Extract frames for testing
-        frame_data = []
-        for frame_idx in test_frames:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                frame_data.append((frame_idx, frame.copy()))
-            else:
+    def detect(self, cap: cv2.VideoCapture, total_frames: int, min_conf: float) -> Tuple[Optional[Tuple], float, int]:
+        """
+        Returns (book data or None, confidence, verified frame count) without touching
+        shared state, so several videos may be detected with one detector at once
+        """
+        books = self.image_repo.load_book_movie_images()
+        if not books:
+            print("Error: No book covers to compare against")
+            return None, 0.0, 0
+
+        probes = []  # (frame_idx, frame features)
+        scores = {book.name: {} for book in books}  # book name -> frame_idx -> matches
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            described = self._map(executor, self._describe_book, books)
+            book_features = [features for features, _ in described]
+            candidates = self._sample_candidates(cap, total_frames, [hist for _, hist in described])
+
+            while candidates:
+                frames, candidates = candidates[:self.min_probes], candidates[self.min_probes:]
+                features = self._map(executor, self._describe_frame, [f for _, f in frames])
+                new_probes = [(idx, feature) for (idx, _), feature in zip(frames, features)]
+                probes.extend(new_probes)
+
+                # Every (frame, cover) pair of this round runs concurrently
+                pairs = [(book, book_feature, idx, feature)
+                         for book, book_feature in zip(books, book_features)
+                         for idx, feature in new_probes]
+                matched = self._map(executor, self._match_pair, [(bf, f) for _, bf, _, f in pairs])
+                for (book, _, idx, _), matches in zip(pairs, matched):
+                    scores[book.name][idx] = matches
+
+                if probes and self._has_leader(scores):
+                    break
+
+        if not probes:
+            print("Error: No valid frames extracted for book detection")
+            return None, 0.0, 0
+
+        best, confidence = self._pick_best(books, book_features, dict(probes), scores, min_conf)
+        return best, confidence, len(probes)
+
+    @staticmethod
+    def _map(executor: ThreadPoolExecutor, fn, items) -> list:
+        """executor.map with each call bound to the caller's trace context separately"""
+        futures = [executor.submit(bind_context(fn), item) for item in items]
+        return [future.result() for future in futures]
+
+    def _sample_candidates(
+            self,
+            cap: cv2.VideoCapture,
+            total_frames: int,
+            cover_histograms: List[Optional[np.ndarray]]
+    ) -> List[Tuple[int, Frame]]:
+        """Up to max_probes uniformly sampled frames that look most like any cover, best first"""
+        count = min(self.sample_count, total_frames)
+        if count <= 0:
+            return []
+        positions = sorted({int((i + 0.5) * total_frames / count) for i in range(count)})
+
+        best = []  # min-heap of (similarity, frame_idx, frame)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        current = 0
+        for frame_idx in positions:
+            with tracer.span("decode"):
+                if frame_idx - current > self.seek_stride:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                    current = frame_idx
+                # Frames between samples are grabbed but never converted
+                while current < frame_idx and cap.grab():
+                    current += 1
+                ret, frame = cap.read()
+            if not ret or frame is None:
                 print(f"Warning: Could not read frame {frame_idx}")
+                break
+            current = frame_idx + 1
 
-        if not frame_data:
-            print("Error: No valid frames extracted for book detection")
-            return None
+            frame = Frame(frame, frame_idx)
+            item = (self._cover_similarity(frame, cover_histograms), frame_idx, frame)
+            if len(best) < self.max_probes:
+                heapq.heappush(best, item)
+            else:
+                heapq.heappushpop(best, item)
 
-        return self._find_best_match_multi_frame(frame_data, min_conf)
+        return [(frame_idx, frame) for _, frame_idx, frame in sorted(best, key=lambda item: -item[0])]
 
-    def _find_best_match_multi_frame(self, frame_data: List[Tuple[int, np.ndarray]], min_conf: float) -> Optional[
-        Tuple]:
-        """Find best book match using weighted average confidence from multiple frames"""
+    def _cover_similarity(self, frame: Frame, cover_histograms: List[Optional[np.ndarray]]) -> float:
+        """How much of the closest cover's colours the frame contains, 0..1"""
+        frame_hist = self._histogram(frame)
+        return max((cv2.compareHist(hist, frame_hist, cv2.HISTCMP_INTERSECT)
+                    for hist in cover_histograms if hist is not None), default=0.0)
 
-        # Save frames temporarily
-        tmp_paths = self._save_frames_temporarily(frame_data)
+    def _histogram(self, image: Frame) -> np.ndarray:
+        """Hue-saturation histogram at the working resolution, summing to 1"""
+        hsv = cv2.cvtColor(image.thumbnail(self.work_width), cv2.COLOR_BGR2HSV)
+        hist = cv2.calcHist([hsv], [0, 1], None, [16, 8], [0, 180, 0, 256])
+        return cv2.normalize(hist, hist, 1.0, 0.0, cv2.NORM_L1)
 
+    def _describe_book(self, book) -> tuple:
+        """Cover features and histogram, computed once per cover file version"""
         try:
-            # Test each book and find the best match
-            best_match = self._evaluate_all_books(tmp_paths, frame_data, min_conf)
-            return best_match
-
-        finally:
-            # Cleanup temporary files
-            self._cleanup_temporary_files(tmp_paths)
-
-    def _save_frames_temporarily(self, frame_data: List[Tuple[int, np.ndarray]]) -> List[str]:
-        """Save frames to temporary files and return paths"""
-        tmp_dir = Path("data/temp")
-        tmp_dir.mkdir(parents=True, exist_ok=True)
-
-        tmp_paths = []
-        for i, (frame_idx, frame) in enumerate(frame_data):
-            tmp_path = tmp_dir / f"test_frame_{i}_{frame_idx}.jpg"
-            cv2.imwrite(str(tmp_path), frame)
-            tmp_paths.append(str(tmp_path))
-
-        return tmp_paths
-
-    def _evaluate_all_books(self, tmp_paths: List[str], frame_data: List[Tuple[int, np.ndarray]], min_conf: float) -> \
-    Optional[Tuple]:
-        """Evaluate all books against frames and return best match"""
+            key = (book.image_path, os.stat(book.image_path).st_mtime_ns)
+        except OSError:
+            return None, None
+        with self._covers_lock:
+            described = self._covers.get(key)
+        if described is None:
+            image = book.image
+            if image is None:
+                return None, None
+            cover = Frame(image)
+            described = (self.book_matcher.feature_extractor.extract_features(cover), self._histogram(cover))
+            with self._covers_lock:
+                described = self._covers.setdefault(key, described)
+        return described
+
+    def _describe_frame(self, frame: Frame):
+        return self.book_matcher.feature_extractor.extract_features(frame)
+
+    def _match_pair(self, pair) -> list:
+        book_feature, frame_feature = pair
+        if book_feature is None or frame_feature.descriptors is None or book_feature.descriptors is None:
+            return []
+        try:
+            return self.book_matcher.matcher.match_features(frame_feature.descriptors, book_feature.descriptors)
+        except Exception as e:
+            print(f"Error matching frame: {e}")
+            return []
+
+    @staticmethod
+    def _average_scores(scores: Dict[str, Dict[int, list]]) -> Dict[str, float]:
+        """Average match count of each cover over the verified frames"""
+        return {name: sum(len(m) for m in per_frame.values()) / len(per_frame) if per_frame else 0.0
+                for name, per_frame in scores.items()}
+
+    def _has_leader(self, scores: Dict[str, Dict[int, list]]) -> bool:
+        ranked = sorted(self._average_scores(scores).values(), reverse=True)
+        if not ranked or ranked[0] <= 0:
+            return False
+        runner_up = ranked[1] if len(ranked) > 1 else 0.0
+        return ranked[0] >= self.dominance * runner_up
+
+    def _pick_best(self, books, book_features, probes, scores, min_conf: float) -> Tuple[Optional[Tuple], float]:
+        """Best cover above min_conf and its score, with a homography from the matches already computed"""
+        averages = self._average_scores(scores)
         best = None
-        best_weighted_score = 0.0
+        best_score = 0.0
 
-        for book in self.image_repo.load_book_movie_images():
-            weighted_score = self._calculate_book_weighted_score(book, tmp_paths)
+        for book, book_feature in zip(books, book_features):
+            score = averages[book.name]
+            per_frame = scores[book.name]
+            print(f"📖 {book.name}:")
+            print("   Scores: " + ", ".join(f"frame {idx}={len(per_frame[idx])}" for idx in sorted(per_frame)))
+            print(f"   Average = {score:.2f}")
 
-            if weighted_score >= min_conf and weighted_score > best_weighted_score:
-                homography = self._get_homography_for_best_match(frame_data, book)
+            if score >= min_conf and score > best_score:
+                # The probe where the cover matched best gives the cleanest homography
+                frame_idx = max(per_frame, key=lambda idx: len(per_frame[idx]))
+                homography = self._homography_from_matches(per_frame[frame_idx], probes[frame_idx], book_feature)
 
                 if homography is not None:
                     best = (book.name, book.image_path, book.image, homography)
-                    best_weighted_score = weighted_score
-                    print(f"✅ New best match: {book.name} with weighted confidence {weighted_score:.2f}")
+                    best_score = score
+                    print(f"✅ New best match: {book.name} with confidence {score:.2f}")
 
         if best:
-            print(f"🎯 Final best match: {best[0]} with weighted confidence {best_weighted_score:.2f}")
+            print(f"🎯 Final best match: {best[0]} with confidence {best_score:.2f} "
+                  f"({len(probes)} frames verified)")
         else:
             print("❌ No book matches found with sufficient confidence")
 
-        return best
-
-    def _calculate_book_weighted_score(self, book, tmp_paths: List[str]) -> float:
-        """Calculate weighted average score for a book against all frames"""
-        weights = [0.5, 1.0, 1.5]  # 25%, 50%, 75%
-        frame_scores = []
-
-        # Get confidence scores for each frame
-        for tmp_path in tmp_paths:
-            try:
-                res = self.book_matcher.execute_single_comparison(tmp_path, book.image_path)
-                frame_scores.append(res.confidence_score)
-            except Exception as e:
-                print(f"Error matching {book.name} with frame: {e}")
-                frame_scores.append(0.0)
-
-        # Calculate weighted average confidence
-        if frame_scores and len(frame_scores) == len(weights):
-            weighted_sum = sum(score * weight for score, weight in zip(frame_scores, weights))
-            total_weight = sum(weights)
-            weighted_avg = weighted_sum / total_weight
-
-            print(f"📖 {book.name}:")
-            print(f"   Scores: 25%={frame_scores[0]:.2f}, 50%={frame_scores[1]:.2f}, 75%={frame_scores[2]:.2f}")
-            print(f"   Weighted average = {weighted_avg:.2f}")
+        return best, best_score
 
-            return weighted_avg
-
-        return 0.0
-
-    def _get_homography_for_best_match(self, frame_data: List[Tuple[int, np.ndarray]], book) -> Optional[np.ndarray]:
-        """Get homography matrix using middle frame for the best matching book"""
-        # Use the middle frame (index 1) for homography calculation
-        middle_frame_idx = len(frame_data) // 2
-        middle_frame = frame_data[middle_frame_idx][1]
-
-        return self._compute_homography_for_book(middle_frame, book.image)
-
-    def _cleanup_temporary_files(self, tmp_paths: List[str]):
-        """Remove temporary files"""
-        for tmp_path in tmp_paths:
-            if os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                except Exception as e:
-                    print(f"Warning: Could not remove temp file {tmp_path}: {e}")
-
-    def _compute_homography_for_book(self, frame, book_image):
-        """Compute homography between frame and book image"""
-        try:
-            feature_frame = self.book_matcher.feature_extractor.extract_features(frame)
-            feature_book = self.book_matcher.feature_extractor.extract_features(book_image)
-
-            if feature_frame.descriptors is None or feature_book.descriptors is None:
-                return None
-
-            matches = self.book_matcher.matcher.match_features(
-                feature_frame.descriptors, feature_book.descriptors
-            )
-
-            if len(matches) < 4:
-                return None
-
-            import numpy as np
-            src = np.float32([feature_book.keypoints[m.trainIdx].pt for m in matches]).reshape(-1, 1, 2)
-            dst = np.float32([feature_frame.keypoints[m.queryIdx].pt for m in matches]).reshape(-1, 1, 2)
-            H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
-
-            return H
-
-        except Exception as e:
-            print(f"Error computing homography: {e}")
+    @staticmethod
+    def _homography_from_matches(matches, frame_feature, book_feature) -> Optional[np.ndarray]:
+        """Compute homography between frame and book image from their matches"""
+        if len(matches) < 4:
             return None
+        src = np.float32([book_feature.keypoints[m.trainIdx].pt for m in matches]).reshape(-1, 1, 2)
+        dst = np.float32([frame_feature.keypoints[m.queryIdx].pt for m in matches]).reshape(-1, 1, 2)
+        with tracer.span("ransac"):
+            H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+        return H
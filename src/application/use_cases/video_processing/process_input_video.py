@@ -1,11 +1,18 @@
+import os
 import cv2
 import time
 import asyncio
-from typing import Optional
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
 
 from src.application.interfaces.frame_processor_interface import IFrameProcessor
+from src.application.instrumentation import tracer
+from src.application.jobs import CancellationToken, JobCancelled
+from src.application.use_cases.frame_processing.frame_buffer_pool import FrameMemoryBudget
 from src.application.use_cases.video_processing.book_detector_in_video import BookDetectorInVideo
 from src.application.use_cases.video_processing.trailer_frame_loader import TrailerFrameLoader
+from src.application.use_cases.video_processing.segmented_video_renderer import SegmentedVideoRenderer
 from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
 from src.domain.entities.video_replacement_result import VideoReplacementResult
 from src.application.interfaces.image_repository_interface import IImageRepository
@@ -22,7 +29,9 @@ class ProcessInputVideoUseCase:
             image_repository: IImageRepository,
             video_repository: IVideoRepository,
             frame_processor: IFrameProcessor,
-            min_conf: float = 10.0
+            min_conf: float = 10.0,
+            segment_frames: Optional[int] = None,
+            segment_workers: int = 1
     ):
         book_matcher = FindMatchingBookMovieUseCase(
             feature_extractor=feature_extractor,
@@ -35,16 +44,40 @@ class ProcessInputVideoUseCase:
         self.frame_processor = frame_processor
         self.vid_repo = video_repository
         self.min_conf = min_conf
+        # A two-pass processor's analyzer also stores the detection, so re-renders skip it
+        self.track_analyzer = getattr(frame_processor, "track_analyzer", None)
+
+        # Segmented, resumable rendering is opt-in
+        self.segment_renderer = None
+        if segment_frames:
+            self.segment_renderer = SegmentedVideoRenderer(
+                frame_processor, segment_frames=segment_frames, max_workers=segment_workers
+            )
 
     def execute(
             self,
             input_video_name: str,
             output_path: Optional[str] = None,
             alpha: float = 0.7,
-            progress_callback: Optional[callable] = None
+            progress_callback: Optional[callable] = None,
+            cancel_token: Optional[CancellationToken] = None
     ) -> VideoReplacementResult:
         """Execute video processing - automatically handles async/sync"""
+        with tracer.capture() as breakdown:
+            result = self._execute(input_video_name, output_path, alpha, progress_callback,
+                                   cancel_token or CancellationToken())
+        if tracer.enabled:
+            result.stage_timings = breakdown.to_dict()
+        return result
 
+    def _execute(
+            self,
+            input_video_name: str,
+            output_path: Optional[str],
+            alpha: float,
+            progress_callback: Optional[callable],
+            cancel_token: CancellationToken
+    ) -> VideoReplacementResult:
         start_time = time.time()
 
         # Load and validate input video
@@ -53,15 +86,42 @@ class ProcessInputVideoUseCase:
             return VideoReplacementResult.error(input_video_name, "Cannot open input video", start_time)
 
         cap_in, fps, w, h, total_frames = video_data
+        video_path = str(self.vid_repo.load_input_video(input_video_name))
 
-        # Detect book
-        if progress_callback:
-            progress_callback("Detecting book in video...", 10)
+        # A budget that cannot hold even the frames fails before detection
+        budget_error = self._check_memory_budget(w, h)
+        if budget_error:
+            cap_in.release()
+            return VideoReplacementResult.error(input_video_name, budget_error, start_time)
+
+        # Setup output path
+        if not output_path:
+            out_dir = Path("data/output_videos")
+            out_dir.mkdir(parents=True, exist_ok=True)
+            output_path = str(out_dir / f"{Path(input_video_name).stem}_replaced.mp4")
+
+        # Detect book, unless an interrupted segmented render already did
+        book_data, confidence = None, 0.0
+        resumed = self._resume_detection(video_path, output_path, total_frames, fps, w, h)
+        stored = None if resumed else self._stored_detection(video_path, total_frames, fps, w, h)
+        if resumed:
+            book_data, confidence = resumed
+            print(f"♻️ Reusing detection from previous render: {book_data[0]}")
+        elif stored:
+            book_data, confidence = stored
+            print(f"♻️ Reusing detection from analysis sidecar: {book_data[0]}")
+        else:
+            if progress_callback:
+                progress_callback("Detecting book in video...", 10)
+            # detect() keeps the statistics per call; CLI workers share this use case
+            book_data, confidence, _ = self.book_detector.detect(cap_in, total_frames, self.min_conf)
 
-        book_data = self.book_detector.detect_best_book(cap_in, total_frames, self.min_conf)
         if not book_data:
             cap_in.release()
             return VideoReplacementResult.error(input_video_name, "No book detected", start_time)
+        if cancel_token.is_cancelled:
+            cap_in.release()
+            return VideoReplacementResult.error(input_video_name, cancel_token.reason, start_time)
 
         book_name, book_path, book_image, base_homography = book_data
 
@@ -70,36 +130,60 @@ class ProcessInputVideoUseCase:
             progress_callback(f"Loading trailer for {book_name}...", 15)
 
         trailer_path = self.vid_repo.get_trailer_for_book(book_name)
-        trailer_frames = self.trailer_loader.load_trailer_frames(trailer_path)
+        # Decoded on demand, so a long trailer does not count against the memory budget
+        trailer_frames = self.trailer_loader.open_trailer_frames(trailer_path)
         if not trailer_frames:
             cap_in.release()
             return VideoReplacementResult.error(input_video_name, f"No frames in trailer", start_time)
-
-        # Setup output path
-        if not output_path:
-            from pathlib import Path
-            out_dir = Path("data/output_videos")
-            out_dir.mkdir(parents=True, exist_ok=True)
-            output_path = str(out_dir / f"{Path(input_video_name).stem}_replaced.mp4")
+        # ...and with the trailer's share, before analysis
+        budget_error = self._check_memory_budget(w, h, trailer_frames)
+        if budget_error:
+            cap_in.release()
+            trailer_frames.close()
+            return VideoReplacementResult.error(input_video_name, budget_error, start_time)
 
         # Process frames - automatically handle async/sync
         if progress_callback:
             progress_callback("Processing frames...", 20)
 
-        video_path = str(self.vid_repo.load_input_video(input_video_name))
         cap_in.release()
 
-        # Check if frame processor is async and handle accordingly
-        if self._is_async_method(self.frame_processor.process_frames):
-            replaced_count = asyncio.run(self.frame_processor.process_frames(
-                video_path, trailer_frames, book_image, base_homography,
-                output_path, total_frames, fps, w, h, alpha, progress_callback
-            ))
-        else:
-            replaced_count = self.frame_processor.process_frames(
-                video_path, trailer_frames, book_image, base_homography,
-                output_path, total_frames, fps, w, h, alpha, progress_callback
-            )
+        try:
+            if self.track_analyzer:
+                # Analyze here so the sidecar records the detection; the processor reuses the track
+                self.track_analyzer.load_or_analyze(
+                    video_path, book_image, base_homography, total_frames, fps, w, h,
+                    progress_callback, cancel_token,
+                    book_name=book_name, book_path=str(book_path), confidence=confidence
+                )
+
+            if self.segment_renderer:
+                replaced_count = self.segment_renderer.render(
+                    video_path, trailer_frames, trailer_path, book_name, book_path, book_image,
+                    base_homography, output_path, total_frames, fps, w, h, alpha, progress_callback,
+                    cancel_token, confidence=confidence
+                )
+            # Check if frame processor is async and handle accordingly
+            elif self._is_async_method(self.frame_processor.process_frames):
+                replaced_count = asyncio.run(self.frame_processor.process_frames(
+                    video_path, trailer_frames, book_image, base_homography,
+                    output_path, total_frames, fps, w, h, alpha, progress_callback,
+                    cancel_token=cancel_token
+                ))
+            else:
+                replaced_count = self.frame_processor.process_frames(
+                    video_path, trailer_frames, book_image, base_homography,
+                    output_path, total_frames, fps, w, h, alpha, progress_callback,
+                    cancel_token=cancel_token
+                )
+        except JobCancelled as e:
+            # Segmented renders keep their checkpoints; a plain render leaves only a truncated file
+            if not self.segment_renderer and os.path.exists(output_path):
+                os.remove(output_path)
+            print(f"🛑 Video processing cancelled: {input_video_name}")
+            return VideoReplacementResult.error(input_video_name, str(e), start_time)
+        finally:
+            trailer_frames.close()
 
         # Return result
         result = VideoReplacementResult(
@@ -108,6 +192,7 @@ class ProcessInputVideoUseCase:
             replaced_frames_count=replaced_count,
             total_frames_processed=total_frames,
             output_video_path=output_path,
+            tracking_confidence=confidence,
             success=True,
             processing_time_seconds=time.time() - start_time
         )
@@ -117,6 +202,51 @@ class ProcessInputVideoUseCase:
 
         return result
 
+    def _resume_detection(self, video_path: str, output_path: str,
+                          total_frames: int, fps: float, w: int, h: int) -> Optional[Tuple[tuple, float]]:
+        """Return ((book_name, book_path, book_image, homography), confidence) from an unfinished render"""
+        if not self.segment_renderer:
+            return None
+
+        manifest = self.segment_renderer.find_resumable(video_path, output_path, total_frames, fps, w, h)
+        if not manifest or not manifest.book_path or manifest.base_homography is None:
+            return None
+
+        book_image = cv2.imread(manifest.book_path)
+        if book_image is None:
+            return None
+
+        homography = np.array(manifest.base_homography, dtype=np.float64).reshape(3, 3)
+        return (manifest.book_name, manifest.book_path, book_image, homography), manifest.confidence
+
+    def _stored_detection(self, video_path: str, total_frames: int,
+                          fps: float, w: int, h: int) -> Optional[Tuple[tuple, float]]:
+        """Return ((book_name, book_path, book_image, homography), confidence) from the analysis sidecar"""
+        if not self.track_analyzer:
+            return None
+
+        track = self.track_analyzer.stored_detection(video_path, total_frames, fps, w, h)
+        if not track or track.confidence < self.min_conf:
+            return None
+
+        book_image = cv2.imread(track.book_path) if track.book_path else None
+        if book_image is None:
+            return None
+
+        return (track.book_name, track.book_path, book_image, track.base_homography), track.confidence
+
+    def _check_memory_budget(self, w: int, h: int, trailer_frames=()) -> Optional[str]:
+        """The reason the frame processor's memory budget cannot hold this render, if any"""
+        budget_bytes = getattr(self.frame_processor, "memory_budget", None)
+        if budget_bytes is None:
+            return None
+        try:
+            FrameMemoryBudget(budget_bytes, (h, w, 3), getattr(self.frame_processor, "max_workers", 1), trailer_frames)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return str(e)
+        return None
+
     def _is_async_method(self, method) -> bool:
         """Check if a method is async"""
         return asyncio.iscoroutinefunction(method)
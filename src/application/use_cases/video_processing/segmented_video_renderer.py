@@ -0,0 +1,312 @@
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import threading
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Callable, Dict, Any
+
+from src.application.interfaces.frame_processor_interface import IFrameProcessor
+from src.application.instrumentation import bind_context
+from src.application.jobs import CancellationToken
+from src.domain.entities.segment_manifest import SegmentManifest, SegmentState
+
+
+class SegmentedVideoRenderer:
+    """
+    Renders a video as fixed-length segments encoded to separate files.
+    A manifest records completed segments so an interrupted render resumes
+    where it stopped; segments are concatenated into the output at the end.
+    Each segment's last homography seeds the next segment's tracker when that
+    one has not started yet (always, when rendering one segment at a time).
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(
+            self,
+            frame_processor: IFrameProcessor,
+            segment_frames: int = 300,
+            max_workers: int = 1,
+            keep_segments: bool = False
+    ):
+        if segment_frames <= 0:
+            raise ValueError("segment_frames must be positive")
+        self.frame_processor = frame_processor
+        self.segment_frames = segment_frames
+        self.max_workers = max(1, max_workers)
+        self.keep_segments = keep_segments
+        self._manifest_lock = threading.Lock()
+
+    def find_resumable(self, video_path: str, output_path: str,
+                       total_frames: int, fps: float, w: int, h: int) -> Optional[SegmentManifest]:
+        """Return the manifest of an unfinished render of this video, if any"""
+        manifest = self._read_manifest(self.work_dir_for(output_path))
+        if manifest is None:
+            return None
+        if manifest.video_fingerprint != self._video_fingerprint(video_path, total_frames, fps, w, h):
+            return None
+        return manifest
+
+    def render(
+            self,
+            video_path: str,
+            trailer_frames: List[np.ndarray],
+            trailer_path: Optional[str],
+            book_name: str,
+            book_path: str,
+            book_image: np.ndarray,
+            base_homography: np.ndarray,
+            output_path: str,
+            total_frames: int,
+            fps: float,
+            w: int,
+            h: int,
+            alpha: float,
+            progress_callback: Optional[Callable] = None,
+            cancel_token: Optional[CancellationToken] = None,
+            confidence: float = 0.0
+    ) -> int:
+        """
+        Render all pending segments, concatenate them and return replaced frame count.
+        The detection confidence is kept in the manifest for a resumed render.
+        """
+        work_dir = self.work_dir_for(output_path)
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = self._prepare_manifest(
+            work_dir, video_path, trailer_path, book_name, book_path,
+            base_homography, total_frames, fps, w, h, alpha, confidence
+        )
+
+        pending = manifest.pending_segments
+        if len(pending) < len(manifest.segments):
+            print(f"♻️ Resuming render: {len(manifest.segments) - len(pending)}/{len(manifest.segments)} "
+                  f"segments already completed")
+
+        completed = [len(manifest.completed_segments)]
+        started = set()
+        seed_next = self._seeds_segments()
+
+        def on_segment_done(segment: SegmentState):
+            with self._manifest_lock:
+                segment.completed = True
+                following = segment.index + 1
+                if seed_next and following < len(manifest.segments) and following not in started:
+                    manifest.segments[following].homography = segment.final_homography
+                self._write_manifest(work_dir, manifest)
+                completed[0] += 1
+                done = completed[0]
+            if progress_callback:
+                progress = 20 + (done / len(manifest.segments)) * 60
+                progress_callback(f"Rendered segment {done}/{len(manifest.segments)}", progress)
+
+        def render_segment(segment: SegmentState):
+            # A cancelled render keeps its finished segments and resumes from them
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            with self._manifest_lock:
+                started.add(segment.index)
+            segment.replaced_frames_count = self._render_segment(
+                segment, work_dir, video_path, trailer_frames, book_image,
+                base_homography, total_frames, fps, w, h, alpha, cancel_token
+            )
+            on_segment_done(segment)
+
+        if self.max_workers == 1 or len(pending) <= 1:
+            for segment in pending:
+                render_segment(segment)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Propagate the first failure; finished segments stay checkpointed
+                for future in [executor.submit(bind_context(render_segment), s) for s in pending]:
+                    future.result()
+
+        if progress_callback:
+            progress_callback("Concatenating segments...", 85)
+
+        segment_paths = [str(work_dir / s.file_name) for s in manifest.segments]
+        self._concatenate_segments(segment_paths, output_path, fps, w, h)
+
+        if not self.keep_segments:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return sum(s.replaced_frames_count for s in manifest.segments)
+
+    def work_dir_for(self, output_path: str) -> Path:
+        """Directory holding segment files and the manifest for an output video"""
+        out = Path(output_path)
+        return out.parent / f"{out.stem}_segments"
+
+    def _prepare_manifest(
+            self,
+            work_dir: Path,
+            video_path: str,
+            trailer_path: Optional[str],
+            book_name: str,
+            book_path: str,
+            base_homography: np.ndarray,
+            total_frames: int,
+            fps: float,
+            w: int,
+            h: int,
+            alpha: float,
+            confidence: float = 0.0
+    ) -> SegmentManifest:
+        """Load a matching manifest or start a fresh one"""
+        fingerprint = self._video_fingerprint(video_path, total_frames, fps, w, h)
+        render_params = {
+            "segment_frames": self.segment_frames,
+            "alpha": float(alpha),
+            "trailer_path": str(trailer_path) if trailer_path else None,
+            "book_name": book_name,
+        }
+
+        manifest = self._read_manifest(work_dir)
+        if manifest is not None and manifest.matches(fingerprint, render_params):
+            # A segment only counts as done if its file survived
+            for segment in manifest.completed_segments:
+                if not (work_dir / segment.file_name).exists():
+                    segment.completed = False
+            return manifest
+
+        if manifest is not None:
+            print("⚠️ Render parameters changed, discarding previous segments")
+            for stale in work_dir.glob("segment_*"):
+                stale.unlink()
+
+        homography = [float(v) for v in np.asarray(base_homography).flatten()]
+        manifest = SegmentManifest(
+            video_fingerprint=fingerprint,
+            render_params=render_params,
+            book_name=book_name,
+            book_path=book_path,
+            base_homography=homography,
+            confidence=float(confidence)
+        )
+        for index, start in enumerate(range(0, total_frames, self.segment_frames)):
+            manifest.segments.append(SegmentState(
+                index=index,
+                start_frame=start,
+                end_frame=min(start + self.segment_frames, total_frames),
+                file_name=f"segment_{index:05d}.mp4",
+                homography=homography
+            ))
+
+        self._write_manifest(work_dir, manifest)
+        return manifest
+
+    def _render_segment(
+            self,
+            segment: SegmentState,
+            work_dir: Path,
+            video_path: str,
+            trailer_frames: List[np.ndarray],
+            book_image: np.ndarray,
+            base_homography: np.ndarray,
+            total_frames: int,
+            fps: float,
+            w: int,
+            h: int,
+            alpha: float,
+            cancel_token: Optional[CancellationToken] = None
+    ) -> int:
+        """Encode one segment to a partial file and publish it atomically"""
+        final_path = work_dir / segment.file_name
+        part_path = work_dir / f"{final_path.stem}.part.mp4"
+
+        homography = base_homography
+        if segment.homography is not None and self._seeds_segments():
+            homography = np.array(segment.homography, dtype=np.float64).reshape(3, 3)
+        final_homography = np.array(homography, dtype=np.float64).reshape(3, 3)
+
+        args = (video_path, trailer_frames, book_image, homography, str(part_path),
+                total_frames, fps, w, h, alpha, None)
+        kwargs = {"start_frame": segment.start_frame, "end_frame": segment.end_frame,
+                  "homography_out": final_homography}
+        if cancel_token:
+            kwargs["cancel_token"] = cancel_token
+
+        if asyncio.iscoroutinefunction(self.frame_processor.process_frames):
+            replaced = asyncio.run(self.frame_processor.process_frames(*args, **kwargs))
+        else:
+            replaced = self.frame_processor.process_frames(*args, **kwargs)
+
+        os.replace(part_path, final_path)
+        segment.final_homography = [float(v) for v in final_homography.flatten()]
+        return replaced
+
+    def _seeds_segments(self) -> bool:
+        """A two-pass track already spans the whole video, and its stored analysis is keyed by one base homography"""
+        return getattr(self.frame_processor, "track_analyzer", None) is None
+
+    def _concatenate_segments(self, segment_paths: List[str], output_path: str, fps: float, w: int, h: int):
+        """Join segment files into the output video"""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Stream copy with ffmpeg when available, avoids a second lossy encode
+        if shutil.which("ffmpeg"):
+            list_path = Path(segment_paths[0]).parent / "concat.txt"
+            list_path.write_text(
+                "".join(f"file '{Path(p).resolve().as_posix()}'\n" for p in segment_paths),
+                encoding="utf-8"
+            )
+            completed = subprocess.run(
+                ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                 "-i", str(list_path), "-c", "copy", output_path],
+                capture_output=True
+            )
+            if completed.returncode == 0:
+                return
+            print(f"⚠️ ffmpeg concat failed, re-encoding with OpenCV: {completed.stderr.decode(errors='ignore')}")
+
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        writer = cv2.VideoWriter(output_path, fourcc, fps, (w, h))
+        try:
+            for segment_path in segment_paths:
+                cap = cv2.VideoCapture(segment_path)
+                try:
+                    while True:
+                        ret, frame = cap.read()
+                        if not ret:
+                            break
+                        writer.write(frame)
+                finally:
+                    cap.release()
+        finally:
+            writer.release()
+
+    def _video_fingerprint(self, video_path: str, total_frames: int, fps: float, w: int, h: int) -> Dict[str, Any]:
+        stat = os.stat(video_path)
+        return {
+            "path": str(Path(video_path).resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "total_frames": total_frames,
+            "fps": float(fps),
+            "width": w,
+            "height": h,
+        }
+
+    def _read_manifest(self, work_dir: Path) -> Optional[SegmentManifest]:
+        manifest_path = work_dir / self.MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return SegmentManifest.from_dict(json.load(f))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable segment manifest {manifest_path}: {e}")
+            return None
+
+    def _write_manifest(self, work_dir: Path, manifest: SegmentManifest):
+        """Write the manifest atomically so a crash never leaves it half-written"""
+        manifest_path = work_dir / self.MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest.to_dict(), f, indent=2)
+        os.replace(tmp_path, manifest_path)
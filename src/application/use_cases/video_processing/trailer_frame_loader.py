@@ -1,8 +1,99 @@
+import threading
 import cv2
-from typing import List
+import numpy as np
+from collections import OrderedDict
+from typing import List, Optional
 from pathlib import Path
 
 
+class TrailerFrames:
+    """
+    Trailer frames decoded on demand. Renders read them roughly in order, so each
+    index is served from a small cache or by decoding forward from the nearest
+    open reader; only the cache stays resident, whatever the trailer's length.
+    A few readers let parallel segments read their own ranges without seeking.
+    """
+
+    MAX_READERS = 4
+
+    def __init__(self, trailer_path: str, cache_frames: int = 16):
+        self.trailer_path = trailer_path
+        self.cache_frames = max(cache_frames, 1)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._readers: List[list] = []  # [capture, next index], most recently used last
+
+        cap = cv2.VideoCapture(trailer_path)
+        self._length = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+        self._frame_shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 3)
+        cap.release()
+
+    @property
+    def nbytes(self) -> int:
+        """Upper bound of resident trailer memory: a full cache"""
+        return self.cache_frames * int(np.prod(self._frame_shape))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, idx: int) -> Optional[np.ndarray]:
+        if idx < 0:
+            idx += self._length
+        with self._lock:
+            while 0 <= idx < self._length:
+                frame = self._cache.get(idx)
+                if frame is not None:
+                    self._cache.move_to_end(idx)
+                    return frame
+                frame = self._decode(idx)
+                if frame is not None:
+                    return frame
+                # The container promised more frames than it has; clamp to the last one
+                idx = self._length - 1
+            return None
+
+    def close(self):
+        with self._lock:
+            for cap, _ in self._readers:
+                cap.release()
+            self._readers = []
+            self._cache.clear()
+
+    def _decode(self, idx: int) -> Optional[np.ndarray]:
+        reader = self._reader_for(idx)
+        cap = reader[0]
+        while reader[1] <= idx:
+            ret, frame = cap.read()
+            if not ret:
+                self._length = reader[1]
+                return None
+            self._remember(reader[1], frame)
+            reader[1] += 1
+        return self._cache.get(idx)
+
+    def _reader_for(self, idx: int) -> list:
+        """The reader that reaches idx decoding the fewest frames, seeking only when none is close"""
+        behind = [r for r in self._readers if r[1] <= idx < r[1] + self.cache_frames]
+        if behind:
+            reader = max(behind, key=lambda r: r[1])
+            self._readers.remove(reader)
+        elif len(self._readers) < self.MAX_READERS:
+            reader = [cv2.VideoCapture(self.trailer_path), 0]
+        else:
+            reader = self._readers.pop(0)
+        if reader[1] > idx or idx >= reader[1] + self.cache_frames:
+            reader[0].set(cv2.CAP_PROP_POS_FRAMES, idx)
+            reader[1] = idx
+        self._readers.append(reader)
+        return reader
+
+    def _remember(self, idx: int, frame: np.ndarray):
+        self._cache[idx] = frame
+        self._cache.move_to_end(idx)
+        while len(self._cache) > self.cache_frames:
+            self._cache.popitem(last=False)
+
+
 class TrailerFrameLoader:
     """Responsible for loading all frames from trailer video"""
 
@@ -22,3 +113,11 @@ class TrailerFrameLoader:
 
         cap_tr.release()
         return trailer_frames
+
+    def open_trailer_frames(self, trailer_path: str, cache_frames: int = 16) -> Optional[TrailerFrames]:
+        """Open the trailer for on-demand decoding; None when it is missing or empty"""
+        if not trailer_path or not Path(trailer_path).exists():
+            return None
+
+        trailer_frames = TrailerFrames(str(trailer_path), cache_frames)
+        return trailer_frames if len(trailer_frames) else None
@@ -0,0 +1,160 @@
+import os
+import time
+import cv2
+import numpy as np
+from typing import Callable, Optional
+
+from src.application.instrumentation import tracer
+from src.application.interfaces.image_repository_interface import IImageRepository
+from src.application.interfaces.video_repository_interface import IVideoRepository
+from src.application.jobs import CancellationToken
+from src.application.use_cases.frame_processing.async_frame_processor import AsyncFrameProcessor
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.application.use_cases.video_processing.book_detector_in_video import BookDetectorInVideo
+from src.application.use_cases.video_processing.trailer_frame_loader import TrailerFrameLoader
+from src.domain.entities.video_replacement_result import VideoReplacementResult
+
+
+class VideoPreviewUseCase:
+    """
+    Low-resolution preview of a replacement: every step-th frame, downscaled to
+    max_width, goes through the same detection, homography and blend steps as the
+    full render. Detection, book features and trailer frames are cached per video,
+    so re-rendering with another alpha or min_conf only repeats the per-frame work.
+    """
+
+    def __init__(
+            self,
+            feature_extractor,
+            matcher,
+            image_repository: IImageRepository,
+            video_repository: IVideoRepository,
+            frame_processor: Optional[AsyncFrameProcessor] = None,
+            step: int = 5,
+            max_width: int = 480
+    ):
+        book_matcher = FindMatchingBookMovieUseCase(
+            feature_extractor=feature_extractor,
+            matcher=matcher,
+            image_repository=image_repository
+        )
+
+        self.book_detector = BookDetectorInVideo(book_matcher, image_repository)
+        self.trailer_loader = TrailerFrameLoader()
+        self.frame_processor = frame_processor or AsyncFrameProcessor(book_matcher, max_workers=1)
+        self.feature_extractor = feature_extractor
+        self.vid_repo = video_repository
+        self.step = step
+        self.max_width = max_width
+        self.detections = 0  # Full detections run, for checking cache reuse
+        self._source_key = None
+        self._source: Optional[dict] = None
+
+    def render(
+            self,
+            input_video_name: str,
+            alpha: float = 0.7,
+            min_conf: float = 10.0,
+            step: Optional[int] = None,
+            max_width: Optional[int] = None,
+            frame_callback: Optional[Callable] = None,
+            cancel_token: Optional[CancellationToken] = None
+    ) -> VideoReplacementResult:
+        """Composite preview frames, passing each to frame_callback(frame, frame_idx, percent)"""
+        start_time = time.time()
+        step = max(step or self.step, 1)
+        max_width = max_width or self.max_width
+
+        source = self._prepare(input_video_name)
+        if not source:
+            return VideoReplacementResult.error(input_video_name, "Cannot open input video", start_time)
+        if source["book_name"] is None or source["confidence"] < min_conf:
+            return VideoReplacementResult.error(input_video_name, "No book detected", start_time)
+        if not source["trailer_frames"]:
+            return VideoReplacementResult.error(input_video_name, "No frames in trailer", start_time)
+
+        w, h, total = source["w"], source["h"], source["total_frames"]
+        scale = min(1.0, max_width / w) if w else 1.0
+        size = (max(int(round(w * scale)), 1), max(int(round(h * scale)), 1))
+        # The detection homography maps the cover into full-size frames
+        homography = np.diag([scale, scale, 1.0]) @ source["homography"]
+
+        cap = cv2.VideoCapture(source["video_path"])
+        rendered = 0
+        try:
+            for frame_idx in range(total):
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                if frame_idx % step:
+                    cap.grab()  # Skipped frames are never converted
+                    continue
+                with tracer.span("decode"):
+                    ret, frame = cap.read()
+                if not ret:
+                    break
+                if scale < 1.0:
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+                composited = self.frame_processor.composite_frame(
+                    frame, frame_idx, source["trailer_frames"], source["book_image"],
+                    source["feature_book"], homography, alpha
+                )
+                rendered += 1
+                if frame_callback:
+                    frame_callback(composited, frame_idx, (frame_idx + 1) / total * 100)
+        finally:
+            cap.release()
+
+        return VideoReplacementResult(
+            source_video_name=input_video_name,
+            target_book_name=source["book_name"],
+            replaced_frames_count=rendered,
+            total_frames_processed=total,
+            tracking_confidence=source["confidence"],
+            success=True,
+            processing_time_seconds=time.time() - start_time
+        )
+
+    def _prepare(self, input_video_name: str) -> Optional[dict]:
+        """Detection, book features and trailer frames for a video, computed once per file version"""
+        try:
+            video_path = str(self.vid_repo.load_input_video(input_video_name))
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        key = (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns)
+        if key == self._source_key:
+            return self._source
+
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        try:
+            # min_conf is applied per render, so detect with no threshold
+            book_data, confidence, _ = self.book_detector.detect(cap, total, 0.0)
+        finally:
+            cap.release()
+        self.detections += 1
+
+        source = dict(video_path=video_path, fps=fps, w=w, h=h, total_frames=total,
+                      book_name=None, confidence=0.0, trailer_frames=[])
+        if book_data:
+            book_name, book_path, book_image, homography = book_data
+            with tracer.span("trailer_fetch"):
+                trailer_frames = self.trailer_loader.load_trailer_frames(self.vid_repo.get_trailer_for_book(book_name))
+            source.update(
+                book_name=book_name,
+                book_path=book_path,
+                book_image=book_image,
+                homography=homography,
+                confidence=confidence,
+                feature_book=self.feature_extractor.extract_features(book_image),
+                trailer_frames=trailer_frames
+            )
+
+        self._source_key, self._source = key, source
+        return source
@@ -1,12 +1,44 @@
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Optional, List, Callable, Tuple
 import numpy as np
 import cv2
 
 @dataclass
 class BookCover:
     image_path: str
-    image: Optional[np.ndarray] = None
     keypoints: Optional[List[cv2.KeyPoint]] = None
     descriptors: Optional[np.ndarray] = None
     name: Optional[str] = None
+    size: Optional[Tuple[int, int]] = None  # (width, height), known without decoding
+    # Decodes image_path on first access to image; with keep_image=False the loader owns caching
+    image_loader: Optional[Callable[[str], Optional[np.ndarray]]] = field(default=None, repr=False, compare=False)
+    keep_image: bool = field(default=True, repr=False, compare=False)
+    # Decoded pixels, read through the image property; repr, asdict and replace never decode
+    _image: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_image(cls, image_path: str, image: Optional[np.ndarray], name: Optional[str] = None) -> "BookCover":
+        """A cover whose pixels are already decoded"""
+        return cls(image_path=image_path, name=name, _image=image)
+
+    @property
+    def image(self) -> Optional[np.ndarray]:
+        image = self._image
+        if image is None and self.image_loader is not None:
+            image = self.image_loader(self.image_path)
+            if self.keep_image:
+                self._image = image
+        return image
+
+    @image.setter
+    def image(self, image: Optional[np.ndarray]):
+        self._image = image
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._image is not None
+
+    def release_image(self):
+        """Drop decoded pixels of a lazily loaded cover; the next access decodes again"""
+        if self.image_loader is not None:
+            self._image = None
@@ -0,0 +1,66 @@
+import threading
+from typing import Dict, Optional, Tuple, Union
+import numpy as np
+import cv2
+
+
+class Frame:
+    """
+    A decoded BGR image and the views feature consumers derive from it: grayscale,
+    downscaled grayscale levels and resized thumbnails. Each view is computed on
+    first use and kept for the frame's lifetime, so detection, shot analysis and
+    homography estimation on one frame share a single conversion.
+
+    Frames wrapping pooled buffers must not outlive the buffer's release; their
+    views would describe pixels that were decoded over.
+    """
+
+    def __init__(self, image: np.ndarray, index: Optional[int] = None):
+        self.image = image
+        self.index = index
+        self._gray: Dict[float, np.ndarray] = {}  # scale -> grayscale level
+        self._resized: Dict[Tuple[int, int], np.ndarray] = {}  # (width, height) -> BGR
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, image: Union["Frame", np.ndarray]) -> "Frame":
+        """Wrap a plain image; a Frame is passed through with its cached views"""
+        return image if isinstance(image, Frame) else cls(image)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.image.shape
+
+    @property
+    def gray(self) -> np.ndarray:
+        return self.gray_at(1.0)
+
+    def gray_at(self, scale: float) -> np.ndarray:
+        """Grayscale at scale times the full size (a pyramid level); scales >= 1 give full size"""
+        scale = min(float(scale), 1.0)
+        with self._lock:
+            full = self._gray.get(1.0)
+            if full is None:
+                full = self._gray[1.0] = (cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+                                          if self.image.ndim == 3 else self.image)
+            level = self._gray.get(scale)
+            if level is None:
+                # Levels are taken from the full-size grayscale, never from each other
+                level = self._gray[scale] = cv2.resize(full, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            return level
+
+    def resized(self, size: Tuple[int, int]) -> np.ndarray:
+        """The BGR image area-resized to (width, height)"""
+        size = (int(size[0]), int(size[1]))
+        with self._lock:
+            view = self._resized.get(size)
+            if view is None:
+                view = self._resized[size] = cv2.resize(self.image, size, interpolation=cv2.INTER_AREA)
+            return view
+
+    def thumbnail(self, width: int) -> np.ndarray:
+        """The BGR image scaled down to width, keeping its aspect ratio; narrower images as they are"""
+        h, w = self.image.shape[:2]
+        if w <= width:
+            return self.image
+        return self.resized((width, max(int(h * width / w), 1)))
@@ -0,0 +1,43 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+
+@dataclass
+class HomographyTrack:
+    """Analysis of one video: the detected book and its per-frame book->frame homographies."""
+
+    homographies: np.ndarray  # (N, 3, 3) float32, one per frame
+    keyframes: List[int] = field(default_factory=list)  # Frames that were actually matched
+    visible: Optional[np.ndarray] = None  # (N,) bool, False where the placement is only held over
+    shot_boundaries: List[int] = field(default_factory=list)  # First frame of every shot after the first
+
+    # Book detection the track was made for, so re-renders can skip detection too
+    book_name: Optional[str] = None
+    book_path: Optional[str] = None
+    base_homography: Optional[np.ndarray] = None
+    confidence: float = 0.0
+
+    # Identity of the analysis; a stored track is only reused when both match
+    video_fingerprint: Dict[str, Any] = field(default_factory=dict)
+    analysis_params: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.visible is None:
+            self.visible = np.ones(len(self.homographies), dtype=bool)
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.homographies)
+
+    @property
+    def has_detection(self) -> bool:
+        return self.book_name is not None and self.base_homography is not None
+
+    def homography(self, frame_idx: int) -> np.ndarray:
+        """Homography for a frame, as float64 for cv2.warpPerspective"""
+        frame_idx = min(max(frame_idx, 0), self.frame_count - 1)
+        return self.homographies[frame_idx].astype(np.float64)
+
+    def matches(self, video_fingerprint: Dict[str, Any], analysis_params: Dict[str, Any]) -> bool:
+        return self.video_fingerprint == video_fingerprint and self.analysis_params == analysis_params
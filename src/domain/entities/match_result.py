@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 import cv2
 
 
@@ -14,4 +14,22 @@ class MatchResult:
     error_message: Optional[str] = None
     source_frame_path: Optional[str] = None
     overlay_image_path: Optional[str] = None
-    source_keypoints: Optional[List] = None
\ No newline at end of file
+    source_keypoints: Optional[List] = None
+    target_keypoints: Optional[List] = None
+    stage_timings: Optional[Dict[str, Dict[str, float]]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable view; raw matches and keypoints are reduced to counts."""
+        return {
+            "source_name": self.source_name,
+            "target_name": self.target_name,
+            "confidence_score": float(self.confidence_score),
+            "good_matches_count": self.good_matches_count,
+            "target_image_path": self.target_image_path,
+            "error_message": self.error_message,
+            "source_frame_path": self.source_frame_path,
+            "overlay_image_path": self.overlay_image_path,
+            "source_keypoints_count": len(self.source_keypoints) if self.source_keypoints is not None else None,
+            "target_keypoints_count": len(self.target_keypoints) if self.target_keypoints is not None else None,
+            "stage_timings": self.stage_timings
+        }
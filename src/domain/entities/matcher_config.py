@@ -0,0 +1,49 @@
+from dataclasses import dataclass, asdict, fields
+from typing import ClassVar, Dict, Any
+
+
+@dataclass
+class MatcherConfig:
+    """Feature extraction and FLANN search settings shared by every pipeline"""
+
+    name: str = "default"
+
+    # Feature extraction
+    extractor: str = "sift"  # "sift" or "orb"
+    max_keypoints: int = 0  # 0 = unlimited (SIFT only)
+    downscale: float = 1.0
+
+    # FLANN index and search
+    algorithm: str = "kdtree"  # "kdtree", "kmeans" or "lsh" (binary descriptors, needs extractor="orb")
+    trees: int = 5  # kdtree
+    branching: int = 32  # kmeans
+    checks: int = 50
+    ratio: float = 0.7  # Lowe's ratio test threshold
+
+    # Descriptor type of each extractor and the FLANN indexes that can search it
+    DESCRIPTOR_TYPES: ClassVar[Dict[str, str]] = {"sift": "float", "orb": "binary"}
+    INDEXES: ClassVar[Dict[str, str]] = {"kdtree": "float", "kmeans": "float", "lsh": "binary"}
+
+    def __post_init__(self):
+        if self.extractor not in self.DESCRIPTOR_TYPES:
+            raise ValueError(f"Unknown feature extractor: {self.extractor}")
+        if self.algorithm not in self.INDEXES:
+            raise ValueError(f"Unknown FLANN algorithm: {self.algorithm}")
+        descriptors = self.DESCRIPTOR_TYPES[self.extractor]
+        if self.INDEXES[self.algorithm] != descriptors:
+            suitable = ", ".join(a for a, kind in self.INDEXES.items() if kind == descriptors)
+            raise ValueError(f"A {self.algorithm} index cannot search {self.extractor}'s {descriptors} "
+                             f"descriptors; use {suitable}")
+
+    @property
+    def extractor_signature(self) -> str:
+        """Identifies settings that change extracted features, for feature caches"""
+        return f"{self.extractor}:{self.max_keypoints}:{self.downscale:g}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MatcherConfig":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+
+@dataclass
+class SegmentState:
+    """State of one fixed-length segment of a segmented render."""
+
+    index: int
+    start_frame: int
+    end_frame: int
+    file_name: str
+    completed: bool = False
+    replaced_frames_count: int = 0
+    # Flattened 3x3 homography the segment starts tracking from: the previous
+    # segment's final one when that finished first, the detection's otherwise
+    homography: Optional[List[float]] = None
+    # Flattened 3x3 homography of the segment's last frame, once completed
+    final_homography: Optional[List[float]] = None
+
+    @property
+    def frame_count(self) -> int:
+        return self.end_frame - self.start_frame
+
+
+@dataclass
+class SegmentManifest:
+    """Checkpoint of a segmented video render, persisted next to the segment files."""
+
+    # Identity of the render; a manifest is only resumed when these match
+    video_fingerprint: Dict[str, Any]
+    render_params: Dict[str, Any]
+
+    # Book detection result, so a resumed render can skip detection
+    book_name: Optional[str] = None
+    book_path: Optional[str] = None
+    base_homography: Optional[List[float]] = None
+    confidence: float = 0.0
+
+    segments: List[SegmentState] = field(default_factory=list)
+
+    @property
+    def completed_segments(self) -> List[SegmentState]:
+        return [s for s in self.segments if s.completed]
+
+    @property
+    def pending_segments(self) -> List[SegmentState]:
+        return [s for s in self.segments if not s.completed]
+
+    @property
+    def is_complete(self) -> bool:
+        return bool(self.segments) and not self.pending_segments
+
+    def matches(self, video_fingerprint: Dict[str, Any], render_params: Dict[str, Any]) -> bool:
+        """Whether this manifest describes the same render."""
+        return self.video_fingerprint == video_fingerprint and self.render_params == render_params
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "video_fingerprint": self.video_fingerprint,
+            "render_params": self.render_params,
+            "book_name": self.book_name,
+            "book_path": self.book_path,
+            "base_homography": self.base_homography,
+            "confidence": self.confidence,
+            "segments": [vars(s).copy() for s in self.segments],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentManifest":
+        return cls(
+            video_fingerprint=data["video_fingerprint"],
+            render_params=data["render_params"],
+            book_name=data.get("book_name"),
+            book_path=data.get("book_path"),
+            base_homography=data.get("base_homography"),
+            confidence=data.get("confidence", 0.0),
+            segments=[SegmentState(**s) for s in data.get("segments", [])]
+        )
@@ -1,6 +1,6 @@
 import time
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Tuple, Dict, Any
 
 
 @dataclass
@@ -24,6 +24,7 @@ class VideoReplacementResult:
     # Technical details
     replacement_regions: List[Tuple[int, Tuple[int, int, int, int]]] = None  # List of (frame_idx, bbox)
     processing_time_seconds: float = 0.0
+    stage_timings: Optional[Dict[str, Dict[str, float]]] = None  # Per-stage totals, filled while tracing
 
     # Error handling
     error_message: Optional[str] = None
@@ -47,6 +48,13 @@ class VideoReplacementResult:
             return 0
         return self.last_detection_frame - self.first_detection_frame + 1
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable view including derived properties."""
+        data = asdict(self)
+        data["replacement_percentage"] = self.replacement_percentage
+        data["duration_frames"] = self.duration_frames
+        return data
+
     @classmethod
     def error(
         cls,
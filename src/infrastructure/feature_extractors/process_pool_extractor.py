@@ -0,0 +1,73 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+import cv2
+import numpy as np
+
+from src.application.interfaces.feature_extractor_interface import (
+    IBatchFeatureExtractor,
+    IFeatureExtractor,
+    ExtractFeatureData
+)
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.repositories.file_feature_store import KeypointArray, keypoints_to_array
+
+_worker_extractor: Optional[IFeatureExtractor] = None
+
+
+def _init_worker(config: MatcherConfig):
+    global _worker_extractor
+    # One OpenCV thread per process; the pool already uses every core
+    cv2.setNumThreads(1)
+    from src.infrastructure.matchers.matcher_factory import create_feature_extractor
+    _worker_extractor = create_feature_extractor(config)
+
+
+def _extract_file(image_path: str) -> Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]:
+    return _extract_with(_worker_extractor, image_path)
+
+
+def _extract_with(extractor: IFeatureExtractor, image_path: str) -> Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]:
+    image = cv2.imread(image_path)
+    if image is None:
+        return image_path, None, None
+    feature = extractor.extract_features(image)
+    # cv2.KeyPoint does not pickle; ship packed rows instead
+    return image_path, keypoints_to_array(feature.keypoints or []), feature.descriptors
+
+
+class ProcessPoolFeatureExtractor(IBatchFeatureExtractor):
+    """
+    Decodes and extracts catalog covers across worker processes. Each worker builds
+    its own extractor from the MatcherConfig, so only paths and packed results cross
+    process boundaries. Spawned workers avoid forking a parent with OpenCV threads.
+    """
+
+    def __init__(self, config: MatcherConfig, workers: int = 4, chunksize: Optional[int] = None):
+        self.config = config
+        self.workers = max(1, workers)
+        self.chunksize = chunksize
+
+    def extract_files(self, image_paths: List[str]) -> Iterator[Tuple[str, Optional[ExtractFeatureData]]]:
+        if not image_paths:
+            return
+        if self.workers == 1:
+            from src.infrastructure.matchers.matcher_factory import create_feature_extractor
+            extractor = create_feature_extractor(self.config)
+            for image_path in image_paths:
+                yield self._unpack(*_extract_with(extractor, image_path))
+            return
+
+        # A few chunks per worker keeps them busy without per-cover IPC overhead
+        chunksize = self.chunksize or max(1, min(16, len(image_paths) // (self.workers * 4)))
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(self.config,)) as executor:
+            for result in executor.map(_extract_file, image_paths, chunksize=chunksize):
+                yield self._unpack(*result)
+
+    @staticmethod
+    def _unpack(image_path: str, keypoints: Optional[np.ndarray], descriptors: Optional[np.ndarray]):
+        if keypoints is None:
+            return image_path, None
+        return image_path, ExtractFeatureData(KeypointArray(keypoints), descriptors)
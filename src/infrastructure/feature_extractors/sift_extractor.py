@@ -1,13 +1,33 @@
+from typing import Union
 import numpy as np
 import cv2
 from src.application.interfaces.feature_extractor_interface import IFeatureExtractor, ExtractFeatureData
+from src.application.instrumentation import tracer
+from src.domain.entities.frame import Frame
 
 
 class SIFTExtractor(IFeatureExtractor):
-    def __init__(self):
-        self.sift = cv2.SIFT_create()
+    def __init__(self, max_keypoints: int = 0, downscale: float = 1.0):
+        # max_keypoints=0 keeps every keypoint; downscale < 1 detects on a smaller image
+        self.max_keypoints = max_keypoints
+        self.downscale = downscale
+        self.sift = cv2.SIFT_create(nfeatures=max_keypoints)
 
-    def extract_features(self, image: np.ndarray) -> ExtractFeatureData:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        keypoints, descriptors = self.sift.detectAndCompute(gray, None)
-        return ExtractFeatureData(keypoints, descriptors)
+    def extract_features(self, image: Union[Frame, np.ndarray]) -> ExtractFeatureData:
+        # A shared Frame converts once for every consumer; plain images are wrapped here
+        with tracer.span("grayscale"):
+            gray = Frame.of(image).gray_at(self.downscale)
+        with tracer.span("sift_detect"):
+            keypoints, descriptors = self.sift.detectAndCompute(gray, None)
+        return ExtractFeatureData(rescale_keypoints(keypoints, self.downscale), descriptors)
+
+
+def rescale_keypoints(keypoints, factor: float):
+    """Map keypoints found on a downscaled image back to full-resolution coordinates"""
+    if factor >= 1.0:
+        return keypoints
+    return tuple(
+        cv2.KeyPoint(kp.pt[0] / factor, kp.pt[1] / factor, kp.size / factor,
+                     kp.angle, kp.response, kp.octave, kp.class_id)
+        for kp in keypoints
+    )
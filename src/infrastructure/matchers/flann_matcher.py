@@ -1,27 +1,87 @@
-from typing import List
+from typing import List, Optional
 import numpy as np
 import cv2
-from src.application.interfaces.matcher_interface import IMatcher
+from src.application.interfaces.matcher_interface import IMatcher, IDescriptorIndex
+from src.application.instrumentation import tracer
+from src.domain.entities.matcher_config import MatcherConfig
+
+FLANN_INDEX_KDTREE = 1
+FLANN_INDEX_KMEANS = 2
+FLANN_INDEX_LSH = 6
 
 
 class FLANNMatcher(IMatcher):
-    def __init__(self):
-        FLANN_INDEX_KDTREE = 1
-        index_params = dict(algorithm=FLANN_INDEX_KDTREE, trees=5)
-        search_params = dict(checks=50)
-        self.flann = cv2.FlannBasedMatcher(index_params, search_params)
+    def __init__(self, config: Optional[MatcherConfig] = None):
+        config = config or MatcherConfig()
+        # "kdtree"/"kmeans" for float descriptors (SIFT), "lsh" for binary ones (ORB)
+        if config.algorithm == "kdtree":
+            self.index_params = dict(algorithm=FLANN_INDEX_KDTREE, trees=config.trees)
+        elif config.algorithm == "kmeans":
+            self.index_params = dict(algorithm=FLANN_INDEX_KMEANS, branching=config.branching,
+                                     iterations=11, cb_index=0.2)
+        elif config.algorithm == "lsh":
+            self.index_params = dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1)
+        else:
+            raise ValueError(f"Unknown FLANN algorithm: {config.algorithm}")
+        self.config = config
+        self.search_params = dict(checks=config.checks)
+        self.ratio = config.ratio
+        self.flann = cv2.FlannBasedMatcher(self.index_params, self.search_params)
 
     def match_features(self, desc1: np.ndarray, desc2: np.ndarray) -> List[cv2.DMatch]:
-        if desc1 is None or desc2 is None:
+        if desc1 is None or desc2 is None or len(desc1) == 0 or len(desc2) == 0:
             return []
 
-        matches = self.flann.knnMatch(desc1, desc2, k=2)
+        with tracer.span("knn_match"):
+            matches = self.flann.knnMatch(desc1, desc2, k=2)
+        with tracer.span("ratio_test"):
+            return self._ratio_test(matches, self.ratio)
+
+    def build_index(self, descriptor_sets: List[Optional[np.ndarray]]) -> IDescriptorIndex:
+        return FLANNDescriptorIndex(descriptor_sets, self.index_params, self.search_params, self.ratio)
+
+    @staticmethod
+    def _ratio_test(matches, ratio: float) -> List[cv2.DMatch]:
         good_matches = []
 
         for match_pair in matches:
+            # LSH may return fewer than two neighbours
             if len(match_pair) == 2:
                 m, n = match_pair
-                if m.distance < 0.7 * n.distance:
+                if m.distance < ratio * n.distance:
                     good_matches.append(m)
 
         return good_matches
+
+
+class FLANNDescriptorIndex(IDescriptorIndex):
+    """FLANN index trained once over many descriptor sets"""
+
+    def __init__(self, descriptor_sets: List[Optional[np.ndarray]], index_params: dict,
+                 search_params: dict, ratio: float):
+        self.ratio = ratio
+        self.flann = cv2.FlannBasedMatcher(index_params, search_params)
+        # KD-trees need float32; LSH works on the raw binary descriptors
+        self._dtype = np.uint8 if index_params.get("algorithm") == FLANN_INDEX_LSH else np.float32
+
+        # FLANN rejects empty sets; remember where the non-empty ones came from
+        self._set_ids = []
+        for set_id, descriptors in enumerate(descriptor_sets):
+            if descriptors is not None and len(descriptors) > 0:
+                self.flann.add([np.ascontiguousarray(descriptors, dtype=self._dtype)])
+                self._set_ids.append(set_id)
+
+        if self._set_ids:
+            self.flann.train()
+
+    def match(self, descriptors: np.ndarray) -> List[cv2.DMatch]:
+        if descriptors is None or len(descriptors) == 0 or not self._set_ids:
+            return []
+
+        with tracer.span("knn_match"):
+            matches = self.flann.knnMatch(np.ascontiguousarray(descriptors, dtype=self._dtype), k=2)
+        with tracer.span("ratio_test"):
+            good_matches = FLANNMatcher._ratio_test(matches, self.ratio)
+        for m in good_matches:
+            m.imgIdx = self._set_ids[m.imgIdx]
+        return good_matches
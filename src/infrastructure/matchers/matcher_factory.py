@@ -0,0 +1,56 @@
+import json
+import os
+from pathlib import Path
+from typing import Tuple
+
+from src.application.interfaces.feature_extractor_interface import IFeatureExtractor
+from src.application.interfaces.matcher_interface import IMatcher
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.feature_extractors.orb_extractor import ORBExtractor
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+
+MATCHER_CONFIG_FILE = "matcher_config.json"
+
+
+def create_feature_extractor(config: MatcherConfig) -> IFeatureExtractor:
+    if config.extractor == "orb":
+        return ORBExtractor(max_keypoints=config.max_keypoints or 2000, downscale=config.downscale)
+    if config.extractor == "sift":
+        return SIFTExtractor(max_keypoints=config.max_keypoints, downscale=config.downscale)
+    raise ValueError(f"Unknown feature extractor: {config.extractor}")
+
+
+def create_matcher(config: MatcherConfig) -> IMatcher:
+    return FLANNMatcher(config)
+
+
+def create_components(config: MatcherConfig) -> Tuple[IFeatureExtractor, IMatcher]:
+    return create_feature_extractor(config), create_matcher(config)
+
+
+def matcher_config_path(features_cache: str) -> Path:
+    """Tuned settings live next to the catalog feature cache they were tuned on"""
+    return Path(features_cache).parent / MATCHER_CONFIG_FILE
+
+
+def load_matcher_config(path) -> MatcherConfig:
+    """Saved settings, or the defaults if none were saved"""
+    path = Path(path)
+    if not path.exists():
+        return MatcherConfig()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return MatcherConfig.from_dict(json.load(f))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"⚠️ Ignoring unreadable matcher config {path}: {e}")
+        return MatcherConfig()
+
+
+def save_matcher_config(config: MatcherConfig, path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(config.to_dict(), f, indent=2)
+    os.replace(tmp_path, path)
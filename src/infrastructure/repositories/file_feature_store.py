@@ -0,0 +1,123 @@
+import json
+import os
+from pathlib import Path
+from collections.abc import Sequence
+from typing import Dict, Optional, List
+import cv2
+import numpy as np
+
+from src.application.interfaces.feature_extractor_interface import ExtractFeatureData
+from src.application.interfaces.feature_store_interface import IFeatureStore
+
+
+class KeypointArray(Sequence):
+    """Read-only keypoints over packed rows; cv2.KeyPoint objects are only built on access"""
+
+    def __init__(self, rows: np.ndarray):
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        x, y, size, angle, response, octave, class_id = self.rows[index]
+        return cv2.KeyPoint(float(x), float(y), float(size), float(angle), float(response), int(octave), int(class_id))
+
+
+def keypoints_to_array(keypoints: List[cv2.KeyPoint]) -> np.ndarray:
+    """Pack keypoints as rows of (x, y, size, angle, response, octave, class_id)"""
+    if isinstance(keypoints, KeypointArray):
+        return np.asarray(keypoints.rows, dtype=np.float32)
+    return np.array(
+        [(kp.pt[0], kp.pt[1], kp.size, kp.angle, kp.response, kp.octave, kp.class_id) for kp in keypoints],
+        dtype=np.float32
+    ).reshape(-1, 7)
+
+
+def array_to_keypoints(array: np.ndarray) -> List[cv2.KeyPoint]:
+    """Inverse of keypoints_to_array"""
+    return [
+        cv2.KeyPoint(float(x), float(y), float(size), float(angle), float(response), int(octave), int(class_id))
+        for x, y, size, angle, response, octave, class_id in array
+    ]
+
+
+class FileFeatureStore(IFeatureStore):
+    """
+    Stores catalog features in a single .npz file, validated by file size and mtime.
+    The signature names the extractor settings; a cache written with other settings is ignored.
+    """
+
+    def __init__(self, cache_path: str = "data/cache/catalog/features.npz", signature: str = ""):
+        self.cache_path = Path(cache_path)
+        self.signature = signature
+        self._entries = None  # path -> (fingerprint, keypoints array, descriptors)
+
+    def load_features(self, image_path: str) -> Optional[ExtractFeatureData]:
+        if self._entries is None:
+            self._entries = self._read_cache()
+
+        entry = self._entries.get(os.path.normpath(image_path))
+        if entry is None:
+            return None
+
+        fingerprint, keypoints, descriptors = entry
+        if fingerprint != self._fingerprint(image_path):
+            return None
+
+        return ExtractFeatureData(array_to_keypoints(keypoints), descriptors)
+
+    def save_features(self, features: Dict[str, ExtractFeatureData]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        meta = []
+        arrays = {}
+        entries = {}
+        for i, (image_path, feature) in enumerate(features.items()):
+            path = os.path.normpath(image_path)
+            fingerprint = self._fingerprint(path)
+            if fingerprint is None:
+                continue
+            keypoints = keypoints_to_array(feature.keypoints or [])
+            descriptors = feature.descriptors
+            if descriptors is None:
+                descriptors = np.empty((0, 128), dtype=np.float32)
+
+            meta.append({"path": path, "fingerprint": fingerprint, "key": i})
+            arrays[f"kp_{i}"] = keypoints
+            arrays[f"desc_{i}"] = descriptors
+            entries[path] = (fingerprint, keypoints, descriptors)
+
+        # Write next to the target and swap, readers never see a partial file
+        tmp_path = self.cache_path.with_name(self.cache_path.stem + ".tmp.npz")
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)), signature=np.array(self.signature), **arrays)
+        os.replace(tmp_path, self.cache_path)
+        self._entries = entries
+
+    def _read_cache(self) -> Dict[str, tuple]:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with np.load(self.cache_path) as data:
+                signature = str(data["signature"]) if "signature" in data.files else ""
+                if signature != self.signature:
+                    print(f"♻️ Feature cache {self.cache_path} was built with other extractor settings")
+                    return {}
+                meta = json.loads(str(data["meta"]))
+                return {
+                    m["path"]: (m["fingerprint"], data[f"kp_{m['key']}"], data[f"desc_{m['key']}"])
+                    for m in meta
+                }
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable feature cache {self.cache_path}: {e}")
+            return {}
+
+    @staticmethod
+    def _fingerprint(image_path: str) -> Optional[List[int]]:
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
@@ -1,19 +1,32 @@
 import json
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 import cv2
+import numpy as np
 import os
 from pathlib import Path
+from PIL import Image
 from src.application.interfaces.image_repository_interface import IImageRepository
 from src.domain.entities.book_cover import BookCover
 
 
 class FileImageRepository(IImageRepository):
-    def __init__(self, input_path: str = "data/input_images", book_movie_path: str = "data/book_images"):
+    """
+    Catalog covers are listed from image headers only and decoded on first access
+    to BookCover.image. With image_cache_size set, decoded covers live in a bounded
+    LRU shared by the repository instead of on each cover.
+    """
+
+    def __init__(self, input_path: str = "data/input_images", book_movie_path: str = "data/book_images",
+                 image_cache_size: Optional[int] = None):
         self.input_path = input_path
         self.book_movie_path = book_movie_path
+        self.image_cache_size = image_cache_size
+        self._decode_cached = lru_cache(maxsize=image_cache_size)(self._decode_version) if image_cache_size else None
         self.movie_cover_path = "data/movie_images"
         self.book_movie_mapping_path = Path("data/book_movie_mapping.json")
         self.book_movie_mapping = None
+        self._loaded_mapping_version = None
 
     def load_input_image(self, path: str) -> BookCover:
         full_path = os.path.join(self.input_path, path)
@@ -21,31 +34,58 @@ class FileImageRepository(IImageRepository):
         if image is None:
             raise FileNotFoundError(f"Image not found: {full_path}")
 
-        return BookCover(
-            image_path=full_path,
-            image=image,
-            name=Path(path).stem
-        )
+        return BookCover.from_image(full_path, image, name=Path(path).stem)
 
     def load_book_movie_images(self) -> List[BookCover]:
         books = []
-        for filename in os.listdir(self.book_movie_path):
+        for filename in sorted(os.listdir(self.book_movie_path)):
             if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
                 full_path = os.path.join(self.book_movie_path, filename)
-                image = cv2.imread(full_path)
-                if image is not None:
-                    book = BookCover(
-                        image_path=full_path,
-                        image=image,
-                        name=Path(filename).stem
-                    )
-                    books.append(book)
+                size = self._read_size(full_path)
+                if size is None:
+                    continue
+                books.append(BookCover(
+                    image_path=full_path,
+                    name=Path(filename).stem,
+                    size=size,
+                    image_loader=self._load_image,
+                    keep_image=not self.image_cache_size
+                ))
         return books
 
+    def _load_image(self, path: str) -> Optional[np.ndarray]:
+        if self._decode_cached is None:
+            return cv2.imread(path)
+        try:
+            version = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        # The modification time is part of the key so an edited cover is decoded again
+        return self._decode_cached(path, version)
+
+    @staticmethod
+    def _decode_version(path: str, version: int) -> Optional[np.ndarray]:
+        return cv2.imread(path)
+
+    def image_cache_info(self):
+        """functools cache statistics of the shared cover LRU, or None without one"""
+        return self._decode_cached.cache_info() if self._decode_cached else None
+
+    @staticmethod
+    def _read_size(path: str) -> Optional[Tuple[int, int]]:
+        """(width, height) from the file header; PIL does not decode pixels until asked"""
+        try:
+            with Image.open(path) as image:
+                return image.size
+        except Exception:
+            return None
+
     def get_movie_image_for_book(self, book_name: str) -> str:
-        # Load mapping if not cached
-        if self.book_movie_mapping is None:
+        # Load mapping if not cached, or again once the file was edited
+        mapping_version = self._mapping_version()
+        if self.book_movie_mapping is None or mapping_version != self._loaded_mapping_version:
             self.book_movie_mapping = self._load_book_movie_mapping()
+            self._loaded_mapping_version = mapping_version
 
         # Check direct mapping first
         if book_name in self.book_movie_mapping:
@@ -58,6 +98,12 @@ class FileImageRepository(IImageRepository):
                 print(f"⚠️ Mapped movie not found: {movie_image_path}")
         raise FileNotFoundError()
 
+    def _mapping_version(self) -> Optional[int]:
+        try:
+            return self.book_movie_mapping_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
     def _load_book_movie_mapping(self) -> Dict[str, str]:
         try:
             if self.book_movie_mapping_path.exists():
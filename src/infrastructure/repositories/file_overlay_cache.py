@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+from src.application.interfaces.overlay_cache_interface import IOverlayCache, OverlayCacheEntry
+
+
+class FileOverlayCache(IOverlayCache):
+    """
+    Overlays stored as <key>.jpg with a <key>.json metadata file, where the key is
+    a SHA-256 over the input, cover and movie-cover bytes plus the overlay
+    parameters. Entries are evicted least recently used first once their total
+    size exceeds max_bytes; recency survives restarts through the files' mtime.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/overlays", max_bytes: int = 256 * 1024 ** 2):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> bytes on disk, oldest first
+        self._total_bytes = 0
+        self._digests: Dict[str, Tuple[Tuple[int, int], str]] = {}  # path -> (size, mtime_ns), sha256
+        self._scan()
+
+    def key(self, file_paths: List[str], params: Dict[str, Any]) -> str:
+        digest = hashlib.sha256()
+        for path in file_paths:
+            digest.update(self._file_digest(path).encode())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[OverlayCacheEntry]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                with open(self._meta_path(key), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._drop(key)
+                self.misses += 1
+                return None
+            image_path = self._image_path(key) if meta.get("has_image") else None
+            if image_path is not None and not image_path.exists():
+                self._drop(key)
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            os.utime(self._meta_path(key))
+        return OverlayCacheEntry(str(image_path) if image_path else None, meta.get("metadata", {}))
+
+    def put(self, key: str, image: Optional[np.ndarray], metadata: Dict[str, Any]) -> OverlayCacheEntry:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        image_path = self._image_path(key)
+        if image is not None:
+            # Write next to the target and swap, readers never see a partial file
+            tmp_path = image_path.with_name(image_path.stem + ".tmp.jpg")
+            cv2.imwrite(str(tmp_path), image)
+            os.replace(tmp_path, image_path)
+        tmp_meta = self._meta_path(key).with_suffix(".tmp")
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump({"has_image": image is not None, "metadata": metadata}, f, default=str)
+        os.replace(tmp_meta, self._meta_path(key))
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            size = self._entry_size(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return OverlayCacheEntry(str(image_path) if image is not None else None, metadata)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions
+            }
+
+    def clear(self):
+        """Remove every entry; counters are kept"""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def _scan(self):
+        if not self.cache_dir.exists():
+            return
+        metas = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime_ns)
+        for meta in metas:
+            size = self._entry_size(meta.stem)
+            self._entries[meta.stem] = size
+            self._total_bytes += size
+
+    def _drop(self, key: str):
+        self._total_bytes -= self._entries.pop(key, 0)
+        for path in (self._image_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _entry_size(self, key: str) -> int:
+        size = 0
+        for path in (self._image_path(key), self._meta_path(key)):
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        return size
+
+    def _image_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.jpg"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _file_digest(self, path: str) -> str:
+        """SHA-256 of a file, remembered per (size, mtime) so covers are hashed once"""
+        stat = os.stat(path)
+        version = (stat.st_size, stat.st_mtime_ns)
+        cached = self._digests.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self._digests[path] = (version, digest.hexdigest())
+        return digest.hexdigest()
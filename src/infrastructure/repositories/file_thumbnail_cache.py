@@ -0,0 +1,113 @@
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from PIL import Image
+
+
+class FileThumbnailCache:
+    """
+    Display thumbnails kept in an in-memory LRU and as <key>.png files on disk.
+    The key covers the image's absolute path, mtime, file size and the requested
+    box, so an edited image gets a fresh thumbnail and the old file is simply
+    never read again. Safe to call from worker threads; returns PIL images, the
+    caller turns them into PhotoImages on the Tk thread.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/thumbnails", memory_items: int = 256):
+        self.cache_dir = Path(cache_dir)
+        self.memory_items = memory_items
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Image.Image]" = OrderedDict()
+
+    def get(self, image_path: str, size: Tuple[int, int] = (300, 300)) -> Optional[Image.Image]:
+        """Thumbnail fitting inside size, or None when the image cannot be read"""
+        key = self.key(image_path, size)
+        if key is None:
+            return None
+
+        with self._lock:
+            thumbnail = self._memory.get(key)
+            if thumbnail is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return thumbnail
+
+        thumbnail = self._read_disk(key)
+        if thumbnail is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            thumbnail = self._render(image_path, size)
+            if thumbnail is None:
+                return None
+            self._write_disk(key, thumbnail)
+            with self._lock:
+                self.misses += 1
+
+        with self._lock:
+            self._memory[key] = thumbnail
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+        return thumbnail
+
+    def key(self, image_path: str, size: Tuple[int, int]) -> Optional[str]:
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_items": len(self._memory)
+            }
+
+    @staticmethod
+    def _render(image_path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+        try:
+            with Image.open(image_path) as image:
+                # JPEGs decode straight at a reduced scale instead of full resolution
+                image.draft("RGB", size)
+                image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+                image.thumbnail(size, Image.Resampling.LANCZOS)
+                return image
+        except (OSError, ValueError):
+            return None
+
+    def _read_disk(self, key: str) -> Optional[Image.Image]:
+        path = self.cache_dir / f"{key}.png"
+        try:
+            with Image.open(path) as image:
+                image.load()
+                return image
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, thumbnail: Image.Image):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.png"
+        tmp_path = self.cache_dir / f"{key}.{threading.get_ident()}.tmp"
+        try:
+            thumbnail.save(tmp_path, format="PNG")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Cannot cache thumbnail: {e}")
+            tmp_path.unlink(missing_ok=True)
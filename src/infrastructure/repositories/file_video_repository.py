@@ -16,6 +16,9 @@ class FileVideoRepository(IVideoRepository):
 
         input_videos_path = Path("data/input_videos")
         full = input_videos_path / filename
+        if not full.exists() and Path(filename).exists():
+            # Allow explicit paths outside input_videos (e.g. from the CLI)
+            full = Path(filename)
         if not full.exists():
             raise FileNotFoundError(f"Video not found: {full}")
         return full
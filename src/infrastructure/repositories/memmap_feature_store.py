@@ -0,0 +1,159 @@
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Any
+import numpy as np
+
+from src.application.interfaces.feature_extractor_interface import ExtractFeatureData
+from src.application.interfaces.feature_store_interface import IFeatureStore
+from src.infrastructure.repositories.file_feature_store import (
+    FileFeatureStore,
+    KeypointArray,
+    keypoints_to_array
+)
+
+MAGIC = b"BKCAT01\n"
+ALIGNMENT = 64
+
+
+class MemmapFeatureStore(IFeatureStore):
+    """
+    Catalog features packed into one read-only file: a JSON header with cover
+    metadata, then every cover's descriptors as one contiguous matrix and every
+    keypoint as one (N, 7) matrix. Readers map both blocks with np.memmap, so
+    processes opening the same file share its physical pages and startup does
+    not depend on catalog size. Covers are validated by file size and mtime.
+    """
+
+    def __init__(self, cache_path: str = "data/cache/catalog/features.bin", signature: str = ""):
+        self.cache_path = Path(cache_path)
+        self.signature = signature
+        self._header: Optional[Dict[str, Any]] = None
+        self._covers: Dict[str, Dict[str, Any]] = {}
+        self._descriptors: Optional[np.ndarray] = None
+        self._keypoints: Optional[np.ndarray] = None
+
+    @property
+    def header(self) -> Dict[str, Any]:
+        if self._header is None:
+            self._open()
+        return self._header
+
+    def load_features(self, image_path: str) -> Optional[ExtractFeatureData]:
+        if self._header is None:
+            self._open()
+
+        entry = self._covers.get(os.path.normpath(image_path))
+        if entry is None or entry["fingerprint"] != FileFeatureStore._fingerprint(image_path):
+            return None
+
+        # Views into the mapping: nothing is copied until a page is touched
+        descriptors = self._descriptors[entry["desc_start"]:entry["desc_start"] + entry["desc_count"]]
+        keypoints = self._keypoints[entry["kp_start"]:entry["kp_start"] + entry["kp_count"]]
+        return ExtractFeatureData(KeypointArray(keypoints), descriptors if entry["desc_count"] else None)
+
+    def save_features(self, features: Dict[str, ExtractFeatureData]) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        covers, descriptor_blocks, keypoint_blocks = [], [], []
+        desc_rows = kp_rows = 0
+        dtype, dim = np.dtype(np.float32), 128
+        for feature in features.values():
+            if feature.descriptors is not None and len(feature.descriptors):
+                dtype, dim = feature.descriptors.dtype, feature.descriptors.shape[1]
+                break
+
+        for image_path, feature in features.items():
+            path = os.path.normpath(image_path)
+            fingerprint = FileFeatureStore._fingerprint(path)
+            if fingerprint is None:
+                continue
+            descriptors = feature.descriptors if feature.descriptors is not None else np.empty((0, dim), dtype)
+            keypoints = keypoints_to_array(feature.keypoints or [])
+
+            covers.append({
+                "path": path,
+                "name": Path(path).stem,
+                "fingerprint": fingerprint,
+                "desc_start": desc_rows,
+                "desc_count": len(descriptors),
+                "kp_start": kp_rows,
+                "kp_count": len(keypoints)
+            })
+            descriptor_blocks.append(np.ascontiguousarray(descriptors, dtype=dtype))
+            keypoint_blocks.append(keypoints)
+            desc_rows += len(descriptors)
+            kp_rows += len(keypoints)
+
+        header = {
+            "signature": self.signature,
+            "descriptor_dtype": dtype.str,
+            "descriptor_dim": int(dim),
+            "descriptor_rows": desc_rows,
+            "keypoint_rows": kp_rows,
+            "covers": covers
+        }
+        # Offsets depend on the header length, which depends on the offsets: reserve room first
+        header["desc_offset"] = header["kp_offset"] = 0
+        header_size = len(json.dumps(header).encode()) + 64
+        header["desc_offset"] = self._align(len(MAGIC) + 8 + header_size)
+        header["kp_offset"] = self._align(header["desc_offset"] + desc_rows * dim * dtype.itemsize)
+        header_bytes = json.dumps(header).encode().ljust(header_size)
+
+        # Write next to the target and swap; processes mapping the old file keep their pages
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header_bytes)))
+            f.write(header_bytes)
+            f.seek(header["desc_offset"])
+            for block in descriptor_blocks:
+                f.write(block.tobytes())
+            f.seek(header["kp_offset"])
+            for block in keypoint_blocks:
+                f.write(block.tobytes())
+        os.replace(tmp_path, self.cache_path)
+        self._open()
+
+    def _open(self):
+        self._header, self._covers = {}, {}
+        self._descriptors = self._keypoints = None
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError("not a catalog feature file")
+                (header_size,) = struct.unpack("<Q", f.read(8))
+                header = json.loads(f.read(header_size).decode())
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable feature cache {self.cache_path}: {e}")
+            return
+
+        if header.get("signature", "") != self.signature:
+            print(f"♻️ Feature cache {self.cache_path} was built with other extractor settings")
+            return
+
+        dim = header["descriptor_dim"]
+        self._descriptors = self._map(header["descriptor_dtype"], header["desc_offset"],
+                                      (header["descriptor_rows"], dim))
+        self._keypoints = self._map("<f4", header["kp_offset"], (header["keypoint_rows"], 7))
+        self._header = header
+        self._covers = {c["path"]: c for c in header["covers"]}
+
+    def _map(self, dtype: str, offset: int, shape: tuple) -> np.ndarray:
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(self.cache_path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def open_feature_store(cache_path: str, signature: str = "") -> IFeatureStore:
+    """Feature store for a cache file: .npz files keep the per-process loader, anything else is memory-mapped"""
+    if str(cache_path).endswith(".npz"):
+        return FileFeatureStore(cache_path, signature)
+    return MemmapFeatureStore(cache_path, signature)
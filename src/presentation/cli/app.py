@@ -0,0 +1,595 @@
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Iterable, Optional, TextIO
+
+import cv2
+import numpy as np
+
+from src.application.instrumentation import tracer
+from src.application.use_cases import (
+    AccuracyEvaluation,
+    AsyncFrameProcessor,
+    BenchmarkSuite,
+    CatalogIndex,
+    FindMatchingBookMovieUseCase,
+    HomographyTrackAnalyzer,
+    MatchBatcher,
+    MatcherAutoTuner,
+    ParallelFrameProcessor,
+    ProcessInputVideoUseCase,
+    SyntheticFixtureGenerator
+)
+from src.application.use_cases.evaluation import (
+    default_search_space,
+    default_sweep,
+    load_labeled_queries,
+    synthetic_queries
+)
+from src.domain.entities.match_result import MatchResult
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.feature_extractors.process_pool_extractor import ProcessPoolFeatureExtractor
+from src.infrastructure.matchers.matcher_factory import (
+    create_components,
+    load_matcher_config,
+    matcher_config_path,
+    save_matcher_config
+)
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.file_overlay_cache import FileOverlayCache
+from src.infrastructure.repositories.file_video_repository import FileVideoRepository
+from src.infrastructure.repositories.memmap_feature_store import open_feature_store
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov')
+
+
+def expand_inputs(patterns: Iterable[str], extensions: tuple) -> List[str]:
+    """Expand files, directories and glob patterns into a de-duplicated list of paths"""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = sorted(str(p) for p in Path(pattern).iterdir())
+        elif glob.has_magic(pattern):
+            candidates = sorted(glob.glob(pattern, recursive=True))
+        else:
+            candidates = [pattern]
+
+        for path in candidates:
+            if path.lower().endswith(extensions) and path not in paths:
+                paths.append(path)
+    return paths
+
+
+class JsonLinesWriter:
+    """Thread-safe JSON Lines output to a file or stdout"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=_json_default)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def _json_default(value):
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class BatchCli:
+    """Headless entry point that shares one warmed-up pipeline across all inputs"""
+
+    def __init__(self, args: argparse.Namespace, writer: JsonLinesWriter):
+        self.args = args
+        self.writer = writer
+
+        self.matcher_config_path = args.matcher_config or matcher_config_path(args.features_cache)
+        self.matcher_config = load_matcher_config(self.matcher_config_path)
+        self.feature_extractor, self.matcher = create_components(self.matcher_config)
+        self.image_repository = FileImageRepository(book_movie_path=args.books)
+        self.video_repository = FileVideoRepository(args.trailers)
+        self.feature_store = open_feature_store(args.features_cache, self.matcher_config.extractor_signature)
+
+        self.book_movie_use_case = FindMatchingBookMovieUseCase(
+            feature_extractor=self.feature_extractor,
+            matcher=self.matcher,
+            image_repository=self.image_repository,
+            overlay_cache=FileOverlayCache(max_bytes=int(getattr(args, "overlay_cache_mb", 256) * 1024 ** 2))
+        )
+        self.catalog = CatalogIndex(
+            self.feature_extractor, self.matcher, self.image_repository, self.feature_store,
+            batch_extractor=ProcessPoolFeatureExtractor(self.matcher_config, args.workers)
+        )
+        self.batcher: Optional[MatchBatcher] = None
+
+    def run(self) -> int:
+        return getattr(self, f"run_{self.args.command}")()
+
+    def run_index(self) -> int:
+        start = time.perf_counter()
+        self.catalog.build(refresh=self.args.rebuild)
+        elapsed = time.perf_counter() - start
+
+        covers = len(self.catalog.live_covers)
+        self.writer.write({
+            "command": "index",
+            "covers": covers,
+            "seconds": elapsed,
+            "covers_per_second": covers / elapsed if elapsed > 0 else None,
+            "extracted": self.catalog.last_build["extracted"],
+            "extraction_covers_per_second": self.catalog.last_build["extraction_covers_per_second"],
+            "workers": self.args.workers,
+            "features_cache": str(self.feature_store.cache_path)
+        })
+        return 0
+
+    def run_match(self) -> int:
+        inputs = expand_inputs(self.args.inputs, IMAGE_EXTENSIONS)
+        if not inputs:
+            print("❌ No input images found", file=sys.stderr)
+            return 1
+
+        self.catalog.build()
+        if self.args.batch_size > 1:
+            self.batcher = MatchBatcher(self.catalog, self.args.batch_size, self.args.batch_wait_ms)
+        try:
+            with ThreadPoolExecutor(max_workers=self.args.workers) as executor:
+                for input_path, results in zip(inputs, executor.map(self._match_one, inputs)):
+                    for rank, result in enumerate(results, start=1):
+                        self.writer.write({"input": input_path, "rank": rank, **result.to_dict()})
+        finally:
+            if self.batcher:
+                self.batcher.close()
+        if self.args.overlay:
+            print(f"🗃️ Overlay cache: {self.book_movie_use_case.overlay_cache.stats()}", file=sys.stderr)
+        return 0
+
+    def run_replace(self) -> int:
+        videos = expand_inputs(self.args.inputs, VIDEO_EXTENSIONS)
+        if not videos:
+            print("❌ No input videos found", file=sys.stderr)
+            return 1
+
+        smoothing = None if self.args.no_smoothing else self.args.smoothing
+        track_analyzer = None
+        if self.args.two_pass:
+            track_analyzer = HomographyTrackAnalyzer(
+                self.book_movie_use_case,
+                detect_every=self.args.detect_every,
+                smoothing=smoothing,
+                keyframe_mode=self.args.keyframes,
+                max_workers=self.args.frame_workers,
+                extractor_signature=self.matcher_config.extractor_signature,
+                sidecar_dir=self.args.track_dir
+            )
+
+        processor_class = AsyncFrameProcessor if self.args.processor == "async" else ParallelFrameProcessor
+        frame_processor = processor_class(
+            self.book_movie_use_case,
+            max_workers=self.args.frame_workers,
+            smoothing=smoothing,
+            detect_every=self.args.detect_every,
+            track_analyzer=track_analyzer,
+            memory_budget=int(self.args.memory_budget_mb * 2 ** 20)
+        )
+
+        video_use_case = ProcessInputVideoUseCase(
+            feature_extractor=self.feature_extractor,
+            matcher=self.matcher,
+            image_repository=self.image_repository,
+            video_repository=self.video_repository,
+            frame_processor=frame_processor,
+            min_conf=self.args.min_conf,
+            segment_frames=self.args.segment_frames,
+            segment_workers=self.args.segment_workers
+        )
+
+        def replace_one(video_path: str):
+            output_path = None
+            if self.args.output_dir:
+                Path(self.args.output_dir).mkdir(parents=True, exist_ok=True)
+                output_path = str(Path(self.args.output_dir) / f"{Path(video_path).stem}_replaced.mp4")
+            return video_use_case.execute(video_path, output_path=output_path, alpha=self.args.alpha)
+
+        failures = 0
+        with ThreadPoolExecutor(max_workers=self.args.workers) as executor:
+            for video_path, result in zip(videos, executor.map(replace_one, videos)):
+                failures += 0 if result.success else 1
+                self.writer.write({"input": video_path, **result.to_dict()})
+        return 1 if failures else 0
+
+    def run_bench(self) -> int:
+        inputs = expand_inputs(self.args.inputs, IMAGE_EXTENSIONS)
+        if not inputs:
+            print("❌ No input images found", file=sys.stderr)
+            return 1
+
+        start = time.perf_counter()
+        self.catalog.build()
+        index_seconds = time.perf_counter() - start
+
+        images = [(Path(p).stem, cv2.imread(p)) for p in inputs]
+        queries = [(name, image) for name, image in images if image is not None] * self.args.repeat
+        if self.args.skip_extraction:
+            # Time catalog matching alone; extraction dominates end-to-end latency
+            queries = [(name, self.feature_extractor.extract_features(image)) for name, image in queries]
+
+        for batch_size in self.args.batch_sizes:
+            # Without batching the wait window is meaningless, measure it once
+            waits = self.args.batch_waits_ms if batch_size > 1 else [0.0]
+            for wait_ms in waits:
+                record = self._bench_setting(queries, batch_size, wait_ms)
+                record["index_build_seconds"] = index_seconds
+                self.writer.write(record)
+        return 0
+
+    def _bench_setting(self, queries: list, batch_size: int, wait_ms: float) -> dict:
+        """Measure throughput and latency percentiles for one batching setting"""
+        batcher = MatchBatcher(self.catalog, batch_size, wait_ms) if batch_size > 1 else None
+
+        def timed_match(query):
+            name, data = query
+            t0 = time.perf_counter()
+            feature = data if self.args.skip_extraction else self.feature_extractor.extract_features(data)
+            if batcher:
+                batcher.match(feature, name, self.args.top_k)
+            else:
+                self.catalog.match_features(feature, name, self.args.top_k)
+            return time.perf_counter() - t0
+
+        try:
+            wall_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.args.workers) as executor:
+                latencies = np.array(list(executor.map(timed_match, queries))) * 1000
+            wall = time.perf_counter() - wall_start
+        finally:
+            if batcher:
+                batcher.close()
+
+        return {
+            "command": "bench",
+            "covers": len(self.catalog.covers),
+            "queries": len(queries),
+            "workers": self.args.workers,
+            "batch_size": batch_size,
+            "batch_wait_ms": wait_ms,
+            "mean_batch_size": batcher.mean_batch_size if batcher else 1.0,
+            "skip_extraction": self.args.skip_extraction,
+            "wall_seconds": wall,
+            "throughput_qps": len(queries) / wall if wall > 0 else None,
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "p99_ms": float(np.percentile(latencies, 99))
+        }
+
+    def run_suite(self) -> int:
+        """Synthetic end-to-end benchmark, optionally checked against a saved baseline"""
+        fixtures = SyntheticFixtureGenerator(
+            self.image_repository, self.args.fixtures_dir, seed=self.args.seed, max_covers=self.args.max_covers
+        )
+        suite = BenchmarkSuite(
+            self.feature_extractor, self.matcher, self.image_repository, fixtures,
+            resolutions=self.args.resolutions,
+            worker_counts=self.args.frame_workers,
+            video_frames=self.args.frames,
+            images_per_cover=self.args.images_per_cover,
+            repeat=self.args.repeat,
+            case_groups=self.args.cases
+        )
+        results = suite.run()
+        BenchmarkSuite.save(results, self.args.results)
+
+        baseline = None if self.args.update_baseline else BenchmarkSuite.load(self.args.baseline)
+        comparison = {row["case"]: row for row in BenchmarkSuite.compare(results, baseline, self.args.tolerance)} \
+            if baseline else {}
+
+        for case, metrics in results["cases"].items():
+            self.writer.write({"command": "suite", "case": case, **metrics, **comparison.get(case, {})})
+
+        if self.args.update_baseline or baseline is None:
+            BenchmarkSuite.save(results, self.args.baseline)
+            print(f"📌 Baseline written to {self.args.baseline}")
+            return 0
+
+        regressed = [row["case"] for row in comparison.values() if row["status"] == "regressed"]
+        if regressed:
+            print(f"❌ Regressions against {self.args.baseline}: {', '.join(regressed)}")
+        return 1 if regressed else 0
+
+    def run_evaluate(self) -> int:
+        """Accuracy-vs-speed sweep over extractor/matcher settings"""
+        queries = self._labeled_queries()
+        if not queries:
+            print("❌ No labeled queries", file=sys.stderr)
+            return 1
+
+        if self.args.configs:
+            with open(self.args.configs, 'r', encoding='utf-8') as f:
+                configs = [MatcherConfig.from_dict(c) for c in json.load(f)]
+        else:
+            configs = default_sweep()
+
+        evaluation = AccuracyEvaluation(self.image_repository, queries, create_components, self.args.top_k)
+        rows = evaluation.run(configs)
+        for row in rows:
+            self.writer.write({"command": "evaluate", **row})
+        print(AccuracyEvaluation.format_table(rows, self.args.top_k))
+        return 0
+
+    def run_tune(self) -> int:
+        """Pick FLANN settings for this catalog within a latency budget and save them"""
+        queries = self._labeled_queries()
+        if self.args.sample and len(queries) > self.args.sample:
+            rng = np.random.default_rng(self.args.seed)
+            queries = [queries[i] for i in sorted(rng.choice(len(queries), self.args.sample, replace=False))]
+        if not queries:
+            print("❌ No labeled queries", file=sys.stderr)
+            return 1
+
+        tuner = MatcherAutoTuner(
+            self.image_repository, queries, create_components,
+            latency_budget_ms=self.args.latency_budget_ms, percentile=self.args.percentile
+        )
+        chosen, rows = tuner.tune(default_search_space(self.matcher_config))
+        for row in rows:
+            self.writer.write({"command": "tune", **row})
+
+        if not self.args.dry_run:
+            save_matcher_config(chosen, self.matcher_config_path)
+            print(f"💾 Saved {chosen.name} to {self.matcher_config_path}")
+        self.writer.write({"command": "tune", "chosen": chosen.to_dict(),
+                           "saved_to": None if self.args.dry_run else str(self.matcher_config_path)})
+        return 0
+
+    def _labeled_queries(self) -> list:
+        queries = load_labeled_queries(self.args.labels) if self.args.labels else []
+        if self.args.synthetic_per_cover:
+            fixtures = SyntheticFixtureGenerator(self.image_repository, self.args.fixtures_dir, seed=self.args.seed)
+            queries += synthetic_queries(fixtures.cover_photos(self.args.synthetic_per_cover))
+        return queries
+
+    def run_serve(self) -> int:
+        # Imported here so the batch commands do not pull in the HTTP stack
+        from src.presentation.http.server import RecognitionService, create_server
+
+        service = RecognitionService(
+            books_path=self.args.books,
+            features_cache=self.args.features_cache,
+            max_batch_size=self.args.batch_size,
+            max_wait_ms=self.args.batch_wait_ms,
+            matcher_config=self.matcher_config,
+            watch_catalog=self.args.watch_catalog,
+            poll_interval=self.args.poll_interval,
+            build_workers=self.args.workers
+        )
+        server = create_server(service, self.args.host, self.args.port)
+        host, port = server.server_address[:2]
+        print(f"🌐 Recognition service listening on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+        return 0
+
+    def _match_one(self, input_path: str) -> List[MatchResult]:
+        with tracer.capture() as breakdown:
+            results = self._match_one_traced(input_path)
+        if tracer.enabled:
+            for result in results:
+                result.stage_timings = breakdown.to_dict()
+        return results
+
+    def _match_one_traced(self, input_path: str) -> List[MatchResult]:
+        with tracer.span("decode"):
+            image = cv2.imread(input_path)
+        name = Path(input_path).stem
+        if image is None:
+            return [MatchResult(
+                source_name=name,
+                target_name="error",
+                matches=[],
+                confidence_score=0.0,
+                good_matches_count=0,
+                error_message=f"Cannot load input image: {input_path}"
+            )]
+
+        if self.batcher:
+            feature = self.feature_extractor.extract_features(image)
+            results = self.batcher.match(feature, name, self.args.top_k)
+        else:
+            results = self.catalog.match_image(image, name, self.args.top_k)
+
+        # Overlay only the best match, as the GUI does for its saved result
+        if self.args.overlay and results:
+            try:
+                # The catalog match already carries both keypoint sets: no re-decoding or re-extraction
+                cover = next(c for c in self.catalog.live_covers if c.image_path == results[0].target_image_path)
+                self.book_movie_use_case.render_overlay(image, input_path, cover, results[0])
+            except Exception as e:
+                results[0].error_message = f"Overlay failed: {e!r}"
+        return results
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def _resolution_list(value: str) -> List[tuple]:
+    return [tuple(int(n) for n in v.lower().split("x")) for v in value.split(",") if v.strip()]
+
+
+def _str_list(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--books", default="data/book_images", help="Folder of catalog book covers")
+    common.add_argument("--trailers", default="data/trailers", help="Folder of trailer videos")
+    common.add_argument("--features-cache", default="data/cache/catalog/features.bin",
+                        help="Catalog feature cache file (.npz keeps the per-process format)")
+    common.add_argument("--matcher-config",
+                        help="Matcher settings JSON (default: matcher_config.json next to the feature cache)")
+    common.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Worker pool size")
+    common.add_argument("--trace", metavar="PATH", help="Write per-stage latency histograms as JSON")
+    common.add_argument("--chrome-trace", metavar="PATH",
+                        help="Write every traced span in Chrome trace format (chrome://tracing, Perfetto)")
+    common.add_argument("--output", "-o", help="Write JSON Lines here instead of stdout")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Headless book cover recognition and video replacement"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    index = sub.add_parser("index", parents=[common], help="Extract and cache catalog features")
+    index.add_argument("--rebuild", action="store_true", help="Ignore cached features")
+
+    match = sub.add_parser("match", parents=[common], help="Match images against the catalog")
+    match.add_argument("inputs", nargs="+", help="Image files, directories or glob patterns")
+    match.add_argument("--top-k", type=int, default=5, help="Ranked matches to report per input")
+    match.add_argument("--overlay", action="store_true", help="Render an overlay for the best match")
+    match.add_argument("--overlay-cache-mb", type=float, default=256,
+                       help="Size bound of the content-addressed overlay cache (data/cache/overlays)")
+    match.add_argument("--batch-size", type=int, default=1,
+                       help="Max concurrent inputs sharing one kNN search (1 disables batching)")
+    match.add_argument("--batch-wait-ms", type=float, default=5.0, help="Max time an input waits for a batch")
+
+    replace = sub.add_parser("replace", parents=[common], help="Replace detected books in videos with trailers")
+    replace.add_argument("inputs", nargs="+", help="Video files, directories or glob patterns")
+    replace.add_argument("--processor", choices=["parallel", "async"], default="parallel")
+    replace.add_argument("--frame-workers", type=int, default=4, help="Threads per video")
+    replace.add_argument("--alpha", type=float, default=0.7)
+    replace.add_argument("--min-conf", type=float, default=5.0)
+    replace.add_argument("--segment-frames", type=int, default=None,
+                         help="Render in resumable segments of this many frames")
+    replace.add_argument("--segment-workers", type=int, default=1,
+                         help="Segments rendered at once; with one, each segment continues the previous one's tracking")
+    replace.add_argument("--smoothing", type=float, default=0.6,
+                         help="Weight of each new homography estimate in the temporal filter (1.0 = no smoothing)")
+    replace.add_argument("--no-smoothing", action="store_true",
+                         help="Use raw per-frame homographies without filtering or outlier rejection")
+    replace.add_argument("--detect-every", type=int, default=1,
+                         help="Run full matching on every Kth frame and interpolate the rest")
+    replace.add_argument("--two-pass", action="store_true",
+                         help="Analyze the video into a homography track first (saved next to it as "
+                              "<video>.track.npz), then only composite; re-renders reuse the detection and track")
+    replace.add_argument("--track-dir", default=None,
+                         help="Folder for two-pass tracks instead of next to each video")
+    replace.add_argument("--keyframes", choices=["interval", "iframes"], default="interval",
+                         help="Two-pass keyframes: every --detect-every frames, or the encoder's I-frames (needs ffprobe)")
+    replace.add_argument("--memory-budget-mb", type=float, default=512,
+                         help="Frame memory a render may hold (trailer plus frames in flight); "
+                              "queue depths are derived from it and the video resolution")
+    replace.add_argument("--output-dir", help="Folder for rendered videos (default data/output_videos)")
+
+    bench = sub.add_parser("bench", parents=[common], help="Measure catalog matching latency")
+    bench.add_argument("inputs", nargs="+", help="Image files, directories or glob patterns")
+    bench.add_argument("--repeat", type=int, default=3, help="Times each input is queried")
+    bench.add_argument("--top-k", type=int, default=5)
+    bench.add_argument("--batch-sizes", type=_int_list, default=[1],
+                       help="Comma-separated max batch sizes to compare, e.g. 1,4,16")
+    bench.add_argument("--batch-waits-ms", type=_float_list, default=[5.0],
+                       help="Comma-separated batch wait windows to compare, e.g. 0,2,10")
+    bench.add_argument("--skip-extraction", action="store_true",
+                       help="Extract query features up front and time catalog matching only")
+
+    suite = sub.add_parser("suite", parents=[common],
+                           help="Benchmark matching, detection and frame processors on synthetic fixtures")
+    suite.add_argument("--resolutions", type=_resolution_list, default=[(640, 360), (1280, 720)],
+                       help="Comma-separated video sizes, e.g. 640x360,1280x720")
+    suite.add_argument("--frame-workers", type=_int_list, default=[1, 2, 4],
+                       help="Comma-separated frame processor worker counts")
+    suite.add_argument("--frames", type=int, default=48, help="Frames per synthetic video")
+    suite.add_argument("--images-per-cover", type=int, default=2, help="Synthetic photos per catalog cover")
+    suite.add_argument("--max-covers", type=int, default=None, help="Build fixtures from the first N covers only")
+    suite.add_argument("--cases", type=_str_list, default=["catalog", "detection", "processor"],
+                       help="Comma-separated case groups: catalog, detection, processor")
+    suite.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is reported")
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--fixtures-dir", default="data/benchmarks/fixtures")
+    suite.add_argument("--results", default="data/benchmarks/latest.json", help="Where this run is saved")
+    suite.add_argument("--baseline", default="data/benchmarks/baseline.json",
+                       help="Run to compare against; written on first use")
+    suite.add_argument("--update-baseline", action="store_true", help="Replace the baseline with this run")
+    suite.add_argument("--tolerance", type=float, default=0.25,
+                       help="Allowed slowdown before a timing counts as a regression (0.25 = 25%%)")
+
+    evaluate = sub.add_parser("evaluate", parents=[common],
+                              help="Accuracy vs speed of extractor/matcher settings on labeled queries")
+    evaluate.add_argument("--labels", default="data/input_image_labels.json",
+                          help="JSON mapping input image names to expected covers ('' to skip)")
+    evaluate.add_argument("--synthetic-per-cover", type=int, default=2,
+                          help="Synthetic warped photos per cover, with ground-truth corners")
+    evaluate.add_argument("--configs", help="JSON list of settings; default sweeps the usual speed knobs")
+    evaluate.add_argument("--top-k", type=int, default=5)
+    evaluate.add_argument("--seed", type=int, default=0)
+    evaluate.add_argument("--fixtures-dir", default="data/benchmarks/fixtures")
+
+    tune = sub.add_parser("tune", parents=[common],
+                          help="Choose FLANN index type, trees and checks for the catalog within a latency budget")
+    tune.add_argument("--latency-budget-ms", type=float, default=250.0,
+                      help="Per-query budget for extraction plus matching")
+    tune.add_argument("--percentile", type=float, default=95.0, help="Latency percentile held to the budget")
+    tune.add_argument("--labels", default="data/input_image_labels.json",
+                      help="JSON mapping input image names to expected covers ('' to skip)")
+    tune.add_argument("--synthetic-per-cover", type=int, default=1, help="Synthetic warped photos per cover")
+    tune.add_argument("--sample", type=int, default=24, help="Max queries timed per candidate")
+    tune.add_argument("--seed", type=int, default=0)
+    tune.add_argument("--fixtures-dir", default="data/benchmarks/fixtures")
+    tune.add_argument("--dry-run", action="store_true", help="Report only, do not save the chosen settings")
+
+    serve = sub.add_parser("serve", parents=[common], help="Run the local HTTP recognition service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--batch-size", type=int, default=16, help="Max queries sharing one kNN search")
+    serve.add_argument("--batch-wait-ms", type=float, default=5.0, help="Max time a query waits for a batch")
+    serve.add_argument("--watch-catalog", action="store_true",
+                       help="Pick up added, changed and removed covers without a restart")
+    serve.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between catalog scans")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # Tracing is off unless asked for, so spans cost nothing in normal runs
+    if args.trace or args.chrome_trace:
+        tracer.enable(keep_events=bool(args.chrome_trace))
+
+    out_stream = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = JsonLinesWriter(out_stream)
+        # Pipeline progress messages go to stderr so stdout stays valid JSON Lines
+        with contextlib.redirect_stdout(sys.stderr):
+            return BatchCli(args, writer).run()
+    finally:
+        if args.output:
+            out_stream.close()
+        if args.trace:
+            tracer.export_json(args.trace)
+        if args.chrome_trace:
+            tracer.export_chrome_trace(args.chrome_trace)
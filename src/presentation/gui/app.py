@@ -2,27 +2,32 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from pathlib import Path
 import shutil
-from src.application.use_cases import AsyncFrameProcessor
+from src.application.jobs import CancellationToken, JobCancelled
+from src.application.use_cases import AsyncFrameProcessor, HomographyTrackAnalyzer
 from src.domain.entities.match_result import MatchResult
 from .components import (
     ScrollableFrame,
     ImageSelector,
     VideoSelector,
     ProgressDialog,
+    PreviewWindow,
     ResultsDisplay
 )
+from .job_executor import JobExecutor
 from src.application.use_cases.image_processing import FindMatchingBookMovieUseCase, OverlayBookCoverUseCase
-from src.application.use_cases.video_processing import ProcessInputVideoUseCase
-from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
-from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.application.use_cases.video_processing import ProcessInputVideoUseCase, VideoPreviewUseCase
+from src.infrastructure.matchers.matcher_factory import create_components, load_matcher_config, matcher_config_path
+from src.infrastructure.repositories.file_overlay_cache import FileOverlayCache
+from src.infrastructure.repositories.file_thumbnail_cache import FileThumbnailCache
 from src.infrastructure.repositories.file_image_repository import FileImageRepository
 from src.infrastructure.repositories.file_video_repository import FileVideoRepository
 from ttkthemes import ThemedTk
 import os
-import threading
 
 
 class BookCoverRecognitionApp(ThemedTk):
+    TRACK_CACHE_DIR = "data/cache/tracks"
+
     def __init__(self):
         super().__init__(theme="arc")
         self.title("سیستم تشخیص جلد کتاب و فیلم با بینایی کامپیوتر")
@@ -30,20 +35,29 @@ class BookCoverRecognitionApp(ThemedTk):
         self.geometry("1080x720")
         self.option_add("*Font", "Tahoma 10")
 
+        # Shared pool for all background work; callbacks come back on the Tk loop
+        self.jobs = JobExecutor(self, max_workers=os.cpu_count() or 4)
+
         self.setup_use_cases()
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def setup_use_cases(self):
-        self.feature_extractor = SIFTExtractor()
-        self.matcher = FLANNMatcher()
+        # Settings saved by `python -m src.cli tune`, defaults otherwise
+        self.matcher_config = load_matcher_config(matcher_config_path("data/cache/catalog/features.bin"))
+        self.feature_extractor, self.matcher = create_components(self.matcher_config)
         self.image_repository = FileImageRepository()
         self.video_repository = FileVideoRepository()
 
+        self.overlay_cache = FileOverlayCache()
+        self.thumbnail_cache = FileThumbnailCache()
+
         # Image processing use cases
         self.book_movie_use_case = FindMatchingBookMovieUseCase(
             feature_extractor=self.feature_extractor,
             matcher=self.matcher,
-            image_repository=self.image_repository
+            image_repository=self.image_repository,
+            overlay_cache=self.overlay_cache
         )
         self.overlay_use_case = OverlayBookCoverUseCase(
             feature_extractor=self.feature_extractor,
@@ -52,9 +66,34 @@ class BookCoverRecognitionApp(ThemedTk):
 
         self.frame_processor_async = AsyncFrameProcessor(self.book_movie_use_case, max_workers=6)
 
+        # Opt-in two-pass rendering: every frame is still matched, the stored analysis makes
+        # re-renders with another alpha instant. Tracks go to the cache, not the input folder.
+        self.track_analyzer = HomographyTrackAnalyzer(
+            self.book_movie_use_case,
+            detect_every=1,
+            max_workers=6,
+            extractor_signature=self.matcher_config.extractor_signature,
+            sidecar_dir=self.TRACK_CACHE_DIR
+        )
+        self.frame_processor_two_pass = AsyncFrameProcessor(
+            self.book_movie_use_case, max_workers=6, track_analyzer=self.track_analyzer
+        )
+
         # Video processing use case (init on demand)
         self.video_use_case = None
 
+        # Preview keeps its detection cache between renders
+        self.preview_use_case = VideoPreviewUseCase(
+            feature_extractor=self.feature_extractor,
+            matcher=self.matcher,
+            image_repository=self.image_repository,
+            video_repository=self.video_repository,
+            frame_processor=self.frame_processor_async
+        )
+        self.preview_window = None
+        self.preview_job = None
+        self._preview_video = None
+
     def create_widgets(self):
         root_scroll = ScrollableFrame(self)
         root_scroll.pack(fill=tk.BOTH, expand=True)
@@ -92,6 +131,8 @@ class BookCoverRecognitionApp(ThemedTk):
 
         # Parameter controls
         self.min_conf_var = tk.DoubleVar(value=5.0)
+        self.alpha_var = tk.DoubleVar(value=0.7)
+        self.two_pass_var = tk.BooleanVar(value=False)
 
         self._build_spinbox(
             settings, "Min Confidence:", self.min_conf_var,
@@ -99,6 +140,13 @@ class BookCoverRecognitionApp(ThemedTk):
             hint="حداقل مقدار confidence برای تشخیص کتاب"
         )
 
+        ttk.Checkbutton(settings, text="رندر دومرحله‌ای", variable=self.two_pass_var) \
+            .pack(anchor=tk.E, pady=5)
+        ttk.Label(
+            settings, text=f"تحلیل ویدیو در {self.TRACK_CACHE_DIR} ذخیره می‌شود و رندر دوباره با alpha دیگر فوری است",
+            font=("Tahoma", 8), foreground="gray"
+        ).pack(fill=tk.X)
+
         # Action buttons
         actions = ttk.Frame(container)
         actions.grid(row=1, column=0, sticky="ew", padx=20, pady=10)
@@ -118,6 +166,9 @@ class BookCoverRecognitionApp(ThemedTk):
         )
         self.process_vid_btn.pack(side=tk.RIGHT, padx=5)
 
+        ttk.Button(actions, text="پیش‌نمایش ویدئو", command=self.start_video_preview) \
+            .pack(side=tk.RIGHT, padx=5)
+
         ttk.Button(actions, text="پاک کردن نتایج", command=self.clear_results) \
             .pack(side=tk.RIGHT, padx=5)
 
@@ -128,7 +179,7 @@ class BookCoverRecognitionApp(ThemedTk):
         ).pack(side=tk.RIGHT, padx=5)
 
         # Results display
-        self.result_display = ResultsDisplay(container)
+        self.result_display = ResultsDisplay(container, self.thumbnail_cache, self.jobs)
         self.result_display.grid(row=2, column=0, sticky="nsew", padx=20, pady=(0, 20))
         container.rowconfigure(2, weight=1)
 
@@ -170,17 +221,13 @@ class BookCoverRecognitionApp(ThemedTk):
             .pack(fill=tk.X)
 
     def clear_overlay_cache(self):
-        """Clear overlay images cache directory"""
+        """Clear overlay images and thumbnail caches"""
         try:
-            cache_dir = Path("data/cache/input_images_overlay_results")
+            cache_dir = self.overlay_cache.cache_dir
 
+            self.thumbnail_cache.clear()
             if cache_dir.exists():
-                # Remove all files and subdirectories
-                shutil.rmtree(cache_dir)
-
-                # Recreate the empty directory
-                cache_dir.mkdir(parents=True, exist_ok=True)
-
+                self.overlay_cache.clear()
                 messagebox.showinfo("تکمیل", f"کش تصاویر پاک شد\nمسیر: {cache_dir}")
             else:
                 messagebox.showinfo("اطلاعات", f"پوشه کش وجود ندارد\nمسیر: {cache_dir}")
@@ -195,32 +242,55 @@ class BookCoverRecognitionApp(ThemedTk):
             messagebox.showwarning("خطا", "لطفاً تصویر و تصاویر کتاب/فیلم را انتخاب کنید")
             return
         self.process_img_btn.config(state='disabled')
-        threading.Thread(
-            target=self._process_images,
-            args=(imgs[0], books),
-            daemon=True
-        ).start()
+        self._process_images(imgs[0], books)
 
     def _process_images(self, img_path, book_paths):
-        self.after(0, self.show_progress_dialog)
+        """Compare against every book as concurrent jobs sharing one cancellation token"""
+        token = CancellationToken()
+        self.show_progress_dialog(on_cancel=token.cancel)
         results = []
         total = len(book_paths)
-        for idx, book_path in enumerate(book_paths, start=1):
-            # update progress UI
-            self.after(
-                0,
-                lambda c=idx,
-                       t=total,
-                       p=book_path: self.update_progress(c, t, f"Processing {os.path.basename(p)}")
+        finished = [0]
+
+        def compare(book_path):
+            def run(job_token, report):
+                job_token.raise_if_cancelled()
+                # compare and optionally overlay
+                return self.book_movie_use_case.execute_single_comparison_with_overlay(
+                    input_image_path=img_path,
+                    book_image_path=book_path,
+                    enable_overlay=True
+                )
+            return run
+
+        def on_finished(book_path, match=None):
+            if match is not None:
+                results.append(match)
+            finished[0] += 1
+            self.update_progress(finished[0], total, f"Processed {os.path.basename(book_path)}")
+            if finished[0] == total:
+                self._finish_image_processing(img_path, results, token)
+
+        def on_error(book_path, error):
+            if not isinstance(error, JobCancelled):
+                print(f"❌ Comparison failed for {os.path.basename(book_path)}: {error}")
+            on_finished(book_path)
+
+        for book_path in book_paths:
+            self.jobs.submit(
+                compare(book_path),
+                on_done=lambda match, p=book_path: on_finished(p, match),
+                on_error=lambda error, p=book_path: on_error(p, error),
+                token=token,
+                name=os.path.basename(book_path)
             )
 
-            # compare and optionally overlay
-            match = self.book_movie_use_case.execute_single_comparison_with_overlay(
-                input_image_path=img_path,
-                book_image_path=book_path,
-                enable_overlay=True
-            )
-            results.append(match)
+    def _finish_image_processing(self, img_path, results, token):
+        self.close_progress_dialog()
+        if token.is_cancelled:
+            self.process_img_btn.config(state='normal')
+            messagebox.showinfo("لغو", "تشخیص تصویر لغو شد")
+            return
 
         # sort matches by confidence descending
         results.sort(key=lambda r: r.confidence_score, reverse=True)
@@ -230,8 +300,7 @@ class BookCoverRecognitionApp(ThemedTk):
             self._save_best_result_image(results[0])
 
         # display results including overlay if any
-        self.after(0, lambda: self.show_results(img_path, results))
-        self.after(0, self.close_progress_dialog)
+        self.show_results(img_path, results)
 
     def _save_best_result_image(self, best_result: MatchResult):
         """
@@ -270,28 +339,36 @@ class BookCoverRecognitionApp(ThemedTk):
             matcher=self.matcher,
             image_repository=self.image_repository,
             video_repository=self.video_repository,
-            frame_processor=self.frame_processor_async,
+            frame_processor=self.frame_processor_two_pass if self.two_pass_var.get() else self.frame_processor_async,
             min_conf=self.min_conf_var.get()
         )
 
         self.process_vid_btn.config(state='disabled')
-        threading.Thread(
-            target=self._process_video,
-            args=(os.path.basename(vids[0]),),
-            daemon=True
-        ).start()
+        self._process_video(os.path.basename(vids[0]))
 
     def _process_video(self, video_name):
-        self.after(0, self.show_progress_dialog)
-
-        def progress(msg, pct):
-            self.after(0, lambda: self.update_progress(0, 0, msg))
+        use_case = self.video_use_case
+        alpha = round(self.alpha_var.get(), 2)
+
+        def run(token, report):
+            return use_case.execute(
+                input_video_name=video_name,
+                alpha=alpha,
+                progress_callback=report,
+                cancel_token=token
+            )
 
-        result = self.video_use_case.execute(
-            input_video_name=video_name,
-            progress_callback=progress
+        job = self.jobs.submit(
+            run,
+            on_progress=lambda msg, pct: self.set_progress_percent(pct, msg),
+            on_done=lambda result: self._on_video_done(result, job.token),
+            on_error=self._on_video_error,
+            name=video_name
         )
-        self.after(0, self.close_progress_dialog)
+        self.show_progress_dialog(on_cancel=job.cancel)
+
+    def _on_video_done(self, result, token):
+        self.close_progress_dialog()
         # Display video processing result
         if result.success:
             messagebox.showinfo(
@@ -302,29 +379,100 @@ class BookCoverRecognitionApp(ThemedTk):
                 f"⏱ زمان: {result.processing_time_seconds:.1f}s\n"
                 f"💾 خروجی: {result.output_video_path}"
             )
+        elif token.is_cancelled:
+            messagebox.showinfo("لغو", "پردازش ویدئو لغو شد")
         else:
             messagebox.showerror("خطا", result.error_message)
 
         self.process_vid_btn.config(state='normal')
 
-    def show_progress_dialog(self):
-        self.progress_dialog = ProgressDialog(self, "در حال پردازش")
+    def _on_video_error(self, error):
+        self.close_progress_dialog()
+        if isinstance(error, JobCancelled):
+            messagebox.showinfo("لغو", "پردازش ویدئو لغو شد")
+        else:
+            messagebox.showerror("خطا", str(error))
+        self.process_vid_btn.config(state='normal')
+
+    def start_video_preview(self):
+        vids = self.video_selector.selected_paths
+        if not vids:
+            messagebox.showwarning("خطا", "لطفاً ویدئو را انتخاب کنید")
+            return
+        video_name = os.path.basename(vids[0])
+        if self.preview_window is None:
+            self.preview_window = PreviewWindow(
+                self,
+                on_render=lambda alpha: self._render_preview(self._preview_video, alpha),
+                alpha_var=self.alpha_var,
+                on_close=self._close_preview
+            )
+        self._preview_video = video_name
+        self.preview_window.render()
+
+    def _render_preview(self, video_name, alpha):
+        """Render a low-res preview, replacing any preview still running"""
+        if self.preview_job is not None:
+            self.preview_job.cancel()
+        window = self.preview_window
+        min_conf = self.min_conf_var.get()
+        use_case = self.preview_use_case
+
+        def run(token, report):
+            return use_case.render(
+                video_name, alpha=alpha, min_conf=min_conf, cancel_token=token,
+                frame_callback=lambda frame, idx, pct: report(frame, f"فریم {idx} – {pct:.0f}%")
+            )
+
+        def on_done(result):
+            if result.success:
+                window.set_status(f"📖 {result.target_book_name} – {result.replaced_frames_count} فریم در "
+                                  f"{result.processing_time_seconds:.1f}s")
+            else:
+                window.set_status(f"خطا: {result.error_message}")
+
+        def on_error(error):
+            if not isinstance(error, JobCancelled):
+                window.set_status(f"خطا: {error}")
+
+        window.set_status("در حال آماده‌سازی پیش‌نمایش...")
+        self.preview_job = self.jobs.submit(
+            run,
+            on_progress=window.show_frame,
+            on_done=on_done,
+            on_error=on_error,
+            name=f"preview:{video_name}"
+        )
+
+    def _close_preview(self):
+        if self.preview_job is not None:
+            self.preview_job.cancel()
+            self.preview_job = None
+        self.preview_window = None
+
+    def show_progress_dialog(self, on_cancel=None):
+        self.progress_dialog = ProgressDialog(self, "در حال پردازش", on_cancel=on_cancel)
 
     def update_progress(self, current, total, status):
         if hasattr(self, 'progress_dialog'):
             self.progress_dialog.update_progress(current, total, status)
 
+    def set_progress_percent(self, percent, status):
+        if hasattr(self, 'progress_dialog'):
+            self.progress_dialog.set_percent(percent, status)
+
     def close_progress_dialog(self):
         if hasattr(self, 'progress_dialog'):
             self.progress_dialog.close()
             del self.progress_dialog
 
-    def show_results(self, input_path, results, max_results=5):
+    def show_results(self, input_path, results, max_results=None):
         self.result_display.clear_results()
         if not results:
             messagebox.showinfo("نتیجه", "هیچ تطبیقی یافت نشد")
         else:
-            min_res = results[:min(len(results), max_results)]
+            # The result list is virtualized, so every match can be listed
+            min_res = results[:max_results] if max_results else results
             for rank, res in enumerate(min_res, start=1):
                 self.result_display.add_result(
                     input_path=input_path,
@@ -346,6 +494,10 @@ class BookCoverRecognitionApp(ThemedTk):
         self.process_vid_btn.config(state='normal')
         self.video_use_case = None
 
+    def _on_close(self):
+        self.jobs.shutdown()
+        self.destroy()
+
 
 if __name__ == "__main__":
     app = BookCoverRecognitionApp()
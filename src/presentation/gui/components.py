@@ -107,10 +107,11 @@ class ImageSelector(ttk.Frame):
 
 
 class ProgressDialog:
-    def __init__(self, parent, title="در حال پردازش..."):
+    def __init__(self, parent, title="در حال پردازش...", on_cancel=None):
+        self.on_cancel = on_cancel
         self.window = tk.Toplevel(parent)
         self.window.title(title)
-        self.window.geometry("400x150")
+        self.window.geometry("400x190" if on_cancel else "400x150")
         self.window.resizable(False, False)
         self.window.transient(parent)
         self.window.grab_set()
@@ -135,34 +136,127 @@ class ProgressDialog:
         self.percent_label = ttk.Label(main_frame, text="0%", font=("Tahoma", 9))
         self.percent_label.pack(pady=5)
 
+        if self.on_cancel:
+            self.cancel_btn = ttk.Button(main_frame, text="لغو", command=self._cancel)
+            self.cancel_btn.pack(pady=5)
+            self.window.protocol("WM_DELETE_WINDOW", self._cancel)
+
     def update_progress(self, current, total, status="در حال پردازش..."):
+        # Called from the Tk loop only; no update() here, so no re-entrant event handling
         if total > 0:
-            percent = (current / total) * 100
-            self.progress['value'] = percent
-            self.percent_label.config(text=f"{percent:.1f}%")
-            self.status_label.config(text=f"{status} ({current}/{total})")
-        self.window.update()
+            self.set_percent((current / total) * 100, f"{status} ({current}/{total})")
+
+    def set_percent(self, percent, status="در حال پردازش..."):
+        percent = max(0.0, min(float(percent), 100.0))
+        self.progress['value'] = percent
+        self.percent_label.config(text=f"{percent:.1f}%")
+        self.status_label.config(text=status)
+
+    def _cancel(self):
+        self.cancel_btn.config(state='disabled')
+        self.status_label.config(text="در حال لغو...")
+        self.on_cancel()
+
+    def close(self):
+        self.window.destroy()
+
+
+class PreviewWindow:
+    """Low-resolution live preview with an alpha slider; frames are shown as they arrive"""
+
+    def __init__(self, parent, on_render, alpha_var, on_close=None, title="پیش‌نمایش"):
+        self.on_render = on_render
+        self.on_close = on_close
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.alpha_var = alpha_var  # Shared with the app, so the full render uses the tuned value
+        self.create_widgets()
+
+    def create_widgets(self):
+        main_frame = ttk.Frame(self.window, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.image_label = ttk.Label(main_frame, text="در انتظار پیش‌نمایش...")
+        self.image_label.pack(pady=5)
+
+        controls = ttk.Frame(main_frame)
+        controls.pack(fill=tk.X, pady=5)
+        ttk.Label(controls, text="Alpha:").pack(side=tk.RIGHT)
+        ttk.Scale(controls, from_=0.0, to=1.0, variable=self.alpha_var, orient="horizontal", length=200) \
+            .pack(side=tk.RIGHT, padx=5)
+        ttk.Button(controls, text="رندر دوباره", command=self.render).pack(side=tk.LEFT)
+
+        self.status_label = ttk.Label(main_frame, text="", font=("Tahoma", 9))
+        self.status_label.pack(fill=tk.X)
+
+    def render(self):
+        self.on_render(round(self.alpha_var.get(), 2))
+
+    def show_frame(self, frame, status=""):
+        if not self.window.winfo_exists():
+            return
+        image = Image.fromarray(frame[:, :, ::-1])  # BGR -> RGB
+        photo = ImageTk.PhotoImage(image)
+        self.image_label.config(image=photo, text="")
+        self.image_label.image = photo  # Keeping the referral
+        self.set_status(status)
+
+    def set_status(self, status):
+        if self.window.winfo_exists():
+            self.status_label.config(text=status)
 
     def close(self):
+        if self.on_close:
+            self.on_close()
         self.window.destroy()
 
 
 class ResultsDisplay(ttk.Frame):
-    def __init__(self, parent):
+    """
+    Virtualized result list: rows have a fixed height and only those in (or next to)
+    the viewport exist as widgets, so hundreds of results cost a handful of rows.
+    Thumbnails come from the thumbnail cache on worker threads; a row shows a
+    placeholder until its images arrive.
+    """
+
+    ROW_HEIGHT = 400
+    VIEW_HEIGHT = 820
+    THUMB_SIZE = (300, 300)
+
+    def __init__(self, parent, thumbnail_cache=None, jobs=None):
         super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.jobs = jobs
+        self.results = []
+        self._rows = {}  # result index -> (canvas item, frame)
+        self._refresh_pending = False
         self.create_widgets()
 
     def create_widgets(self):
         header_frame = ttk.Frame(self)
         header_frame.pack(fill=tk.X, pady=10)
         ttk.Label(header_frame, text="نتایج تشخیص", font=("Arial", 14, "bold")).pack(side=tk.RIGHT)
-
-        self.results_container = ttk.Frame(self)
-        self.results_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.count_label = ttk.Label(header_frame, text="", font=("Tahoma", 9))
+        self.count_label.pack(side=tk.LEFT)
+
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.canvas = tk.Canvas(body, height=self.VIEW_HEIGHT, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Enter>", lambda e: self.canvas.bind_all("<MouseWheel>", self._on_mousewheel))
 
     def clear_results(self):
-        for widget in self.results_container.winfo_children():
-            widget.destroy()
+        for index in list(self._rows):
+            self._drop_row(index)
+        self.results = []
+        self.canvas.yview_moveto(0)
+        self._update_scrollregion()
 
     def add_result(
             self,
@@ -179,12 +273,76 @@ class ResultsDisplay(ttk.Frame):
         Add a result entry; show input image, matched cover,
         and the overlay image if available.
         """
+        self.results.append(dict(
+            input_path=input_path,
+            result_path=result_path,
+            confidence=confidence,
+            matches=matches,
+            rank=rank,
+            error_message=error_message,
+            source_frame_path=source_frame_path,
+            overlay_image_path=overlay_image_path
+        ))
+        self._update_scrollregion()
+
+    def _update_scrollregion(self):
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, len(self.results) * self.ROW_HEIGHT))
+        self.count_label.config(text=f"{len(self.results)} نتیجه" if self.results else "")
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        # Many add_result calls in a row produce a single layout pass
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._refresh_visible)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_refresh()
+
+    def _on_resize(self, event):
+        for item, _ in self._rows.values():
+            self.canvas.itemconfigure(item, width=event.width)
+        self._update_scrollregion()
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+
+    def _refresh_visible(self):
+        """Create rows entering the viewport (plus one either side) and destroy the rest"""
+        self._refresh_pending = False
+        if not self.winfo_exists():
+            return
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), self.ROW_HEIGHT)
+        first = max(int(top // self.ROW_HEIGHT) - 1, 0)
+        last = min(int(bottom // self.ROW_HEIGHT) + 1, len(self.results) - 1)
+        visible = set(range(first, last + 1))
+
+        for index in list(self._rows):
+            if index not in visible:
+                self._drop_row(index)
+        for index in sorted(visible - set(self._rows)):
+            self._build_row(index)
+
+    def _drop_row(self, index):
+        item, frame = self._rows.pop(index)
+        self.canvas.delete(item)
+        frame.destroy()
+
+    def _build_row(self, index):
+        result = self.results[index]
         result_frame = ttk.LabelFrame(
-            self.results_container,
-            text=f"رتبه {rank} – امتیاز: {confidence:.1f}",
+            self.canvas,
+            text=f"رتبه {result['rank']} – امتیاز: {result['confidence']:.1f}",
             padding=10
         )
-        result_frame.pack(fill=tk.X, pady=5, padx=5)
+        item = self.canvas.create_window(
+            0, index * self.ROW_HEIGHT, anchor="nw", window=result_frame,
+            width=self.canvas.winfo_width(), height=self.ROW_HEIGHT - 10
+        )
+        self._rows[index] = (item, result_frame)
 
         images_frame = ttk.Frame(result_frame)
         images_frame.pack(fill=tk.X, pady=5)
@@ -192,22 +350,23 @@ class ResultsDisplay(ttk.Frame):
         # 1. Original input image or video frame
         input_frame = ttk.Frame(images_frame)
         input_frame.pack(side=tk.RIGHT, padx=10)
-        if source_frame_path:
+        if result['source_frame_path']:
             # for video: show the matched frame
             ttk.Label(input_frame, text="فریم منطبق", font=("Tahoma", 10, "bold")).pack()
-            self.add_image(input_frame, source_frame_path)
+            self.add_image(input_frame, result['source_frame_path'])
         else:
             # for image: show the input image
             ttk.Label(input_frame, text="تصویر ورودی", font=("Tahoma", 10, "bold")).pack()
-            self.add_image(input_frame, input_path)
+            self.add_image(input_frame, result['input_path'])
 
         # 2. Matched cover image
         cover_frame = ttk.Frame(images_frame)
         cover_frame.pack(side=tk.RIGHT, padx=10)
         ttk.Label(cover_frame, text="جلد منطبق", font=("Tahoma", 10, "bold")).pack()
-        self.add_image(cover_frame, result_path)
+        self.add_image(cover_frame, result['result_path'])
 
         # 3. Overlay image if exists
+        overlay_image_path = result['overlay_image_path']
         if overlay_image_path and os.path.exists(overlay_image_path):
             overlay_frame = ttk.Frame(images_frame)
             overlay_frame.pack(side=tk.RIGHT, padx=10)
@@ -217,21 +376,48 @@ class ResultsDisplay(ttk.Frame):
         # Info section
         info_frame = ttk.Frame(result_frame)
         info_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(info_frame, text=f"تعداد تطبیق‌ها: {matches}", font=("Tahoma", 9)).pack(side=tk.RIGHT, padx=5)
-        if error_message:
-            ttk.Label(result_frame, text=f"خطا: {error_message}", foreground="red").pack(pady=5)
+        ttk.Label(info_frame, text=f"تعداد تطبیق‌ها: {result['matches']}", font=("Tahoma", 9)) \
+            .pack(side=tk.RIGHT, padx=5)
+        if result['error_message']:
+            ttk.Label(result_frame, text=f"خطا: {result['error_message']}", foreground="red").pack(pady=5)
+
+    def add_image(self, parent, image_path, size=THUMB_SIZE):
+        """Show a placeholder now and the cached thumbnail once it is ready"""
+        label = ttk.Label(parent, text="در حال بارگذاری...")
+        label.pack()
+
+        if self.thumbnail_cache is None:
+            self._show_thumbnail(label, self._load_thumbnail(image_path, size))
+        elif self.jobs is None:
+            self._show_thumbnail(label, self.thumbnail_cache.get(image_path, size))
+        else:
+            self.jobs.submit(
+                lambda token, report: self.thumbnail_cache.get(image_path, size),
+                on_done=lambda thumbnail: self._show_thumbnail(label, thumbnail),
+                on_error=lambda error: self._show_thumbnail(label, None),
+                name=f"thumbnail:{os.path.basename(image_path)}"
+            )
 
-    def add_image(self, parent, image_path, size=(300, 300)):
-        """Loading and displaying the image in reduced size"""
+    @staticmethod
+    def _show_thumbnail(label, thumbnail):
+        # The row may have scrolled out of view while the thumbnail was loading
+        if not label.winfo_exists():
+            return
+        if thumbnail is None:
+            label.config(text="خطا در بارگذاری تصویر")
+            return
+        photo = ImageTk.PhotoImage(thumbnail)
+        label.config(image=photo, text="")
+        label.image = photo  # Keeping the referral
+
+    @staticmethod
+    def _load_thumbnail(image_path, size):
         try:
             image = Image.open(image_path)
             image.thumbnail(size, Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(image)
-            label = ttk.Label(parent, image=photo)
-            label.image = photo  # Keeping the referral
-            label.pack()
+            return image
         except Exception:
-            ttk.Label(parent, text="خطا در بارگذاری تصویر").pack()
+            return None
 
 
 class VideoSelector(ImageSelector):
@@ -0,0 +1,140 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.application.instrumentation import bind_context
+from src.application.jobs import CancellationToken, JobCancelled
+
+
+class Job:
+    """Handle of a submitted job: its cancellation token and future"""
+
+    def __init__(self, job_id: int, name: str, token: CancellationToken, future: Future):
+        self.job_id = job_id
+        self.name = name
+        self.token = token
+        self.future = future
+
+    def cancel(self, reason: str = "Cancelled"):
+        self.token.cancel(reason)
+        self.future.cancel()  # Drops it outright if it has not started yet
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+
+class JobExecutor:
+    """
+    Runs GUI work on one shared thread pool and delivers its callbacks on the Tk thread.
+    Workers never touch widgets: they push events into a queue that the Tk loop drains
+    every poll_ms via after(). Progress is coalesced per job (only the latest report is
+    kept until the next poll), so a processor reporting every frame costs Tk one update
+    per poll at most.
+    """
+
+    def __init__(self, root, max_workers: int = 4, poll_ms: int = 50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-job")
+        self._events: "queue.Queue[Tuple[str, int, Any]]" = queue.Queue()
+        self._progress: Dict[int, tuple] = {}
+        self._progress_lock = threading.Lock()
+        self._callbacks: Dict[int, Tuple[Optional[Callable], Optional[Callable], Optional[Callable]]] = {}
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._poll_id = None
+        if root is not None:
+            self._poll_id = root.after(poll_ms, self._tick)
+
+    def submit(
+            self,
+            fn: Callable[[CancellationToken, Callable[..., None]], Any],
+            on_progress: Optional[Callable[..., None]] = None,
+            on_done: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None,
+            token: Optional[CancellationToken] = None,
+            name: str = "job"
+    ) -> Job:
+        """
+        Run fn(token, report) on the pool. report(message, percent, ...) may be called
+        at any rate from the worker; its latest arguments reach on_progress unchanged,
+        so extra ones such as a preview frame pass through. Callbacks run on the Tk
+        thread. A cancelled job ends in on_error with JobCancelled. Jobs sharing a
+        token are cancelled together.
+        """
+        job_id = next(self._ids)
+        token = token or CancellationToken()
+        self._callbacks[job_id] = (on_progress, on_done, on_error)
+
+        def report(*args):
+            with self._progress_lock:
+                first = job_id not in self._progress
+                self._progress[job_id] = args
+            if first:
+                self._events.put(("progress", job_id, None))
+
+        def run():
+            try:
+                token.raise_if_cancelled()
+                result = fn(token, report)
+            except Exception as e:
+                self._events.put(("error", job_id, e))
+            else:
+                self._events.put(("done", job_id, result))
+
+        def on_future_done(future: Future):
+            # run() never started, so nothing else will report the job
+            if future.cancelled():
+                self._events.put(("error", job_id, JobCancelled(token.reason)))
+
+        future = self.pool.submit(bind_context(run))
+        future.add_done_callback(on_future_done)
+        return Job(job_id, name, token, future)
+
+    def poll(self) -> int:
+        """Deliver pending events on the calling (Tk) thread; returns how many were handled"""
+        handled = 0
+        while True:
+            try:
+                kind, job_id, payload = self._events.get_nowait()
+            except queue.Empty:
+                return handled
+            on_progress, on_done, on_error = self._callbacks.get(job_id, (None, None, None))
+            if kind == "progress":
+                with self._progress_lock:
+                    args = self._progress.pop(job_id, None)
+                if on_progress and args is not None:
+                    self._safe(on_progress, *args)
+            else:
+                self._callbacks.pop(job_id, None)
+                with self._progress_lock:
+                    self._progress.pop(job_id, None)
+                callback = on_done if kind == "done" else on_error
+                if callback:
+                    self._safe(callback, payload)
+                elif kind == "error" and not isinstance(payload, JobCancelled):
+                    print(f"❌ Background job failed: {payload}")
+            handled += 1
+
+    def shutdown(self):
+        """Stop polling and let running jobs finish without waiting for them"""
+        self._closed = True
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _tick(self):
+        self.poll()
+        if not self._closed:
+            self._poll_id = self.root.after(self.poll_ms, self._tick)
+
+    @staticmethod
+    def _safe(callback: Callable, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"⚠️ Job callback failed: {e}")
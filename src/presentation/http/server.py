@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+import numpy as np
+
+from src.application.instrumentation import tracer
+from src.application.use_cases import CatalogIndex, CatalogManager, MatchBatcher, OverlayBookCoverUseCase
+from src.domain.entities.book_cover import BookCover
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.feature_extractors.process_pool_extractor import ProcessPoolFeatureExtractor
+from src.infrastructure.matchers.matcher_factory import create_components, load_matcher_config, matcher_config_path
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.memmap_feature_store import open_feature_store
+
+
+class LatencyRecorder:
+    """Rolling window of request latencies per endpoint"""
+
+    def __init__(self, window: int = 10000):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds * 1000)
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            samples = {k: np.array(v) for k, v in self._samples.items()}
+            counts = dict(self._counts)
+
+        report = {}
+        for endpoint, values in samples.items():
+            if len(values) == 0:
+                continue
+            report[endpoint] = {
+                "count": counts[endpoint],
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(np.percentile(values, 50)),
+                "p90_ms": float(np.percentile(values, 90)),
+                "p95_ms": float(np.percentile(values, 95)),
+                "p99_ms": float(np.percentile(values, 99)),
+                "max_ms": float(values.max())
+            }
+        return report
+
+
+class RecognitionService:
+    """Warm recognition pipeline shared by all HTTP requests"""
+
+    def __init__(
+            self,
+            books_path: str = "data/book_images",
+            features_cache: str = "data/cache/catalog/features.bin",
+            max_batch_size: int = 16,
+            max_wait_ms: float = 5.0,
+            matcher_config: Optional[MatcherConfig] = None,
+            image_cache_size: int = 32,
+            watch_catalog: bool = False,
+            poll_interval: float = 2.0,
+            build_workers: int = os.cpu_count() or 1
+    ):
+        self.matcher_config = matcher_config or load_matcher_config(matcher_config_path(features_cache))
+        self.feature_extractor, self.matcher = create_components(self.matcher_config)
+        self.image_repository = FileImageRepository(book_movie_path=books_path, image_cache_size=image_cache_size)
+        self.catalog = CatalogIndex(
+            self.feature_extractor, self.matcher, self.image_repository,
+            open_feature_store(features_cache, self.matcher_config.extractor_signature),
+            batch_extractor=ProcessPoolFeatureExtractor(self.matcher_config, build_workers)
+        ).build()
+        self.batcher = MatchBatcher(self.catalog, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.catalog_manager = CatalogManager(self.catalog, poll_interval=poll_interval).start() \
+            if watch_catalog else None
+        self.overlay_use_case = OverlayBookCoverUseCase(self.feature_extractor, self.matcher)
+        self.latency = LatencyRecorder()
+        self.started_at = time.time()
+
+    def match(self, image_bytes: bytes, top_k: int = 5, source_name: str = "request") -> list:
+        image = self._decode(image_bytes)
+        feature = self.feature_extractor.extract_features(image)
+        return self.batcher.match(feature, source_name, top_k)
+
+    def overlay(self, image_bytes: bytes, min_matches: int = 10) -> Tuple[Optional[bytes], Optional[dict]]:
+        """Return (JPEG bytes, best match) with the best cover replaced by its movie cover"""
+        image = self._decode(image_bytes)
+        feature = self.feature_extractor.extract_features(image)
+        results = self.batcher.match(feature, "request", top_k=1)
+        if not results or results[0].good_matches_count < min_matches:
+            return None, results[0].to_dict() if results else None
+
+        best = results[0]
+        cover = next(c for c in self.catalog.live_covers if c.image_path == best.target_image_path)
+        try:
+            movie_path = self.image_repository.get_movie_image_for_book(cover.name)
+        except FileNotFoundError:
+            best.error_message = f"No movie cover for {cover.name}"
+            return None, best.to_dict()
+        movie_cover = BookCover.from_image(movie_path, cv2.imread(movie_path), name=cover.name)
+
+        overlayed = self.overlay_use_case.overlay_book_on_image(image, cover, movie_cover, best, min_matches)
+        if overlayed is None:
+            return None, best.to_dict()
+
+        ok, encoded = cv2.imencode(".jpg", overlayed)
+        return (encoded.tobytes() if ok else None), best.to_dict()
+
+    def metrics(self) -> dict:
+        return {
+            "uptime_seconds": time.time() - self.started_at,
+            "catalog_covers": len(self.catalog.live_covers),
+            "catalog_updates": self.catalog_manager.stats() if self.catalog_manager else None,
+            "endpoints": self.latency.snapshot(),
+            "batching": self.batcher.stats(),
+            "matcher_config": self.matcher_config.to_dict(),
+            "stages": tracer.histograms() if tracer.enabled else None
+        }
+
+    def close(self):
+        if self.catalog_manager:
+            self.catalog_manager.stop()
+        self.batcher.close()
+
+    @staticmethod
+    def _decode(image_bytes: bytes) -> np.ndarray:
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Request body is not a decodable image")
+        return image
+
+
+class RecognitionRequestHandler(BaseHTTPRequestHandler):
+    """POST /match, POST /overlay, GET /metrics, GET /health"""
+
+    service: RecognitionService = None  # Set by create_server
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            self._send_json(200, self.service.metrics())
+        elif path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path not in ("/match", "/overlay"):
+            self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            body = self._read_body()
+            if url.path == "/match":
+                top_k = int(params.get("top_k", ["5"])[0])
+                results = self.service.match(body, top_k, params.get("name", ["request"])[0])
+                self._send_json(200, {
+                    "matches": [{"rank": i, **r.to_dict()} for i, r in enumerate(results, start=1)]
+                })
+            else:
+                jpeg, best = self.service.overlay(body)
+                if jpeg is None:
+                    self._send_json(404, {"error": "No confident match to overlay", "best_match": best})
+                else:
+                    self._send_bytes(200, jpeg, "image/jpeg")
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": repr(e)})
+        finally:
+            self.service.latency.record(url.path, time.perf_counter() - start)
+
+    def log_message(self, format, *args):
+        # Keep request logging out of the way of pipeline output
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            raise ValueError("Request body must contain image bytes")
+        return self.rfile.read(length)
+
+    def _send_json(self, status: int, payload: dict):
+        self._send_bytes(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def _send_bytes(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(service: RecognitionService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Bind a threaded HTTP server to an already warmed-up service"""
+    handler = type("BoundRecognitionRequestHandler", (RecognitionRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
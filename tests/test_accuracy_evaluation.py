@@ -0,0 +1,47 @@
+from src.application.use_cases.evaluation import (
+    AccuracyEvaluation,
+    SyntheticFixtureGenerator,
+    load_labeled_queries,
+    synthetic_queries
+)
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.matchers.matcher_factory import create_components
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def test_accuracy_vs_speed_report():
+    """Labeled and synthetic queries yield accuracy, corner error, latency and a Pareto flag per setting."""
+    print("🔍 Testing accuracy-vs-speed evaluation...")
+
+    setup_test_environment()
+
+    repo = FileImageRepository()
+    queries = [q for q in load_labeled_queries("data/input_image_labels.json") if "Hobbit" in q.image_path][:1]
+    fixtures = SyntheticFixtureGenerator(repo, "data/tests/evaluation", seed=3, max_covers=2)
+    queries += synthetic_queries(fixtures.cover_photos(per_cover=1))
+    assert len(queries) == 3
+
+    configs = [
+        MatcherConfig("sift_scale0.5", downscale=0.5),
+        MatcherConfig("orb_lsh", extractor="orb", max_keypoints=1000, algorithm="lsh")
+    ]
+    rows = AccuracyEvaluation(repo, queries, create_components, top_k=5).run(configs)
+
+    latencies = [r["mean_latency_ms"] for r in rows]
+    assert latencies == sorted(latencies)
+    sift = next(r for r in rows if r["name"] == "sift_scale0.5")
+    assert sift["queries"] == 3 and sift["top1_accuracy"] == 1.0
+    assert sift["mean_corner_error_px"] is not None and sift["mean_corner_error_px"] < 10
+    assert any(r["pareto"] for r in rows)
+
+    # Dominated settings drop off the front
+    marked = AccuracyEvaluation.mark_pareto([
+        {"name": "fast", "top1_accuracy": 0.8, "mean_latency_ms": 10.0},
+        {"name": "good", "top1_accuracy": 1.0, "mean_latency_ms": 50.0},
+        {"name": "worse", "top1_accuracy": 0.8, "mean_latency_ms": 60.0}
+    ])
+    assert {r["name"]: r["pareto"] for r in marked} == {"fast": True, "good": True, "worse": False}
+
+    print(AccuracyEvaluation.format_table(rows))
+    print("✅ Accuracy evaluation test passed!")
@@ -0,0 +1,140 @@
+import shutil
+import cv2
+import numpy as np
+
+from src.application.use_cases import HomographyTrackAnalyzer, ParallelFrameProcessor, ProcessInputVideoUseCase
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.file_video_repository import FileVideoRepository
+from tests.utils import setup_test_environment
+
+
+def _write_video(path: str, frames):
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def _unexpected_detection(*args):
+    raise AssertionError("detection should be skipped")
+
+
+def _use_case(books_dir, videos_dir, two_pass=True, segment_frames=None):
+    image_repository = FileImageRepository(book_movie_path=str(books_dir))
+    book_matcher = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), image_repository)
+    analyzer = HomographyTrackAnalyzer(book_matcher, detect_every=5, max_workers=2) if two_pass else None
+    processor = ParallelFrameProcessor(book_matcher, max_workers=2, track_analyzer=analyzer)
+    use_case = ProcessInputVideoUseCase(
+        SIFTExtractor(), FLANNMatcher(), image_repository,
+        FileVideoRepository(input_path=str(videos_dir)), processor, min_conf=1.0,
+        segment_frames=segment_frames
+    )
+    return use_case, analyzer
+
+
+def _prepare_inputs(tmp_path):
+    books_dir, videos_dir = tmp_path / "books", tmp_path / "videos"
+    books_dir.mkdir()
+    videos_dir.mkdir()
+    for name in ("The_Hobbit_book.jpg", "The_Lord_Of_The_Rings_Towers_book.png"):
+        shutil.copy(f"data/book_images/{name}", books_dir)
+    _write_video(str(videos_dir / "The_Hobbit_book.mp4"), [np.full((80, 60, 3), 50, dtype=np.uint8)] * 10)
+    return books_dir, videos_dir
+
+
+def test_rerender_loads_detection_and_track_from_sidecar(tmp_path):
+    """A second execute (new process) reads the sidecar and skips both detection and analysis."""
+    print("🔍 Testing the per-video analysis sidecar...")
+
+    setup_test_environment()
+
+    books_dir, videos_dir = _prepare_inputs(tmp_path)
+
+    cover = cv2.resize(cv2.imread("data/book_images/The_Hobbit_book.jpg"), (120, 180))
+    frames = []
+    for i in range(40):
+        # Two shots with the cover at different places, then a shot without it
+        frame = np.full((240, 320, 3), 90 if i < 20 else 200 if i < 30 else 30, dtype=np.uint8)
+        if i < 20:
+            frame[30:210, 20 + i:140 + i] = cover
+        elif i < 30:
+            frame[40:220, 180:300] = cover
+        frames.append(frame)
+    _write_video(str(tmp_path / "input.mp4"), frames)
+
+    video_path = str(tmp_path / "input.mp4")
+    use_case, analyzer = _use_case(books_dir, videos_dir)
+    result = use_case.execute(video_path, str(tmp_path / "first.mp4"), alpha=0.7)
+    assert result.success and result.target_book_name == "The_Hobbit_book"
+    assert analyzer.analyses == 1
+
+    track = analyzer.stored_detection(video_path, 40, 25, 320, 240)
+    assert track.book_name == "The_Hobbit_book" and track.homographies.shape == (40, 3, 3)
+    assert track.homographies.dtype == np.float32
+    assert track.shot_boundaries == [20, 30]
+    assert {19, 20, 29, 30} <= set(track.keyframes), "both sides of every cut are matched"
+    assert track.visible[:30].all() and not track.visible[30:].any()
+
+    # A new run: detection and analysis come from the sidecar, only compositing is left
+    use_case, analyzer = _use_case(books_dir, videos_dir)
+    use_case.book_detector.detect = _unexpected_detection
+    result = use_case.execute(video_path, str(tmp_path / "second.mp4"), alpha=0.2)
+    assert result.success and result.target_book_name == "The_Hobbit_book"
+    assert result.replaced_frames_count == 40 and analyzer.analyses == 0
+
+    print(f"⏱️ Re-render from sidecar took {result.processing_time_seconds:.2f}s")
+    print("✅ Analysis sidecar test passed!")
+
+
+def test_resumed_render_keeps_detection_confidence(tmp_path):
+    """A render resumed from its segment manifest stores the original confidence in the sidecar."""
+    print("🔍 Testing detection confidence across a resumed render...")
+
+    setup_test_environment()
+
+    books_dir, videos_dir = _prepare_inputs(tmp_path)
+    cover = cv2.resize(cv2.imread("data/book_images/The_Hobbit_book.jpg"), (120, 180))
+    frames = []
+    for i in range(20):
+        frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+        frame[30:210, 20 + i:140 + i] = cover
+        frames.append(frame)
+    video_path, output_path = str(tmp_path / "input.mp4"), str(tmp_path / "output.mp4")
+    _write_video(video_path, frames)
+
+    # The first render dies after its first segment
+    use_case, _ = _use_case(books_dir, videos_dir, two_pass=False, segment_frames=10)
+    process_frames = use_case.frame_processor.process_frames
+
+    def crash_on_second_segment(*args, **kwargs):
+        if kwargs["start_frame"] == 10:
+            raise RuntimeError("simulated crash")
+        return process_frames(*args, **kwargs)
+
+    use_case.segment_renderer.frame_processor.process_frames = crash_on_second_segment
+    try:
+        use_case.execute(video_path, output_path)
+        assert False, "Expected the simulated crash"
+    except RuntimeError:
+        pass
+    manifest = use_case.segment_renderer.find_resumable(video_path, output_path, 20, 25, 320, 240)
+    assert manifest.book_name == "The_Hobbit_book" and manifest.confidence >= 1.0
+
+    # The resumed render takes the detection and its confidence from the manifest
+    use_case, analyzer = _use_case(books_dir, videos_dir, segment_frames=10)
+    use_case.book_detector.detect = _unexpected_detection
+    result = use_case.execute(video_path, output_path)
+    assert result.success and result.tracking_confidence == manifest.confidence
+    assert analyzer.stored_detection(video_path, 20, 25, 320, 240).confidence == manifest.confidence
+
+    # So a later render still accepts the stored detection
+    use_case, analyzer = _use_case(books_dir, videos_dir)
+    use_case.book_detector.detect = _unexpected_detection
+    result = use_case.execute(video_path, str(tmp_path / "second.mp4"))
+    assert result.success and result.tracking_confidence == manifest.confidence and analyzer.analyses == 0
+
+    print("✅ Resumed detection confidence test passed!")
@@ -0,0 +1,124 @@
+import json
+import shutil
+
+import cv2
+
+from src.application.use_cases import CatalogIndex
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.presentation.cli.app import build_parser, expand_inputs, main
+from tests.utils import setup_test_environment
+
+COVERS = ("The_Hobbit_book.jpg", "The_Lord_Of_The_Rings_Towers_book.png",
+          "The_Lord_Of_The_Rings_Fellowship_book.jpg", "Dracula_book.jpeg")
+
+
+def _books_dir(tmp_path):
+    books_dir = tmp_path / "books"
+    books_dir.mkdir()
+    for name in COVERS:
+        shutil.copy(f"data/book_images/{name}", books_dir)
+    return books_dir
+
+
+def _records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_expand_inputs_accepts_files_folders_and_globs(tmp_path):
+    """Inputs are expanded once each, keep their order and skip other file types."""
+    print("🔍 Testing input expansion...")
+
+    setup_test_environment()
+
+    for name in ("b.jpg", "a.PNG", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / "c.jpeg").write_bytes(b"")
+
+    extensions = ('.jpg', '.jpeg', '.png')
+    assert expand_inputs([str(tmp_path)], extensions) == [str(tmp_path / "a.PNG"), str(tmp_path / "b.jpg")]
+    assert expand_inputs([str(tmp_path / "**" / "*.jp*g")], extensions) == [
+        str(tmp_path / "b.jpg"), str(nested / "c.jpeg")]
+    assert expand_inputs([str(tmp_path / "b.jpg"), str(tmp_path), str(tmp_path / "notes.txt")], extensions) == [
+        str(tmp_path / "b.jpg"), str(tmp_path / "a.PNG")]
+
+    print("✅ Input expansion test passed!")
+
+
+def test_replace_options_reach_segmented_rendering():
+    """Segment options parse with sequential segments by default."""
+    print("🔍 Testing replace options...")
+
+    setup_test_environment()
+
+    args = build_parser().parse_args(["replace", "video.mp4", "--segment-frames", "300"])
+    assert args.segment_frames == 300 and args.segment_workers == 1
+    args = build_parser().parse_args(["replace", "video.mp4", "--segment-frames", "300", "--segment-workers", "3"])
+    assert args.segment_workers == 3
+
+    print("✅ Replace options test passed!")
+
+
+def test_index_and_match_write_json_lines(tmp_path):
+    """`index` caches catalog features and `match` writes one ranked record per result."""
+    print("🔍 Testing the batch CLI...")
+
+    setup_test_environment()
+
+    books_dir = _books_dir(tmp_path)
+    common = ["--books", str(books_dir), "--features-cache", str(tmp_path / "features.npz"), "--workers", "1"]
+
+    assert main(["index", *common, "-o", str(tmp_path / "index.jsonl")]) == 0
+    record, = _records(tmp_path / "index.jsonl")
+    assert record["command"] == "index" and record["covers"] == len(COVERS)
+    assert record["extracted"] == len(COVERS) and record["covers_per_second"] > 0
+
+    # A second run reads every cover from the cache
+    assert main(["index", *common, "-o", str(tmp_path / "index.jsonl")]) == 0
+    record, = _records(tmp_path / "index.jsonl")
+    assert record["covers"] == len(COVERS) and record["extracted"] == 0
+
+    inputs = ["data/input_images/Hobbit.jpg", "data/input_images/Tower.jpg"]
+    assert main(["match", *inputs, *common, "--top-k", "2", "-o", str(tmp_path / "match.jsonl")]) == 0
+    records = _records(tmp_path / "match.jsonl")
+    assert [(r["input"], r["rank"]) for r in records] == [(path, rank) for path in inputs for rank in (1, 2)]
+    best = {r["input"]: r["target_name"] for r in records if r["rank"] == 1}
+    assert best == {inputs[0]: "The_Hobbit_book", inputs[1]: "The_Lord_Of_The_Rings_Towers_book"}
+    assert all(r["confidence_score"] >= s["confidence_score"]
+               for r, s in zip(records[::2], records[1::2]))
+
+    print("✅ Batch CLI test passed!")
+
+
+def test_catalog_index_ranks_and_verifies_candidates(tmp_path):
+    """The shared index shortlists covers and pairwise verification scores them like single comparisons."""
+    print("🔍 Testing catalog ranking and verification...")
+
+    setup_test_environment()
+
+    extractor, matcher = SIFTExtractor(), FLANNMatcher()
+    catalog = CatalogIndex(extractor, matcher, FileImageRepository(book_movie_path=str(_books_dir(tmp_path))),
+                           shortlist_size=3).build()
+    assert catalog.is_built and len(catalog.live_covers) == len(COVERS)
+
+    query = extractor.extract_features(cv2.imread("data/input_images/Hobbit.jpg"))
+    candidates = catalog.rank_candidates(catalog.search(query.descriptors), top_k=2)
+    assert len(candidates) == 3, "a few more candidates than top_k are verified"
+    assert [votes for _, votes in candidates] == sorted((votes for _, votes in candidates), reverse=True)
+
+    results = catalog.match_features(query, "Hobbit", top_k=2)
+    assert len(results) == 2 and results[0].target_name == "The_Hobbit_book"
+    assert results[0].confidence_score >= results[1].confidence_score
+    for result in results:
+        cover = next(c for c in catalog.covers if c.name == result.target_name)
+        # Scores come from the pairwise matches; FLANN's randomized trees vary them slightly between runs
+        assert result.confidence_score == result.good_matches_count == len(result.matches)
+        pairwise = len(matcher.match_features(query.descriptors, cover.descriptors))
+        assert abs(result.confidence_score - pairwise) <= max(3, 0.2 * pairwise)
+        assert result.source_keypoints is query.keypoints and result.target_keypoints is cover.keypoints
+
+    print("✅ Catalog ranking test passed!")
@@ -0,0 +1,47 @@
+import copy
+import filecmp
+
+from src.application.use_cases.evaluation import BenchmarkSuite, SyntheticFixtureGenerator
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def test_synthetic_benchmark_and_baseline_compare():
+    """Fixtures are reproducible per seed, and slower runs are flagged against a baseline."""
+    print("🔍 Testing synthetic benchmark suite...")
+
+    setup_test_environment()
+
+    repo = FileImageRepository()
+    first = SyntheticFixtureGenerator(repo, "data/tests/benchmarks/a", seed=7, max_covers=2).cover_photos(per_cover=1)
+    second = SyntheticFixtureGenerator(repo, "data/tests/benchmarks/b", seed=7, max_covers=2).cover_photos(per_cover=1)
+    for a, b in zip(first, second):
+        assert filecmp.cmp(a.image_path, b.image_path, shallow=False), "Same seed should give identical fixtures"
+
+    fixtures = SyntheticFixtureGenerator(repo, "data/tests/benchmarks/a", seed=7, max_covers=2)
+    suite = BenchmarkSuite(
+        SIFTExtractor(), FLANNMatcher(), repo, fixtures,
+        resolutions=[(320, 180)], worker_counts=[1], video_frames=8, images_per_cover=1,
+        case_groups=["catalog", "processor"]
+    )
+    results = suite.run()
+
+    cases = results["cases"]
+    assert set(cases) == {"catalog_match", "processor/parallel/320x180/w1", "processor/async/320x180/w1"}
+    assert cases["catalog_match"]["top1_accuracy"] > 0
+    assert cases["processor/parallel/320x180/w1"]["replaced_frames"] > 0
+
+    assert all(row["status"] == "ok" for row in BenchmarkSuite.compare(results, results))
+
+    # A baseline twice as fast makes every timing a regression
+    faster = copy.deepcopy(results)
+    for metrics in faster["cases"].values():
+        metrics["seconds"] /= 2
+    rows = BenchmarkSuite.compare(results, faster, tolerance=0.25)
+    assert all(row["status"] == "regressed" and "seconds" in row["regressed_metrics"] for row in rows)
+
+    for case, metrics in cases.items():
+        print(f"⏱️ {case}: {metrics['seconds']:.2f}s")
+    print("✅ Benchmark suite test passed!")
@@ -0,0 +1,123 @@
+import shutil
+import cv2
+import numpy as np
+
+from src.application.instrumentation import tracer
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.application.use_cases.video_processing.book_detector_in_video import BookDetectorInVideo
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+class CountingExtractor(SIFTExtractor):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def extract_features(self, image):
+        self.calls += 1
+        return super().extract_features(image)
+
+
+def _write_video(path: str, cover: np.ndarray, visible) -> int:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (320, 240))
+    for i in range(80):
+        frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+        if visible(i):
+            frame[30:210, 100:220] = cover
+        writer.write(frame)
+    writer.release()
+    return 80
+
+
+def test_detector_scores_probes_once_and_stops_early(tmp_path):
+    """Sampled frames are ranked cheaply, then verified with features only until one cover leads."""
+    print("🔍 Testing parallel, adaptive book detection...")
+
+    setup_test_environment()
+
+    books_dir = tmp_path / "books"
+    books_dir.mkdir()
+    names = ("The_Hobbit_book.jpg", "The_Lord_Of_The_Rings_Towers_book.png", "Dracula_book.jpeg")
+    for name in names:
+        shutil.copy(f"data/book_images/{name}", books_dir)
+    cover = cv2.resize(cv2.imread("data/book_images/The_Hobbit_book.jpg"), (120, 180))
+
+    extractor = CountingExtractor()
+    image_repository = FileImageRepository(book_movie_path=str(books_dir))
+    book_matcher = FindMatchingBookMovieUseCase(extractor, FLANNMatcher(), image_repository)
+    detector = BookDetectorInVideo(book_matcher, image_repository, max_workers=2)
+
+    # Cover on screen the whole time: one leads after the first three probes
+    video_path = str(tmp_path / "always.mp4")
+    total = _write_video(video_path, cover, lambda i: True)
+    cap = cv2.VideoCapture(video_path)
+    name, _, _, homography = detector.detect_best_book(cap, total, min_conf=5.0)
+    cap.release()
+
+    assert name == "The_Hobbit_book" and homography is not None
+    assert detector.last_probe_count == 3
+    assert extractor.calls == len(names) + 3, f"{extractor.calls} extractions"
+    assert abs(homography[0, 2] - 100) < 10, "homography comes from the probe matches"
+
+    # Cover only around 1/8 of the video, which 25/50/75% probes would miss: colour sampling finds it
+    extractor.calls = 0
+    video_path = str(tmp_path / "brief.mp4")
+    total = _write_video(video_path, cover, lambda i: 6 <= i <= 14)
+    cap = cv2.VideoCapture(video_path)
+    detected = detector.detect_best_book(cap, total, min_conf=5.0)
+    cap.release()
+
+    assert detected and detected[0] == "The_Hobbit_book"
+    assert detector.last_probe_count == 3
+    assert extractor.calls == 3, "cover features are reused across videos"
+
+    # No cover anywhere: nothing leads, so verification widens to max_probes
+    video_path = str(tmp_path / "empty.mp4")
+    total = _write_video(video_path, cover, lambda i: False)
+    cap = cv2.VideoCapture(video_path)
+    assert detector.detect_best_book(cap, total, min_conf=5.0) is None
+    cap.release()
+    assert detector.last_probe_count == detector.max_probes
+
+    print("✅ Book detector test passed!")
+
+
+def test_detector_runs_with_tracing_enabled(tmp_path):
+    """Pool threads record their spans into the caller's breakdown while detection is traced."""
+    print("🔍 Testing book detection with tracing enabled...")
+
+    setup_test_environment()
+
+    books_dir = tmp_path / "books"
+    books_dir.mkdir()
+    for name in ("The_Hobbit_book.jpg", "Dracula_book.jpeg"):
+        shutil.copy(f"data/book_images/{name}", books_dir)
+    cover = cv2.resize(cv2.imread("data/book_images/The_Hobbit_book.jpg"), (120, 180))
+
+    image_repository = FileImageRepository(book_movie_path=str(books_dir))
+    book_matcher = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), image_repository)
+    detector = BookDetectorInVideo(book_matcher, image_repository, max_workers=4)
+
+    video_path = str(tmp_path / "always.mp4")
+    total = _write_video(video_path, cover, lambda i: True)
+
+    tracer.reset()
+    tracer.enable()
+    try:
+        cap = cv2.VideoCapture(video_path)
+        with tracer.capture() as breakdown:
+            detected = detector.detect_best_book(cap, total, min_conf=5.0)
+        cap.release()
+    finally:
+        tracer.disable()
+        tracer.reset()
+
+    assert detected and detected[0] == "The_Hobbit_book"
+    stages = breakdown.to_dict()
+    assert stages["sift_detect"]["count"] == 2 + detector.last_probe_count
+    assert "knn_match" in stages
+
+    print("✅ Traced book detector test passed!")
@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+from pathlib import Path
+import cv2
+import pytest
+
+from src.application.use_cases import CatalogIndex, CatalogManager
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.matchers.matcher_factory import create_components
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.memmap_feature_store import MemmapFeatureStore
+from tests.utils import setup_test_environment
+
+
+def test_catalog_manager_applies_deltas():
+    """Added, changed and removed covers reach the index without a rebuild, and compaction keeps results."""
+    print("🔍 Testing incremental catalog updates...")
+
+    setup_test_environment()
+
+    books_dir = Path("data/tests/catalog_updates/books")
+    shutil.rmtree(books_dir.parent, ignore_errors=True)
+    books_dir.mkdir(parents=True)
+    sources = sorted(p for p in Path("data/book_images").iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png"))[:4]
+    for source in sources[:3]:
+        shutil.copy(source, books_dir)
+
+    config = MatcherConfig(downscale=0.5)
+    extractor, matcher = create_components(config)
+    repo = FileImageRepository(book_movie_path=str(books_dir))
+    store = MemmapFeatureStore(str(books_dir.parent / "features.bin"), config.extractor_signature)
+    catalog = CatalogIndex(extractor, matcher, repo, store, compaction_ratio=10.0).build()
+    manager = CatalogManager(catalog, use_watcher=False)
+    assert not manager.refresh()
+
+    def best(source: Path) -> str:
+        results = catalog.match_image(cv2.imread(str(source)), "query", top_k=1)
+        return results[0].target_name if results and results[0].confidence_score > 0 else None
+
+    # Added: only the new cover is extracted and goes to the delta index
+    shutil.copy(sources[3], books_dir)
+    changes = manager.refresh()
+    assert [Path(p).name for p in changes.added] == [sources[3].name] and not changes.changed
+    assert catalog.delta_size == 1 and sum(c.descriptors is not None for c in catalog.covers) == 4
+    assert best(sources[3]) == sources[3].stem
+
+    # Changed: the old entry is tombstoned and the new one appended
+    changed = books_dir / sources[0].name
+    os.utime(changed, ns=(1, 1))
+    changes = manager.refresh()
+    assert [Path(p).name for p in changes.changed] == [sources[0].name]
+    assert len(catalog.removed) == 1 and len(catalog.live_covers) == 4
+
+    # Removed: the cover never comes back from the index
+    (books_dir / sources[1].name).unlink()
+    changes = manager.refresh()
+    assert [Path(p).name for p in changes.removed] == [sources[1].name]
+    assert best(sources[1]) != sources[1].stem
+    assert {c.name for c in catalog.live_covers} == {s.stem for s in (sources[0], sources[2], sources[3])}
+
+    live = [sources[0], sources[2], sources[3]]
+    assert [best(s) for s in live] == [s.stem for s in live]
+    catalog.compact()
+    assert catalog.delta_size == 0 and [best(s) for s in live] == [s.stem for s in live]
+
+    # The store holds exactly the live covers, so a restart extracts nothing
+    restarted = CatalogIndex(extractor, matcher, FileImageRepository(book_movie_path=str(books_dir)),
+                             MemmapFeatureStore(store.cache_path, config.extractor_signature)).build()
+    assert not any(c.is_loaded for c in restarted.covers) and len(restarted.covers) == 3
+
+    # Edits to the book-movie mapping are picked up on the next lookup
+    mapping_path = books_dir.parent / "mapping.json"
+    repo.book_movie_mapping_path = mapping_path
+    mapping_path.write_text(json.dumps({}))
+    movie_name = sorted(os.listdir("data/movie_images"))[0]
+    with pytest.raises(FileNotFoundError):
+        repo.get_movie_image_for_book(sources[2].stem)
+    mapping_path.write_text(json.dumps({sources[2].stem: movie_name}))
+    os.utime(mapping_path, ns=(2, 2))
+    assert repo.get_movie_image_for_book(sources[2].stem).endswith(movie_name)
+
+    print(f"📚 {manager.stats()}")
+    print("✅ Incremental catalog update test passed!")
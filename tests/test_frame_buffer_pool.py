@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+
+from src.application.use_cases import FrameBufferPool, ParallelFrameProcessor
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def test_frames_decode_into_recycled_buffers_and_blend_in_place(tmp_path):
+    """Decoded frames land in pooled buffers, are blended in place and come back for the next batch."""
+    print("🔍 Testing the frame buffer pool...")
+
+    setup_test_environment()
+
+    video_path = str(tmp_path / "input.mp4")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (320, 240))
+    for i in range(20):
+        writer.write(np.full((240, 320, 3), 10 * i, dtype=np.uint8))
+    writer.release()
+
+    pool = FrameBufferPool((240, 320, 3), capacity=10)
+    assert not pool.black.flags.writeable and not pool.black.any()
+
+    book_matcher = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository())
+    processor = ParallelFrameProcessor(book_matcher, max_workers=2)
+
+    batch = processor._extract_frame_batch(video_path, 0, 10, pool)
+    buffers = {id(frame) for _, frame in batch}
+    assert len(buffers) == 10 and pool.stats()["allocated"] == 10
+    assert abs(int(batch[5][1].mean()) - 50) <= 5, "sequential decoding keeps frame order"
+
+    # Blending writes into the frame buffer and matches the float reference within rounding
+    frame = batch[0][1]
+    original = frame.copy()
+    trailer = [np.full((80, 60, 3), 200, dtype=np.uint8)]
+    homography = np.array([[1, 0, 40], [0, 1, 30], [0, 0, 1]], dtype=np.float64)
+    result = processor._process_single_frame_safe(frame, trailer, 0, homography, 320, 240, 0.7)
+    assert result is frame
+    warped = cv2.warpPerspective(cv2.rotate(trailer[0], cv2.ROTATE_90_CLOCKWISE), homography, (320, 240))
+    reference = original.astype(np.float32) * 0.3 + warped.astype(np.float32) * 0.7
+    assert np.abs(result.astype(np.float32) - reference).max() <= 1.0
+
+    for _, frame in batch:
+        pool.release(frame)
+    pool.release(pool.black)
+    batch = processor._extract_frame_batch(video_path, 10, 20, pool)
+    assert {id(frame) for _, frame in batch} == buffers
+    assert pool.stats() == {"allocated": 10, "reused": 10, "idle": 0, "in_use": 10}
+
+    print("✅ Frame buffer pool test passed!")
@@ -0,0 +1,49 @@
+import cv2
+import numpy as np
+
+from src.domain.entities.frame import Frame
+from src.infrastructure.feature_extractors.orb_extractor import ORBExtractor
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from tests.utils import setup_test_environment
+
+
+def test_frame_views_are_computed_once_and_shared(monkeypatch):
+    """Every extractor reading one Frame reuses its grayscale and pyramid levels."""
+    print("🔍 Testing shared frame views...")
+
+    setup_test_environment()
+
+    image = cv2.imread("data/book_images/The_Hobbit_book.jpg")
+    conversions = []
+    convert = cv2.cvtColor
+
+    def counting_convert(src, code, *args, **kwargs):
+        conversions.append(code)
+        return convert(src, code, *args, **kwargs)
+
+    monkeypatch.setattr(cv2, "cvtColor", counting_convert)
+
+    frame = Frame(image, index=7)
+    assert Frame.of(frame) is frame and Frame.of(image).image is image
+
+    sift = SIFTExtractor()
+    shared = sift.extract_features(frame)
+    ORBExtractor().extract_features(frame)
+    SIFTExtractor(downscale=0.5).extract_features(frame)
+    ORBExtractor(downscale=0.5).extract_features(frame)
+    assert conversions == [cv2.COLOR_BGR2GRAY], f"{len(conversions)} conversions"
+
+    # Views are cached for the frame's lifetime, levels are smaller grayscale images
+    assert frame.gray is frame.gray_at(1.0) and frame.gray_at(0.5) is frame.gray_at(0.5)
+    assert frame.gray_at(0.5).shape == (round(image.shape[0] / 2), round(image.shape[1] / 2))
+    assert frame.gray_at(2.0) is frame.gray
+    assert frame.thumbnail(64) is frame.thumbnail(64) and frame.thumbnail(64).shape[1] == 64
+    assert frame.thumbnail(10 ** 5) is image
+
+    # Wrapping changes nothing about the features themselves
+    plain = sift.extract_features(image)
+    assert len(plain.keypoints) == len(shared.keypoints)
+    assert np.array_equal(plain.descriptors, shared.descriptors)
+    assert len(conversions) == 2, "a plain image is converted per call"
+
+    print("✅ Shared frame views test passed!")
@@ -0,0 +1,109 @@
+import threading
+import cv2
+import numpy as np
+import pytest
+
+from src.application.jobs import CancellationToken, JobCancelled
+from src.application.use_cases.frame_processing.parallel_frame_processor import ParallelFrameProcessor
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.application.use_cases.video_processing.segmented_video_renderer import SegmentedVideoRenderer
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.presentation.gui.job_executor import JobExecutor
+from tests.utils import setup_test_environment
+
+
+class FakeRoot:
+    """Stands in for Tk: records after() calls, the test polls by hand"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+        return len(self.scheduled)
+
+    def after_cancel(self, poll_id):
+        pass
+
+
+def test_job_executor_throttles_progress_and_cancels():
+    """Bursts of progress reach the Tk side as one update; a shared token cancels queued and running jobs."""
+    print("🔍 Testing GUI job executor...")
+
+    executor = JobExecutor(FakeRoot(), max_workers=2)
+    progress, results, errors = [], [], []
+
+    def noisy(token, report):
+        for i in range(1000):
+            report(f"frame {i}", i / 10)
+        return "done"
+
+    job = executor.submit(noisy, on_progress=lambda m, p: progress.append(p), on_done=results.append)
+    job.future.result(timeout=10)
+    executor.poll()
+    assert results == ["done"] and progress == [99.9], "progress is coalesced to the latest report"
+
+    token = CancellationToken()
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(job_token, report):
+        started.set()
+        release.wait(10)
+        job_token.raise_if_cancelled()
+        return "finished"
+
+    jobs = [executor.submit(blocking, on_done=results.append, on_error=errors.append, token=token)
+            for _ in range(4)]
+    started.wait(10)
+    token.cancel()
+    release.set()
+    for queued in jobs:
+        try:
+            queued.future.result(timeout=10)
+        except Exception:
+            pass
+    executor.poll()
+    assert len(errors) == 4 and all(isinstance(e, JobCancelled) for e in errors)
+    assert results == ["done"]
+
+    executor.shutdown()
+    print("✅ GUI job executor test passed!")
+
+
+def test_cancel_stops_render_between_segments(tmp_path):
+    """Cancelling mid-render stops at the next segment and keeps finished ones resumable."""
+    print("🔍 Testing cooperative render cancellation...")
+
+    setup_test_environment()
+
+    book = cv2.imread("data/book_images/The_Hobbit_book.jpg")
+    video_path = str(tmp_path / "input.mp4")
+    output_path = str(tmp_path / "output.mp4")
+    total_frames = 30
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (320, 240))
+    for i in range(total_frames):
+        frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+        frame[30:210, 20 + i:140 + i] = cv2.resize(book, (120, 180))
+        writer.write(frame)
+    writer.release()
+    trailer_frames = [np.full((80, 60, 3), i * 5, dtype=np.uint8) for i in range(total_frames)]
+
+    book_matcher = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository())
+    renderer = SegmentedVideoRenderer(ParallelFrameProcessor(book_matcher, max_workers=2), segment_frames=10)
+    token = CancellationToken()
+
+    def cancel_after_first_segment(message, percent):
+        if message.startswith("Rendered segment"):
+            token.cancel()
+
+    with pytest.raises(JobCancelled):
+        renderer.render(video_path, trailer_frames, None, "The_Hobbit_book", "data/book_images/The_Hobbit_book.jpg",
+                        book, np.eye(3), output_path, total_frames, 25, 320, 240, 0.7,
+                        cancel_after_first_segment, token)
+
+    manifest = renderer.find_resumable(video_path, output_path, total_frames, 25, 320, 240)
+    assert [s.index for s in manifest.completed_segments] == [0]
+
+    print("✅ Render cancellation test passed!")
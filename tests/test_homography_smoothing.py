@@ -0,0 +1,81 @@
+import cv2
+import numpy as np
+
+from src.application.use_cases import HomographySmoother, HomographyTracker, ParallelFrameProcessor
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def _shift(dx: float, dy: float = 0.0) -> np.ndarray:
+    return np.array([[1, 0, dx], [0, 1, dy], [0, 0, 1]], dtype=np.float64)
+
+
+class CountingExtractor(SIFTExtractor):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def extract_features(self, image):
+        self.calls += 1
+        return super().extract_features(image)
+
+
+def test_smoother_damps_jitter_and_rejects_outliers():
+    """Jitter shrinks, failed or wild estimates hold the last placement, a lasting jump is re-acquired."""
+    print("🔍 Testing homography smoothing...")
+
+    rng = np.random.default_rng(0)
+    smoother = HomographySmoother((100, 150), smoothing=0.3, max_misses=3)
+    raw, smoothed = [], []
+    for _ in range(50):
+        estimate = _shift(50 + rng.normal(0, 2), 40 + rng.normal(0, 2))
+        raw.append(estimate[0, 2])
+        smoothed.append(smoother.update(estimate)[0, 2])
+    assert np.std(np.diff(smoothed[10:])) < np.std(np.diff(raw[10:])) / 2
+
+    held = smoother.current
+    assert np.allclose(smoother.update(None), held)
+    assert np.allclose(smoother.update(_shift(400, 300)), held) and smoother.rejected == 1
+    assert np.allclose(smoother.update(np.diag([-1.0, 1.0, 1.0])), held), "mirrored covers are degenerate"
+
+    # The third miss in a row lets the next estimate through
+    assert abs(smoother.update(_shift(400, 300))[0, 2] - 400) < 1e-3
+
+    tracker = HomographyTracker((100, 150), _shift(0), detect_every=10)
+    homographies = tracker.track(list(range(0, 10)), {0: _shift(0), 10: _shift(20)})
+    assert [round(H[0, 2], 3) for H in homographies[:6:5]] == [0.0, 10.0]
+    assert tracker.has(10) and not tracker.is_keyframe(5)
+
+    print("✅ Homography smoothing test passed!")
+
+
+def test_detect_every_matches_only_keyframes(tmp_path):
+    """With detect_every=5, only every fifth frame is matched and every frame is still rendered."""
+    print("🔍 Testing keyframe-only matching in the frame processor...")
+
+    setup_test_environment()
+
+    book = cv2.imread("data/book_images/The_Hobbit_book.jpg")
+    video_path, output_path = str(tmp_path / "input.mp4"), str(tmp_path / "output.mp4")
+    total_frames = 30
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (320, 240))
+    for i in range(total_frames):
+        frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+        frame[30:210, 20 + i:140 + i] = cv2.resize(book, (120, 180))
+        writer.write(frame)
+    writer.release()
+    trailer_frames = [np.full((80, 60, 3), i * 5, dtype=np.uint8) for i in range(total_frames)]
+
+    extractor = CountingExtractor()
+    book_matcher = FindMatchingBookMovieUseCase(extractor, FLANNMatcher(), FileImageRepository())
+    processor = ParallelFrameProcessor(book_matcher, max_workers=2, detect_every=5)
+    replaced = processor.process_frames(video_path, trailer_frames, book, np.eye(3), output_path,
+                                        total_frames, 25, 320, 240, 0.7, None, 0, total_frames)
+
+    assert replaced == total_frames
+    assert extractor.calls == 1 + total_frames // 5, f"{extractor.calls} extractions"
+
+    print("✅ Keyframe-only matching test passed!")
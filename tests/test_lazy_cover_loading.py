@@ -0,0 +1,53 @@
+from dataclasses import asdict, replace
+
+import cv2
+
+from src.application.use_cases import CatalogIndex
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.matchers.matcher_factory import create_components
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.memmap_feature_store import MemmapFeatureStore
+from tests.utils import setup_test_environment
+
+
+def test_cover_images_load_lazily():
+    """Listing reads headers only, cached catalog builds decode nothing, the shared LRU bounds decoded covers."""
+    print("🔍 Testing lazy cover loading...")
+
+    setup_test_environment()
+
+    repo = FileImageRepository()
+    covers = repo.load_book_movie_images()
+    assert covers and not any(c.is_loaded for c in covers)
+    first = covers[0]
+    h, w = cv2.imread(first.image_path).shape[:2]
+    assert first.size == (w, h)
+    assert first.image.shape[:2] == (h, w) and first.is_loaded
+    assert sum(c.is_loaded for c in covers) == 1
+
+    # Copying or printing a cover never decodes it
+    untouched = covers[1]
+    repr(untouched)
+    copy = replace(untouched, keypoints=None)
+    asdict(untouched)
+    assert not untouched.is_loaded and not copy.is_loaded
+    assert copy.image is not None and copy.is_loaded and not untouched.is_loaded
+
+    config = MatcherConfig(downscale=0.5)
+    extractor, matcher = create_components(config)
+    cache_path = "data/tests/lazy_covers/features.bin"
+    CatalogIndex(extractor, matcher, repo, MemmapFeatureStore(cache_path, config.extractor_signature)).build()
+    cached = CatalogIndex(extractor, matcher, FileImageRepository(),
+                          MemmapFeatureStore(cache_path, config.extractor_signature)).build()
+    assert not any(c.is_loaded for c in cached.covers), "a warm catalog must not touch pixel data"
+
+    lru_repo = FileImageRepository(image_cache_size=2)
+    covers = lru_repo.load_book_movie_images()[:3]
+    for cover in covers + covers[:1]:
+        assert cover.image is not None
+    assert not any(c.is_loaded for c in covers), "LRU-backed covers must not pin their pixels"
+    info = lru_repo.image_cache_info()
+    assert (info.misses, info.currsize, info.maxsize) == (4, 2, 2)
+    assert covers[2].image is covers[2].image and lru_repo.image_cache_info().hits == 2
+
+    print("✅ Lazy cover loading test passed!")
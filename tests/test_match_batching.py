@@ -0,0 +1,90 @@
+import threading
+import time
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from src.application.use_cases.catalog.catalog_index import CatalogIndex
+from src.application.use_cases.catalog.match_batcher import MatchBatcher
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def test_batched_queries_match_individual_queries():
+    """Queries sharing one stacked kNN search get the same shortlist as solo queries."""
+    print("🔍 Testing micro-batched catalog matching...")
+
+    setup_test_environment()
+
+    extractor = SIFTExtractor()
+    catalog = CatalogIndex(extractor, FLANNMatcher(), FileImageRepository()).build()
+
+    names = ["Hobbit", "Fellowship_2", "Tower"]
+    features = [extractor.extract_features(cv2.imread(f"data/input_images/{n}.jpg")) for n in names]
+    solo = [catalog.rank_candidates(catalog.search(f.descriptors), 5) for f in features]
+
+    # A long window and a batch size equal to the query count force one shared batch
+    with MatchBatcher(catalog, max_batch_size=len(features), max_wait_ms=2000) as batcher:
+        with ThreadPoolExecutor(max_workers=len(features)) as executor:
+            batched = list(executor.map(lambda f: batcher.submit(f.descriptors).result(), features))
+        stats = batcher.stats()
+
+    assert stats["batches"] == 1 and stats["queries"] == len(features), stats
+
+    for name, feature, solo_candidates, index_matches in zip(names, features, solo, batched):
+        # Match indices must be rebased onto each query's own descriptors
+        assert all(0 <= m.queryIdx < len(feature.descriptors) for m in index_matches)
+        batched_covers = [c for c, _ in catalog.rank_candidates(index_matches, 5)]
+        assert batched_covers[0] == solo_candidates[0][0], f"{name}: batched shortlist differs"
+        print(f"📖 {name}: {catalog.covers[batched_covers[0]].name}")
+
+    print("✅ Micro-batching test passed!")
+
+
+class _SlowCatalog:
+    """Catalog stand-in whose search blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def search(self, descriptors):
+        self.release.wait(timeout=10)
+        return []
+
+
+def test_close_resolves_every_future():
+    """Queries still queued at close fail instead of hanging, and closed batchers reject new ones."""
+    print("🔍 Testing match batcher shutdown...")
+
+    setup_test_environment()
+
+    catalog = _SlowCatalog()
+    batcher = MatchBatcher(catalog, max_batch_size=1, max_wait_ms=0)
+    descriptors = np.ones((4, 128), dtype=np.float32)
+    running = batcher.submit(descriptors)
+    time.sleep(0.1)  # Let the worker take the first query into its search
+    queued = batcher.submit(descriptors)
+
+    batcher.close(timeout=0.1)
+    try:
+        queued.result(timeout=1)
+        assert False, "a query queued at close must fail"
+    except RuntimeError as e:
+        assert "closed" in str(e)
+    try:
+        batcher.submit(descriptors)
+        assert False, "a closed batcher must reject queries"
+    except RuntimeError:
+        pass
+
+    # The query already in its search still completes
+    catalog.release.set()
+    assert running.result(timeout=5) == []
+    assert batcher.stats()["queries"] == 1
+    # ...and the worker then stops instead of waiting on the queue forever
+    batcher._worker.join(timeout=5)
+    assert not batcher._worker.is_alive(), "the worker must exit after a timed-out close"
+
+    print("✅ Match batcher shutdown test passed!")
@@ -0,0 +1,79 @@
+from src.application.interfaces.feature_extractor_interface import ExtractFeatureData
+from src.application.use_cases.evaluation import (
+    MatcherAutoTuner, SyntheticFixtureGenerator, default_search_space, synthetic_queries
+)
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.matchers.matcher_factory import create_components, load_matcher_config, save_matcher_config
+from src.infrastructure.repositories.file_feature_store import FileFeatureStore
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def test_auto_tune_respects_latency_budget():
+    """The tuner picks the most accurate setting within budget, else the fastest, and the choice persists."""
+    print("🔍 Testing matcher auto-tuning...")
+
+    setup_test_environment()
+
+    repo = FileImageRepository()
+    fixtures = SyntheticFixtureGenerator(repo, "data/tests/tuning", seed=5, max_covers=2)
+    queries = synthetic_queries(fixtures.cover_photos(per_cover=1))
+
+    candidates = [
+        MatcherConfig(name="kdtree_t1_c16", downscale=0.5, trees=1, checks=16),
+        MatcherConfig(name="kmeans_b16_c32", downscale=0.5, algorithm="kmeans", branching=16, checks=32),
+        MatcherConfig(name="lsh_orb", extractor="orb", max_keypoints=1000, algorithm="lsh")
+    ]
+
+    chosen, rows = MatcherAutoTuner(repo, queries, create_components, latency_budget_ms=1e6).tune(candidates)
+    assert len(rows) == 3 and all(r["within_budget"] for r in rows)
+    best_accuracy = max(r["top1_accuracy"] for r in rows)
+    assert next(r for r in rows if r["name"] == chosen.name)["top1_accuracy"] == best_accuracy
+
+    chosen, rows = MatcherAutoTuner(repo, queries, create_components, latency_budget_ms=0).tune(candidates)
+    assert chosen.name == min(rows, key=lambda r: r["mean_latency_ms"])["name"]
+
+    path = "data/tests/tuning/matcher_config.json"
+    save_matcher_config(chosen, path)
+    assert load_matcher_config(path) == chosen
+    assert load_matcher_config("data/tests/tuning/missing.json") == MatcherConfig()
+
+    # Features cached under other extractor settings are not reused
+    cache_path = "data/tests/tuning/features.npz"
+    cover_path = fixtures.covers[0].image_path
+    FileFeatureStore(cache_path, MatcherConfig().extractor_signature).save_features(
+        {cover_path: ExtractFeatureData([], None)}
+    )
+    assert FileFeatureStore(cache_path, MatcherConfig().extractor_signature).load_features(cover_path) is not None
+    assert FileFeatureStore(cache_path, candidates[2].extractor_signature).load_features(cover_path) is None
+
+    for row in rows:
+        print(f"🎛️ {row['name']}: top1={row['top1_accuracy']:.2f} mean={row['mean_latency_ms']:.1f}ms")
+    print("✅ Matcher tuning test passed!")
+
+
+def test_matcher_config_rejects_unsearchable_pairings(tmp_path):
+    """Extractor and index must agree on float or binary descriptors, and saved configs are checked on load."""
+    print("🔍 Testing matcher config validation...")
+
+    setup_test_environment()
+
+    for kwargs in (dict(extractor="orb"), dict(extractor="orb", algorithm="kmeans"),
+                   dict(algorithm="lsh"), dict(extractor="akaze"), dict(algorithm="brute")):
+        try:
+            MatcherConfig(**kwargs)
+            assert False, f"Expected {kwargs} to be rejected"
+        except ValueError as e:
+            print(f"   {kwargs}: {e}")
+
+    # A hand-edited config with a bad pairing falls back to the defaults
+    path = tmp_path / "matcher_config.json"
+    path.write_text('{"extractor": "sift", "algorithm": "lsh"}', encoding="utf-8")
+    assert load_matcher_config(path) == MatcherConfig()
+
+    # The search space only pairs each extractor with indexes that can search it
+    for base in (MatcherConfig(), MatcherConfig(extractor="orb", algorithm="lsh")):
+        assert all(MatcherConfig(**c.to_dict()) == c for c in default_search_space(base))
+    assert [c.algorithm for c in default_search_space(MatcherConfig(extractor="orb", algorithm="lsh"))] == ["lsh"]
+
+    print("✅ Matcher config validation test passed!")
@@ -0,0 +1,58 @@
+import os
+import shutil
+import cv2
+import numpy as np
+
+from src.application.use_cases import CatalogIndex
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.matchers.matcher_factory import create_components
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.memmap_feature_store import MemmapFeatureStore
+from tests.utils import setup_test_environment
+
+
+def test_memmap_feature_store_shares_catalog():
+    """Catalog features round-trip through the mapped file, cached covers are never decoded, stale entries are dropped."""
+    print("🔍 Testing memory-mapped feature store...")
+
+    setup_test_environment()
+
+    books_dir = "data/tests/memmap/books"
+    shutil.rmtree("data/tests/memmap", ignore_errors=True)
+    os.makedirs(books_dir)
+    for name in sorted(os.listdir("data/book_images"))[:3]:
+        shutil.copy(os.path.join("data/book_images", name), books_dir)
+
+    config = MatcherConfig(downscale=0.5)
+    cache_path = "data/tests/memmap/features.bin"
+    repo = FileImageRepository(book_movie_path=books_dir)
+
+    extractor, matcher = create_components(config)
+    fresh = CatalogIndex(extractor, matcher, repo, MemmapFeatureStore(cache_path, config.extractor_signature)).build()
+
+    store = MemmapFeatureStore(cache_path, config.extractor_signature)
+    cached = CatalogIndex(extractor, matcher, repo, store).build()
+    assert [c.name for c in cached.covers] == [c.name for c in fresh.covers]
+    for before, after in zip(fresh.covers, cached.covers):
+        assert not after.is_loaded, "covers with stored features must not be decoded"
+        assert isinstance(after.descriptors, np.memmap)
+        assert np.array_equal(before.descriptors, after.descriptors)
+        assert len(before.keypoints) == len(after.keypoints)
+        assert before.keypoints[-1].pt == after.keypoints[-1].pt
+
+    query = cv2.imread(fresh.covers[1].image_path)
+    expected = fresh.match_image(query, "query", top_k=1)[0]
+    result = cached.match_image(query, "query", top_k=1)[0]
+    assert (result.target_name, result.confidence_score) == (expected.target_name, expected.confidence_score)
+
+    # Other extractor settings or a changed cover invalidate the stored features
+    assert MemmapFeatureStore(cache_path, MatcherConfig().extractor_signature).load_features(
+        fresh.covers[0].image_path) is None
+    changed = fresh.covers[0].image_path
+    os.utime(changed, ns=(0, 0))
+    assert MemmapFeatureStore(cache_path, config.extractor_signature).load_features(changed) is None
+    rebuilt = CatalogIndex(extractor, matcher, repo, MemmapFeatureStore(cache_path, config.extractor_signature)).build()
+    assert rebuilt.last_build["extracted"] == 1
+
+    print(f"📦 {os.path.getsize(cache_path) / 1024:.0f} KB for {len(cached.covers)} covers")
+    print("✅ Memory-mapped feature store test passed!")
@@ -0,0 +1,181 @@
+import asyncio
+import cv2
+import numpy as np
+
+from src.application.use_cases import (
+    AsyncFrameProcessor, FrameBufferPool, FrameMemoryBudget, HomographyTrackAnalyzer, ParallelFrameProcessor,
+    ProcessInputVideoUseCase, TrailerFrames
+)
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.file_video_repository import FileVideoRepository
+from tests.utils import setup_test_environment
+
+
+class PeakPool(FrameBufferPool):
+    """Records the most buffers handed out at once"""
+
+    peak = 0
+
+    def acquire(self, timeout=None):
+        buffer = super().acquire(timeout)
+        PeakPool.peak = max(PeakPool.peak, self.stats()["in_use"])
+        return buffer
+
+
+def test_budget_sizes_queues_from_frame_bytes():
+    """The same byte budget holds fewer frames as the resolution grows."""
+    print("🔍 Testing the frame memory budget...")
+
+    setup_test_environment()
+
+    trailer = [np.zeros((100, 100, 3), dtype=np.uint8)] * 10  # 300 KB
+    small = FrameMemoryBudget(128 * 2 ** 20, (240, 320, 3), 2, trailer)
+    large = FrameMemoryBudget(128 * 2 ** 20, (1080, 1920, 3), 2, trailer)
+
+    assert small.trailer_bytes == 300_000 and large.scratch_bytes == 2 * 1080 * 1920 * 3
+    assert small.batch_size == FrameMemoryBudget.MAX_BATCH and large.batch_size < small.batch_size
+    assert large.max_frames == (128 * 2 ** 20 - 300_000 - 2 * 1080 * 1920 * 3) // (1080 * 1920 * 3)
+    for budget in (small, large):
+        assert budget.resident_bytes <= budget.budget_bytes
+        assert 2 * budget.queue_size + budget.batch_size <= budget.max_frames
+
+    # The smallest budget holds one frame per stage; anything less is rejected up front
+    frame_bytes = 1080 * 1920 * 3
+    smallest = FrameMemoryBudget(300_000 + 5 * frame_bytes, (1080, 1920, 3), 2, trailer)
+    assert smallest.max_frames == FrameMemoryBudget.MIN_FRAMES and smallest.batch_size == 1
+    assert smallest.resident_bytes == smallest.budget_bytes
+    for budget_bytes, frames in ((2 ** 20, ()), (300_000 + 5 * frame_bytes - 1, trailer)):
+        try:
+            FrameMemoryBudget(budget_bytes, (1080, 1920, 3), 2, frames)
+            assert False, "Expected a too-small budget to be rejected"
+        except ValueError as e:
+            assert "too small" in str(e)
+
+    # A limited pool blocks once every buffer is out
+    pool = FrameBufferPool((4, 4, 3), limit=2)
+    first, second = pool.acquire(), pool.acquire()
+    assert pool.acquire(timeout=0.05) is None
+    pool.release(first)
+    assert pool.acquire(timeout=0.05) is first
+    pool.release(second)
+    pool.release(second)
+    assert pool.stats()["in_use"] == 1
+
+    print("✅ Frame memory budget test passed!")
+
+
+def test_trailer_frames_decode_on_demand(tmp_path):
+    """A streamed trailer serves any index in order or out of it, keeping only its cache resident."""
+    print("🔍 Testing on-demand trailer decoding...")
+
+    setup_test_environment()
+
+    trailer_path = str(tmp_path / "trailer.mp4")
+    writer = cv2.VideoWriter(trailer_path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (64, 48))
+    for i in range(30):
+        writer.write(np.full((48, 64, 3), 8 * i, dtype=np.uint8))
+    writer.release()
+
+    trailer = TrailerFrames(trailer_path, cache_frames=4)
+    assert len(trailer) == 30 and trailer.nbytes == 4 * 64 * 48 * 3
+    # Two interleaved readers (parallel segments), then a jump back and the last frame
+    for idx in (0, 20, 1, 21, 2, 22, 5, 29, 3):
+        assert abs(trailer[idx].mean() - 8 * idx) < 4, f"frame {idx}"
+        assert len(trailer._cache) <= 4
+    assert trailer[-1] is trailer[29]
+    trailer.close()
+
+    print("✅ On-demand trailer test passed!")
+
+
+def test_renders_stay_within_a_tight_budget(tmp_path, monkeypatch):
+    """With room for a handful of frames, both processors still replace every frame in order."""
+    print("🔍 Testing bounded rendering under a tight memory budget...")
+
+    setup_test_environment()
+
+    video_path = str(tmp_path / "input.mp4")
+    total_frames = 40
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (320, 240))
+    for i in range(total_frames):
+        writer.write(np.full((240, 320, 3), 5 * i, dtype=np.uint8))
+    writer.release()
+
+    book = np.full((180, 120, 3), 128, dtype=np.uint8)
+    trailer = [np.full((80, 60, 3), 200, dtype=np.uint8)]
+    frame_bytes = 240 * 320 * 3
+    budget_bytes = trailer[0].nbytes + 8 * frame_bytes  # 2 warp canvases, 6 frames in flight
+    book_matcher = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository())
+    monkeypatch.setattr("src.application.use_cases.frame_processing.frame_buffer_pool.FrameBufferPool", PeakPool)
+
+    processors = {
+        "parallel": ParallelFrameProcessor(book_matcher, max_workers=2, memory_budget=budget_bytes),
+        "async": AsyncFrameProcessor(book_matcher, max_workers=2, memory_budget=budget_bytes)
+    }
+    for name, processor in processors.items():
+        PeakPool.peak = 0
+        output_path = str(tmp_path / f"{name}.mp4")
+        # An empty book region keeps the base homography, so only the budget is under test
+        replaced = processor.process_frames(video_path, trailer, book, np.eye(3), output_path,
+                                            total_frames, 25, 320, 240, 0.5, None, 0, total_frames)
+        if asyncio.iscoroutine(replaced):
+            replaced = asyncio.run(replaced)
+
+        assert replaced == total_frames, f"{name}: {replaced} frames"
+        assert PeakPool.peak <= 6, f"{name}: {PeakPool.peak} frames in flight"
+        peak_bytes = trailer[0].nbytes + 2 * frame_bytes + PeakPool.peak * frame_bytes
+        assert peak_bytes <= budget_bytes, f"{name}: {peak_bytes} bytes resident"
+
+        cap = cv2.VideoCapture(output_path)
+        means = []
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            means.append(frame[200:, 200:].mean())
+        cap.release()
+        assert len(means) == total_frames
+        assert all(a <= b + 5 for a, b in zip(means, means[1:])), f"{name}: frames out of order"
+
+    print("✅ Bounded rendering test passed!")
+
+
+def test_too_small_budget_fails_the_video_before_analysis(tmp_path):
+    """execute() reports a budget that cannot hold the render as an error result, without analyzing."""
+    print("🔍 Testing budget validation before analysis...")
+
+    setup_test_environment()
+
+    videos_dir = tmp_path / "videos"
+    videos_dir.mkdir()
+    for path, size in ((tmp_path / "input.mp4", (320, 240)), (videos_dir / "The_Hobbit_book.mp4", (80, 60))):
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), 25, size)
+        for _ in range(5):
+            writer.write(np.full((size[1], size[0], 3), 90, dtype=np.uint8))
+        writer.release()
+
+    book_matcher = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository())
+    analyzer = HomographyTrackAnalyzer(book_matcher, max_workers=2)
+    analyzed = []
+    analyzer.load_or_analyze = lambda *args, **kwargs: analyzed.append(args)
+
+    frame_bytes = 240 * 320 * 3
+    # Room for the frames (2 canvases, 3 in flight) but not for the trailer's cache on top
+    for budget_bytes in (2 ** 20, 5 * frame_bytes):
+        processor = ParallelFrameProcessor(book_matcher, max_workers=2, track_analyzer=analyzer,
+                                           memory_budget=budget_bytes)
+        use_case = ProcessInputVideoUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository(),
+                                            FileVideoRepository(input_path=str(videos_dir)), processor, min_conf=1.0)
+        book = cv2.imread("data/book_images/The_Hobbit_book.jpg")
+        use_case.book_detector.detect = lambda *args: (
+            ("The_Hobbit_book", "data/book_images/The_Hobbit_book.jpg", book, np.eye(3)), 10.0, 3)
+
+        result = use_case.execute(str(tmp_path / "input.mp4"), str(tmp_path / "output.mp4"))
+        assert not result.success and "too small" in result.error_message, result.error_message
+        assert not analyzed, "analysis should not run"
+        assert not (tmp_path / "output.mp4").exists()
+
+    print("✅ Budget validation test passed!")
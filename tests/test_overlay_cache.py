@@ -0,0 +1,83 @@
+import os
+import shutil
+import cv2
+import numpy as np
+
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.file_overlay_cache import FileOverlayCache
+from tests.utils import setup_test_environment
+
+
+class CountingExtractor(SIFTExtractor):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def extract_features(self, image):
+        self.calls += 1
+        return super().extract_features(image)
+
+
+def test_overlay_cache_hits_skip_matching():
+    """Repeated overlay comparisons are served from the cache by content, and the cache stays within its byte budget."""
+    print("🔍 Testing content-addressed overlay cache...")
+
+    setup_test_environment()
+
+    cache_dir = "data/tests/overlay_cache"
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    input_image = "data/input_images/Tower.jpg"
+    book_image = "data/book_images/The_Lord_Of_The_Rings_Towers_book.png"
+
+    extractor = CountingExtractor()
+    cache = FileOverlayCache(cache_dir)
+    use_case = FindMatchingBookMovieUseCase(extractor, FLANNMatcher(), FileImageRepository(), overlay_cache=cache)
+
+    first = use_case.execute_single_comparison_with_overlay(input_image, book_image, enable_overlay=True)
+    assert first.overlay_image_path and extractor.calls == 2
+    second = use_case.execute_single_comparison_with_overlay(input_image, book_image, enable_overlay=True)
+    assert extractor.calls == 2, "a cache hit must skip matching"
+    assert second.overlay_image_path == first.overlay_image_path
+    assert second.good_matches_count == first.good_matches_count
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Same stem, different bytes: a different entry instead of a collision
+    other_dir = "data/tests/overlay_cache_inputs"
+    shutil.rmtree(other_dir, ignore_errors=True)
+    os.makedirs(other_dir)
+    flipped = f"{other_dir}/Tower.jpg"
+    cv2.imwrite(flipped, cv2.flip(cv2.imread(input_image), 1))
+    third = use_case.execute_single_comparison_with_overlay(flipped, book_image, enable_overlay=True)
+    assert extractor.calls == 4 and third.overlay_image_path != first.overlay_image_path
+
+    # A new cache over the same folder keeps the entries; a small budget evicts the oldest
+    reopened = FileOverlayCache(cache_dir, max_bytes=cache.stats()["bytes"] - 1)
+    assert reopened.stats()["entries"] == 2
+    reopened.put("0" * 64, np.zeros((8, 8, 3), np.uint8), {})
+    stats = reopened.stats()
+    assert stats["evictions"] >= 1 and stats["bytes"] <= stats["max_bytes"]
+
+    print(f"🗃️ {cache.stats()}")
+    print("✅ Overlay cache test passed!")
+
+
+def test_overlay_cache_missing_input_returns_error_result():
+    """With a cache configured, an unreadable input still gives an error MatchResult instead of raising."""
+    print("🔍 Testing the overlay cache with a missing input...")
+
+    setup_test_environment()
+
+    cache = FileOverlayCache("data/tests/overlay_cache_missing")
+    use_case = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository(), overlay_cache=cache)
+
+    result = use_case.execute_single_comparison_with_overlay(
+        "data/input_images/does_not_exist.jpg", "data/book_images/The_Lord_Of_The_Rings_Towers_book.png",
+        enable_overlay=True
+    )
+    assert result.error_message is not None and result.overlay_image_path is None
+    assert cache.stats()["entries"] == 0
+
+    print("✅ Missing input with overlay cache test passed!")
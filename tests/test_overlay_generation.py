@@ -1,4 +1,5 @@
 import cv2
+from src.application.use_cases.catalog.catalog_index import CatalogIndex
 from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
 from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
 from src.infrastructure.matchers.flann_matcher import FLANNMatcher
@@ -6,6 +7,16 @@ from src.infrastructure.repositories.file_image_repository import FileImageRepos
 from tests.utils import setup_test_environment, OverlayTestHelper
 
 
+class CountingExtractor(SIFTExtractor):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def extract_features(self, image):
+        self.calls += 1
+        return super().extract_features(image)
+
+
 def test_overlay_comparison():
     """Test creation of comparison image."""
     print("🔍 Testing Comparison Image Creation...")
@@ -53,5 +64,33 @@ def test_overlay_comparison():
     return True
 
 
+def test_overlay_reuses_match_features():
+    """Overlay generation reuses the match's keypoints: one SIFT pass per image in total."""
+    print("🔍 Testing overlay feature reuse...")
+
+    setup_test_environment()
+
+    input_image = "data/input_images/Tower.jpg"
+    book_image = "data/book_images/The_Lord_Of_The_Rings_Towers_book.png"
+    extractor = CountingExtractor()
+    use_case = FindMatchingBookMovieUseCase(extractor, FLANNMatcher(), FileImageRepository())
+
+    result = use_case.execute_single_comparison_with_overlay(input_image, book_image, enable_overlay=True)
+    assert result.overlay_image_path and extractor.calls == 2
+    assert result.source_keypoints is not None and result.target_keypoints is not None
+
+    # Catalog matches carry both keypoint sets, so the overlay adds no extraction at all
+    catalog = CatalogIndex(extractor, FLANNMatcher(), FileImageRepository()).build()
+    image = cv2.imread(input_image)
+    best = catalog.match_image(image, "Tower", top_k=1)[0]
+    cover = next(c for c in catalog.covers if c.image_path == best.target_image_path)
+    calls = extractor.calls
+    use_case.render_overlay(image, input_image, cover, best)
+    assert best.overlay_image_path and extractor.calls == calls
+    assert not cover.is_loaded, "the cover's header size is enough for the warp"
+
+    print("✅ Overlay feature reuse test passed!")
+
+
 if __name__ == "__main__":
     test_overlay_comparison()
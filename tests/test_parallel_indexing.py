@@ -0,0 +1,42 @@
+import shutil
+import numpy as np
+
+from src.application.use_cases import CatalogIndex
+from src.domain.entities.matcher_config import MatcherConfig
+from src.infrastructure.feature_extractors.process_pool_extractor import ProcessPoolFeatureExtractor
+from src.infrastructure.matchers.matcher_factory import create_components
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.memmap_feature_store import MemmapFeatureStore
+from tests.utils import setup_test_environment
+
+
+def test_parallel_index_build_matches_serial():
+    """A process pool build extracts the same features as the serial one, reports progress and writes the store once."""
+    print("🔍 Testing parallel catalog indexing...")
+
+    setup_test_environment()
+
+    config = MatcherConfig(downscale=0.5)
+    extractor, matcher = create_components(config)
+    serial = CatalogIndex(extractor, matcher, FileImageRepository()).build()
+
+    shutil.rmtree("data/tests/parallel_index", ignore_errors=True)
+    progress = []
+    store = MemmapFeatureStore("data/tests/parallel_index/features.bin", config.extractor_signature)
+    parallel = CatalogIndex(
+        extractor, matcher, FileImageRepository(), store,
+        batch_extractor=ProcessPoolFeatureExtractor(config, workers=2)
+    ).build(progress_callback=lambda done, total, rate: progress.append((done, total)))
+
+    assert [c.name for c in parallel.covers] == [c.name for c in serial.covers]
+    for a, b in zip(serial.covers, parallel.covers):
+        assert np.array_equal(a.descriptors, b.descriptors)
+        assert len(a.keypoints) == len(b.keypoints) and a.keypoints[0].pt == b.keypoints[0].pt
+    assert not any(c.is_loaded for c in parallel.covers), "workers decode, the parent does not"
+    assert progress[-1] == (len(serial.covers), len(serial.covers))
+    assert parallel.last_build["extracted"] == len(serial.covers)
+    assert parallel.last_build["extraction_covers_per_second"] > 0
+    assert len(store.header["covers"]) == len(serial.covers)
+
+    print(f"⚙️ {parallel.last_build['extraction_covers_per_second']:.1f} covers/s with 2 workers")
+    print("✅ Parallel catalog indexing test passed!")
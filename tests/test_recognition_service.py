@@ -0,0 +1,69 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from src.presentation.http.server import RecognitionService, create_server
+from tests.utils import setup_test_environment
+
+
+def _post(url: str, body: bytes):
+    request = urllib.request.Request(url, data=body, method="POST",
+                                     headers={"Content-Type": "application/octet-stream"})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return response.status, response.headers.get("Content-Type"), response.read()
+
+
+def test_recognition_service_over_localhost():
+    """Match, overlay and metrics endpoints against a warm in-process server."""
+    print("🔍 Testing local HTTP recognition service...")
+
+    setup_test_environment()
+
+    service = RecognitionService(max_batch_size=8, max_wait_ms=20)
+    server = create_server(service, "127.0.0.1", 0)
+    base_url = "http://127.0.0.1:%d" % server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        with open("data/input_images/Tower.jpg", "rb") as f:
+            tower = f.read()
+        with open("data/input_images/Hobbit.jpg", "rb") as f:
+            hobbit = f.read()
+
+        # Concurrent requests share kNN batches
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(
+                lambda body: _post(f"{base_url}/match?top_k=3", body), [tower, hobbit, tower, hobbit]
+            ))
+
+        for (status, content_type, payload), expected in zip(responses, ["Towers", "Hobbit", "Towers", "Hobbit"]):
+            assert status == 200 and content_type == "application/json"
+            matches = json.loads(payload)["matches"]
+            assert 0 < len(matches) <= 3
+            assert expected in matches[0]["target_name"], f"Unexpected best match: {matches[0]['target_name']}"
+
+        status, content_type, payload = _post(f"{base_url}/overlay", tower)
+        assert status == 200 and content_type == "image/jpeg" and payload[:2] == b"\xff\xd8"
+
+        try:
+            _post(f"{base_url}/match", b"not an image")
+            assert False, "Undecodable body should be rejected"
+        except urllib.error.HTTPError as e:
+            assert e.code == 400
+
+        with urllib.request.urlopen(f"{base_url}/metrics", timeout=30) as response:
+            metrics = json.loads(response.read())
+        assert metrics["endpoints"]["/match"]["count"] >= 4
+        assert "p99_ms" in metrics["endpoints"]["/match"]
+        assert metrics["batching"]["queries"] == 5
+
+        print(f"📊 Metrics: {metrics['endpoints']['/match']}")
+        print(f"📦 Mean batch size: {metrics['batching']['mean_batch_size']:.2f}")
+        print("✅ Recognition service test passed!")
+
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
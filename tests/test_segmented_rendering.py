@@ -0,0 +1,84 @@
+import cv2
+import numpy as np
+
+from src.application.use_cases.frame_processing.parallel_frame_processor import ParallelFrameProcessor
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.application.use_cases.video_processing.segmented_video_renderer import SegmentedVideoRenderer
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def _write_synthetic_video(path: str, book: np.ndarray, frames: int, w: int = 320, h: int = 240):
+    """Write a short video with the book cover sliding across a flat background."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (w, h))
+    bh, bw = book.shape[:2]
+    for i in range(frames):
+        frame = np.full((h, w, 3), 90, dtype=np.uint8)
+        placement = np.array([[120 / bw, 0, 20 + i], [0, 180 / bh, 30], [0, 0, 1]])
+        cv2.warpPerspective(book, placement, (w, h), dst=frame, borderMode=cv2.BORDER_TRANSPARENT)
+        writer.write(frame)
+    writer.release()
+
+
+def test_segmented_render_resumes_after_crash(tmp_path):
+    """A crash mid-render keeps finished segments; the restart only renders the rest."""
+    print("🔍 Testing segmented, resumable rendering...")
+
+    setup_test_environment()
+
+    book = cv2.imread("data/book_images/The_Hobbit_book.jpg")
+    video_path = str(tmp_path / "input.mp4")
+    output_path = str(tmp_path / "output.mp4")
+    total_frames = 30
+    _write_synthetic_video(video_path, book, total_frames)
+    trailer_frames = [np.full((80, 60, 3), i * 5, dtype=np.uint8) for i in range(total_frames)]
+
+    book_matcher = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository())
+    processor = ParallelFrameProcessor(book_matcher, max_workers=2)
+
+    rendered_ranges, seeds = [], {}
+    process_frames = processor.process_frames
+
+    def crash_on_second_segment(*args, **kwargs):
+        rendered_ranges.append(kwargs["start_frame"])
+        seeds[kwargs["start_frame"]] = np.array(args[3])
+        if kwargs["start_frame"] == 10 and rendered_ranges.count(10) == 1:
+            raise RuntimeError("simulated crash")
+        return process_frames(*args, **kwargs)
+
+    processor.process_frames = crash_on_second_segment
+    renderer = SegmentedVideoRenderer(processor, segment_frames=10)
+    render_args = (video_path, trailer_frames, None, "The_Hobbit_book", "data/book_images/The_Hobbit_book.jpg",
+                   book, np.eye(3), output_path, total_frames, 25, 320, 240, 0.7)
+
+    try:
+        renderer.render(*render_args)
+        assert False, "Expected the simulated crash"
+    except RuntimeError:
+        pass
+
+    manifest = renderer.find_resumable(video_path, output_path, total_frames, 25, 320, 240)
+    assert manifest is not None, "Manifest should survive the crash"
+    assert [s.index for s in manifest.completed_segments] == [0]
+    # The first segment ends with the cover at x = 20 + 9 and hands that placement to the next
+    first, second = manifest.segments[:2]
+    assert abs(first.final_homography[2] - 29) < 2, f"final x {first.final_homography[2]:.1f}"
+    assert second.homography == first.final_homography
+
+    replaced = renderer.render(*render_args)
+
+    assert rendered_ranges == [0, 10, 10, 20], f"Unexpected segment order: {rendered_ranges}"
+    # The resumed render seeds each tracker from the segment before it
+    assert np.allclose(seeds[10].flatten(), first.final_homography)
+    assert abs(seeds[20][0, 2] - 39) < 2, f"seed x {seeds[20][0, 2]:.1f}"
+    assert replaced == total_frames
+
+    cap = cv2.VideoCapture(output_path)
+    out_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    assert out_frames == total_frames, "Concatenated output should contain every frame"
+    assert not renderer.work_dir_for(output_path).exists(), "Segments should be cleaned up"
+
+    print("✅ Segmented rendering resume test passed!")
@@ -0,0 +1,57 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.application.instrumentation import tracer, bind_context
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+def test_stage_timings_attached_to_results():
+    """Traced comparisons report per-stage totals, including spans from worker threads."""
+    print("🔍 Testing stage tracing...")
+
+    setup_test_environment()
+
+    use_case = FindMatchingBookMovieUseCase(SIFTExtractor(), FLANNMatcher(), FileImageRepository())
+
+    untraced = use_case.execute_single_comparison("data/input_images/Tower.jpg", "data/book_images/The_Lord_Of_The_Rings_Towers_book.png")
+    assert untraced.stage_timings is None
+
+    tracer.reset()
+    tracer.enable(keep_events=True)
+    try:
+        result = use_case.execute_single_comparison("data/input_images/Tower.jpg", "data/book_images/The_Lord_Of_The_Rings_Towers_book.png")
+        assert result.error_message is None, result.error_message
+        for stage in ("decode", "grayscale", "sift_detect", "knn_match", "ratio_test"):
+            assert stage in result.stage_timings, f"Missing stage {stage}"
+        assert result.stage_timings["sift_detect"]["count"] == 2
+
+        # Spans recorded on a pool thread land in the submitting call's breakdown
+        with tracer.capture() as breakdown:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                executor.submit(bind_context(lambda: tracer.record("warp", 0.002))).result()
+        assert breakdown.to_dict()["warp"]["count"] == 1
+
+        # One wrapper may run on several threads at the same time
+        started = threading.Barrier(2)
+
+        def overlapping(_):
+            started.wait(timeout=5)
+            tracer.record("blend", 0.001)
+
+        with tracer.capture() as breakdown:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(bind_context(overlapping), range(2)))
+        assert breakdown.to_dict()["blend"]["count"] == 2
+
+        histograms = tracer.histograms()
+        assert histograms["sift_detect"]["count"] == 2
+        print(f"📊 Stage breakdown: {result.stage_timings}")
+    finally:
+        tracer.disable()
+        tracer.reset()
+
+    print("✅ Stage tracing test passed!")
@@ -0,0 +1,46 @@
+import os
+import shutil
+
+from src.infrastructure.repositories.file_thumbnail_cache import FileThumbnailCache
+from tests.utils import setup_test_environment
+
+
+def test_thumbnail_cache_memory_disk_and_invalidation():
+    """Thumbnails are rendered once, reused from memory and disk, and redone when the image changes."""
+    print("🔍 Testing thumbnail cache...")
+
+    setup_test_environment()
+
+    work_dir = "data/tests/thumbnails"
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir)
+    image_path = os.path.join(work_dir, "Tower.jpg")
+    shutil.copy("data/input_images/Tower.jpg", image_path)
+
+    cache = FileThumbnailCache(cache_dir=os.path.join(work_dir, "cache"), memory_items=2)
+    first = cache.get(image_path, (300, 300))
+    assert first is not None and max(first.size) == 300
+    assert cache.get(image_path, (300, 300)) is first
+    assert cache.stats()["misses"] == 1 and cache.stats()["memory_hits"] == 1
+
+    # A new process finds the thumbnail on disk without decoding the original
+    restarted = FileThumbnailCache(cache_dir=os.path.join(work_dir, "cache"))
+    assert restarted.get(image_path, (300, 300)).size == first.size
+    assert restarted.stats()["disk_hits"] == 1
+
+    # Another box size is another entry; the memory LRU stays bounded
+    cache.get(image_path, (120, 120))
+    cache.get("data/book_images/The_Hobbit_book.jpg", (300, 300))
+    assert cache.stats()["memory_items"] == 2
+
+    # Touching the file changes the key
+    os.utime(image_path, ns=(1, 1))
+    cache.get(image_path, (300, 300))
+    assert cache.stats()["misses"] == 4
+
+    assert cache.get(os.path.join(work_dir, "missing.jpg")) is None
+    cache.clear()
+    assert not os.path.exists(os.path.join(work_dir, "cache"))
+
+    print(f"🖼️ {cache.stats()}")
+    print("✅ Thumbnail cache test passed!")
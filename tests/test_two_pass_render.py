@@ -0,0 +1,83 @@
+import asyncio
+import cv2
+import numpy as np
+
+from src.application.use_cases import AsyncFrameProcessor, HomographyTrackAnalyzer, ParallelFrameProcessor
+from src.application.use_cases.image_processing.find_matching_book_movie import FindMatchingBookMovieUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from tests.utils import setup_test_environment
+
+
+class CountingExtractor(SIFTExtractor):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def extract_features(self, image):
+        self.calls += 1
+        return super().extract_features(image)
+
+
+def test_two_pass_render_reuses_stored_track(tmp_path):
+    """The first render analyzes keyframes into a sidecar; re-renders only composite."""
+    print("🔍 Testing two-pass rendering with a stored homography track...")
+
+    setup_test_environment()
+
+    book = cv2.imread("data/book_images/The_Hobbit_book.jpg")
+    video_path = str(tmp_path / "input.mp4")
+    total_frames = 30
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (320, 240))
+    for i in range(total_frames):
+        frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+        frame[30:210, 20 + i:140 + i] = cv2.resize(book, (120, 180))
+        writer.write(frame)
+    writer.release()
+
+    extractor = CountingExtractor()
+    book_matcher = FindMatchingBookMovieUseCase(extractor, FLANNMatcher(), FileImageRepository())
+    analyzer = HomographyTrackAnalyzer(book_matcher, detect_every=10, max_workers=2)
+
+    trailer = [np.full((80, 60, 3), i * 5, dtype=np.uint8) for i in range(total_frames)]
+    processor = ParallelFrameProcessor(book_matcher, max_workers=2, track_analyzer=analyzer)
+    replaced = processor.process_frames(video_path, trailer, book, np.eye(3), str(tmp_path / "first.mp4"),
+                                        total_frames, 25, 320, 240, 0.7, None, 0, total_frames)
+
+    assert replaced == total_frames
+    assert analyzer.sidecar_path(video_path).exists()
+    assert analyzer.analyses == 1 and extractor.calls == 1 + 3, f"{extractor.calls} extractions"
+    track = analyzer.load_or_analyze(video_path, book, np.eye(3), total_frames, 25, 320, 240)
+    assert track.frame_count == total_frames and track.keyframes == [0, 10, 20]
+    # The cover moves one pixel per frame, interpolated frames follow it
+    assert abs(track.homography(15)[0, 2] - track.homography(10)[0, 2] - 5) < 2
+
+    # A fresh analyzer (a new run) reads the sidecar; another trailer and alpha need no matching
+    extractor.calls = 0
+    analyzer = HomographyTrackAnalyzer(book_matcher, detect_every=10, max_workers=2)
+    processor = AsyncFrameProcessor(book_matcher, max_workers=2, track_analyzer=analyzer)
+    other_trailer = [np.full((80, 60, 3), 200, dtype=np.uint8)] * total_frames
+    replaced = asyncio.run(processor.process_frames(
+        video_path, other_trailer, book, np.eye(3), str(tmp_path / "second.mp4"),
+        total_frames, 25, 320, 240, 0.3, None, 0, total_frames
+    ))
+
+    assert replaced == total_frames
+    assert analyzer.analyses == 0 and extractor.calls == 0, f"{extractor.calls} extractions"
+
+    # Changing the analysis settings invalidates the stored track
+    analyzer = HomographyTrackAnalyzer(book_matcher, detect_every=5, max_workers=2)
+    analyzer.load_or_analyze(video_path, book, np.eye(3), total_frames, 25, 320, 240)
+    assert analyzer.analyses == 1
+
+    # A sidecar folder keeps tracks out of the video's folder
+    track_dir = tmp_path / "tracks"
+    analyzer = HomographyTrackAnalyzer(book_matcher, detect_every=10, max_workers=2, sidecar_dir=str(track_dir))
+    sidecar = analyzer.sidecar_path(video_path)
+    assert sidecar.parent == track_dir and sidecar.name.startswith("input.mp4.")
+    analyzer.load_or_analyze(video_path, book, np.eye(3), total_frames, 25, 320, 240)
+    assert analyzer.analyses == 1 and sidecar.exists()
+    assert sorted(p.name for p in tmp_path.glob("*.track.npz")) == ["input.mp4.track.npz"]
+
+    print("✅ Two-pass render test passed!")
@@ -0,0 +1,67 @@
+import shutil
+import cv2
+import numpy as np
+
+from src.application.use_cases import VideoPreviewUseCase
+from src.infrastructure.feature_extractors.sift_extractor import SIFTExtractor
+from src.infrastructure.matchers.flann_matcher import FLANNMatcher
+from src.infrastructure.repositories.file_image_repository import FileImageRepository
+from src.infrastructure.repositories.file_video_repository import FileVideoRepository
+from tests.utils import setup_test_environment
+
+
+def _write_video(path: str, frames):
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def test_preview_streams_downscaled_frames_and_reuses_detection(tmp_path):
+    """Preview renders every Nth frame at low resolution; re-renders skip detection."""
+    print("🔍 Testing live video preview...")
+
+    setup_test_environment()
+
+    books_dir, trailers_dir = tmp_path / "books", tmp_path / "trailers"
+    books_dir.mkdir()
+    trailers_dir.mkdir()
+    for name in ("The_Hobbit_book.jpg", "The_Lord_Of_The_Rings_Towers_book.png"):
+        shutil.copy(f"data/book_images/{name}", books_dir)
+
+    book = cv2.imread("data/book_images/The_Hobbit_book.jpg")
+    frames = []
+    for i in range(30):
+        frame = np.full((240, 320, 3), 90, dtype=np.uint8)
+        frame[30:210, 20 + i:140 + i] = cv2.resize(book, (120, 180))
+        frames.append(frame)
+    video_path = str(tmp_path / "input.mp4")
+    _write_video(video_path, frames)
+    _write_video(str(trailers_dir / "The_Hobbit_book.mp4"),
+                 [np.full((80, 60, 3), (0, 0, 255), dtype=np.uint8)] * 30)
+
+    preview = VideoPreviewUseCase(
+        SIFTExtractor(), FLANNMatcher(),
+        FileImageRepository(book_movie_path=str(books_dir)),
+        FileVideoRepository(input_path=str(trailers_dir)),
+        step=5, max_width=160
+    )
+
+    streamed = []
+    result = preview.render(video_path, alpha=0.8, min_conf=0.0,
+                            frame_callback=lambda frame, idx, pct: streamed.append((idx, frame)))
+    assert result.success and result.target_book_name == "The_Hobbit_book"
+    assert [idx for idx, _ in streamed] == [0, 5, 10, 15, 20, 25]
+    assert streamed[0][1].shape == (120, 160, 3)
+
+    faint = []
+    preview.render(video_path, alpha=0.1, min_conf=0.0, frame_callback=lambda f, i, p: faint.append(f))
+    assert preview.detections == 1, "re-rendering with another alpha reuses the detection"
+    assert not np.array_equal(faint[0], streamed[0][1]), "alpha changes the composite"
+
+    rejected = preview.render(video_path, min_conf=result.tracking_confidence + 1)
+    assert not rejected.success and preview.detections == 1
+
+    print(f"🎞️ Preview of {result.replaced_frames_count} frames in {result.processing_time_seconds:.2f}s")
+    print("✅ Video preview test passed!")